@@ -0,0 +1,66 @@
+"""signups
+
+Revision ID: 3b7f52c1d9a4
+Revises: 8e6a060fcc98
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '3b7f52c1d9a4'
+down_revision: str | None = '8e6a060fcc98'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'signups',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('activity_type', sa.String(), nullable=False),
+        sa.Column('phone', sa.String(), nullable=True),
+        sa.Column('name', sa.String(), nullable=True),
+        sa.Column('last_name', sa.String(), nullable=True),
+        sa.Column('topic', sa.String(), nullable=True),
+        sa.Column('option', sa.String(), nullable=True),
+        sa.Column('signed_up_at', sa.String(), nullable=True),
+        sa.Column('num_tickets', sa.Integer(), nullable=False),
+        sa.Column('status', sa.String(), nullable=False),
+        sa.Column('cost', sa.String(), nullable=True),
+        sa.Column('sheet_row', sa.Integer(), nullable=True),
+        sa.Column('version', sa.Integer(), server_default='1', nullable=False),
+        sa.Column('synced', sa.Boolean(), server_default=sa.false(), nullable=False),
+        sa.Column(
+            'created_at',
+            sa.DateTime(),
+            server_default=sa.text('(CURRENT_TIMESTAMP)'),
+            nullable=False,
+        ),
+        sa.Column(
+            'updated_at',
+            sa.DateTime(),
+            server_default=sa.text('(CURRENT_TIMESTAMP)'),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    with op.batch_alter_table('signups', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_signups_user_id'), ['user_id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_signups_synced'), ['synced'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('signups', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_signups_synced'))
+        batch_op.drop_index(batch_op.f('ix_signups_user_id'))
+
+    op.drop_table('signups')
@@ -0,0 +1,35 @@
+"""activity indexes
+
+Revision ID: a17e299c716a
+Revises: 3b7f52c1d9a4
+Create Date: 2026-10-17 13:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'a17e299c716a'
+down_revision: str | None = '3b7f52c1d9a4'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('activities', schema=None) as batch_op:
+        batch_op.create_index(
+            'ix_activities_type_id_theme', ['type_id', 'theme'], unique=False
+        )
+        batch_op.create_index(
+            'ix_activities_type_id_created_at', ['type_id', 'created_at'], unique=False
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('activities', schema=None) as batch_op:
+        batch_op.drop_index('ix_activities_type_id_created_at')
+        batch_op.drop_index('ix_activities_type_id_theme')
@@ -0,0 +1,31 @@
+"""signup claims
+
+Revision ID: 5c0d2e9b7f41
+Revises: a17e299c716a
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '5c0d2e9b7f41'
+down_revision: str | None = 'a17e299c716a'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('signups', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('claimed_until', sa.Float(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('signups', schema=None) as batch_op:
+        batch_op.drop_column('claimed_until')
@@ -0,0 +1,41 @@
+"""Декодирование закэшированного пользователя на горячем пути get_user.
+
+Сравнивается прежний путь (mjson.decode в dict и новый TypeAdapter на каждый
+вызов) с декодером, закэшированным на тип. Redis не нужен.
+
+    python -m benchmarks.redis_decode --number 100000
+"""
+
+import argparse
+import timeit
+from typing import Any
+
+from pydantic import TypeAdapter
+
+from src.application.models import UserDTO
+from src.application.utils import mjson
+
+
+def _adapter_per_call(raw: str) -> Any:
+    return TypeAdapter[UserDTO](UserDTO).validate_python(mjson.decode(raw))
+
+
+def _cached_decoder(raw: str) -> Any:
+    return mjson.typed_decoder(UserDTO)(raw)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--number', type=int, default=100_000)
+    args = parser.parse_args()
+    user = UserDTO(id=1, nickname='nick', phone='79000000000', name='Имя', last_name='Ф')
+    raw = mjson.encode(user.to_dict())
+    for name, func in (('adapter', _adapter_per_call), ('cached', _cached_decoder)):
+        assert func(raw) == user
+        elapsed = timeit.timeit(lambda f=func: f(raw), number=args.number)
+        per_call = elapsed / args.number * 1e6
+        print(f'{name:>7}: {per_call:.2f}us/call')  # noqa: T201
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+"""Пропускная способность RedisRepository.set с блокировкой и без неё.
+
+Нужен запущенный Redis/KeyDB. Ключи пишутся с префиксом ``bench:``
+и удаляются после прогона.
+
+    python -m benchmarks.redis_set --url redis://localhost:6379/15 --ops 5000
+"""
+
+import argparse
+import asyncio
+import time
+
+from redis.asyncio import Redis
+
+from src.application.models import UserDTO
+from src.infrastracture.database.redis.repository import RedisRepository
+
+
+async def _worker(repo: RedisRepository, lock: bool, ops: int, worker: int) -> None:
+    for i in range(ops):
+        user = UserDTO(id=i, phone='79000000000', name='Имя', last_name='Фамилия')
+        await repo.set(f'bench:{worker}:{i % 100}', user, ex=60, lock=lock)
+
+
+async def _run(url: str, lock: bool, ops: int, concurrency: int) -> float:
+    client = Redis.from_url(url, decode_responses=True, max_connections=concurrency)
+    repo = RedisRepository(client)
+    per_worker = ops // concurrency
+    started = time.perf_counter()
+    await asyncio.gather(
+        *(_worker(repo, lock, per_worker, worker) for worker in range(concurrency))
+    )
+    elapsed = time.perf_counter() - started
+    keys = [key async for key in client.scan_iter('bench:*')]
+    if keys:
+        await client.delete(*keys)
+    await repo.close()
+    return per_worker * concurrency / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--url', default='redis://localhost:6379/15')
+    parser.add_argument('--ops', type=int, default=5000)
+    parser.add_argument('--concurrency', type=int, default=10)
+    args = parser.parse_args()
+    for mode, lock in (('lock', True), ('lock-free', False)):
+        ops_per_sec = asyncio.run(_run(args.url, lock, args.ops, args.concurrency))
+        print(f'{mode:>9}: {ops_per_sec:.0f} ops/sec')  # noqa: T201
+
+
+if __name__ == '__main__':
+    main()
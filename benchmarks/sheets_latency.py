@@ -0,0 +1,82 @@
+"""Задержка обработчиков при одновременных записях в Google Sheets.
+
+Лист эмулируется: каждый вызов gspread «висит» ``--sheet-delay`` секунд,
+как запрос к Google под нагрузкой. Параллельно с записями обрабатываются
+лёгкие апдейты других пользователей, для них считаются p50/p99.
+
+    python -m benchmarks.sheets_latency --signups 20 --sheet-delay 0.3
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any
+
+from src.infrastracture.adapters.interfaces.repositories import BaseRepository
+
+
+class SlowWorksheet:
+    def __init__(self, delay: float) -> None:
+        self.delay = delay
+        self.rows = 1
+
+    def append_row(self, values: list[Any], **kwargs: Any) -> dict:
+        time.sleep(self.delay)
+        self.rows += 1
+        return {'updates': {'updatedRange': f"'уроки'!A{self.rows}:H{self.rows}"}}
+
+
+async def _blocking_append(repo: BaseRepository, values: list[Any]) -> None:
+    # поведение до перехода на пул потоков: gspread прямо в обработчике
+    repo._append_row_sync(values)
+
+
+async def _light_handler(latencies: list[float], started: float) -> None:
+    await asyncio.sleep(0)
+    latencies.append(time.perf_counter() - started)
+
+
+async def _run(mode: str, signups: int, updates: int, delay: float) -> list[float]:
+    repo = BaseRepository(
+        SlowWorksheet(delay), ThreadPoolExecutor(4, thread_name_prefix='gsheet')
+    )
+    values = ['79000000000', 'Имя', 'Фамилия', 'lessons', 'trial']
+    append = repo.append_row if mode == 'executor' else partial(_blocking_append, repo)
+
+    latencies: list[float] = []
+    tasks = []
+    for i in range(signups):
+        tasks.append(asyncio.create_task(append(values)))
+        for _ in range(updates // signups):
+            tasks.append(
+                asyncio.create_task(_light_handler(latencies, time.perf_counter()))
+            )
+        if i % 4 == 0:
+            await asyncio.sleep(0)
+    await asyncio.gather(*tasks)
+    return latencies
+
+
+def _report(mode: str, latencies: list[float]) -> None:
+    latencies.sort()
+    p50 = statistics.median(latencies) * 1000
+    p99 = latencies[int(len(latencies) * 0.99) - 1] * 1000
+    print(f'{mode:>9}: n={len(latencies)} p50={p50:.2f}ms p99={p99:.2f}ms')  # noqa: T201
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--signups', type=int, default=20)
+    parser.add_argument('--updates', type=int, default=400)
+    parser.add_argument('--sheet-delay', type=float, default=0.3)
+    args = parser.parse_args()
+    for mode in ('blocking', 'executor'):
+        latencies = asyncio.run(_run(mode, args.signups, args.updates, args.sheet_delay))
+        _report(mode, latencies)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+"""Смешанная нагрузка на SQLite: движок по умолчанию против настроенного.
+
+Параллельные задачи читают каталог занятий и профиль пользователя и обновляют
+пользователей (доля записей — ``--writes``). Каждый профиль работает со своим
+временным файлом БД, печатаются пропускная способность и задержки.
+
+    python -m benchmarks.sqlite_engine --tasks 20 --ops 200 --writes 0.2
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import tempfile
+import time
+
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+
+from src.config import SQLiteSettings
+from src.infrastracture.database.sqlite import dao
+from src.infrastracture.database.sqlite.base import (
+    de_emojify,
+    load_activity_type_ids,
+)
+from src.infrastracture.database.sqlite.db import Base, create_engine
+from src.infrastracture.database.sqlite.models import (
+    Activity,
+    ActivityType,
+    ActivityTypeEnum,
+    User,
+)
+
+USERS = 1_000
+ACTIVITIES = 50
+
+
+async def _seed(engine: AsyncEngine) -> None:
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with async_sessionmaker(engine)() as session:
+        types = [ActivityType(name=de_emojify(name)) for name in ActivityTypeEnum]
+        session.add_all(types)
+        session.add_all(
+            Activity(activity_type=types[i % len(types)], theme=f'тема {i}')
+            for i in range(ACTIVITIES)
+        )
+        session.add_all(User(id=i, name=f'user {i}') for i in range(USERS))
+        await session.commit()
+        await load_activity_type_ids(session)
+
+
+async def _worker(
+    session_maker: async_sessionmaker, ops: int, writes: float, latencies: list[float]
+) -> None:
+    for _ in range(ops):
+        user_id = random.randrange(USERS)
+        started = time.perf_counter()
+        async with session_maker() as session:
+            if random.random() < writes:
+                await dao.update_user(session, user_id, {'phone': str(started)})
+            else:
+                await dao.get_all_activity_by_type(
+                    session, random.choice(list(ActivityTypeEnum))
+                )
+                await dao.get_user(session, user_id)
+        latencies.append(time.perf_counter() - started)
+
+
+async def _run(engine: AsyncEngine, args: argparse.Namespace) -> list[float]:
+    await _seed(engine)
+    session_maker = async_sessionmaker(engine, expire_on_commit=False)
+    latencies: list[float] = []
+    await asyncio.gather(
+        *(
+            _worker(session_maker, args.ops, args.writes, latencies)
+            for _ in range(args.tasks)
+        )
+    )
+    await engine.dispose()
+    return latencies
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--tasks', type=int, default=20)
+    parser.add_argument('--ops', type=int, default=200)
+    parser.add_argument('--writes', type=float, default=0.2)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as tmp:
+        profiles = {
+            'default': create_async_engine(f'sqlite+aiosqlite:///{tmp}/default.db'),
+            'tuned': create_engine(
+                f'sqlite+aiosqlite:///{tmp}/tuned.db', SQLiteSettings()
+            ),
+        }
+        for name, engine in profiles.items():
+            random.seed(0)
+            started = time.perf_counter()
+            latencies = await _run(engine, args)
+            elapsed = time.perf_counter() - started
+            p50 = statistics.median(latencies) * 1e3
+            p95 = statistics.quantiles(latencies, n=20)[-1] * 1e3
+            print(  # noqa: T201
+                f'{name:>7}: {len(latencies) / elapsed:.0f} ops/s, '
+                f'p50 {p50:.2f}ms, p95 {p95:.2f}ms'
+            )
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
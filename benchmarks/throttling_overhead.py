@@ -0,0 +1,83 @@
+"""Накладные расходы антифлуда на одно обновление.
+
+Через ThrottlingMiddleware прогоняются сообщения от ``--users`` пользователей
+с пустым обработчиком, считаются p50/p99 времени middleware. Для бэкенда
+redis нужен запущенный Redis/KeyDB.
+
+    python -m benchmarks.throttling_overhead --url redis://localhost:6379/15
+    python -m benchmarks.throttling_overhead --backend memory
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from types import SimpleNamespace
+from typing import Any
+
+from redis.asyncio import Redis
+
+from src.presentation.middlewares.throttling import (
+    MemoryTokenBucketLimiter,
+    SlidingWindowLimiter,
+    ThrottleRule,
+    ThrottlingMiddleware,
+)
+
+
+async def _handler(event: Any, data: dict[str, Any]) -> None:
+    return None
+
+
+async def _answer(*args: Any, **kwargs: Any) -> None:
+    return None
+
+
+async def _user(
+    middleware: ThrottlingMiddleware, user_id: int, updates: int, latencies: list[float]
+) -> None:
+    event = SimpleNamespace(
+        text='привет', from_user=SimpleNamespace(id=user_id), answer=_answer
+    )
+    for _ in range(updates):
+        started = time.perf_counter()
+        await middleware(_handler, event, {})
+        latencies.append(time.perf_counter() - started)
+
+
+async def _run(backend: str, url: str, users: int, updates: int) -> list[float]:
+    client = Redis.from_url(url, decode_responses=True)
+    if backend == 'memory':
+        limiter = MemoryTokenBucketLimiter()
+    else:
+        limiter = SlidingWindowLimiter(client, prefix='bench:throttle')
+    middleware = ThrottlingMiddleware(limiter, ThrottleRule(limit=5, window=1.0))
+    latencies: list[float] = []
+    await asyncio.gather(
+        *(_user(middleware, user_id, updates, latencies) for user_id in range(users))
+    )
+    if backend == 'redis':
+        keys = [key async for key in client.scan_iter('bench:throttle:*')]
+        if keys:
+            await client.delete(*keys)
+    await client.aclose()
+    return latencies
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--backend', choices=('redis', 'memory'), default='redis')
+    parser.add_argument('--url', default='redis://localhost:6379/15')
+    parser.add_argument('--users', type=int, default=50)
+    parser.add_argument('--updates', type=int, default=100)
+    args = parser.parse_args()
+    latencies = sorted(
+        asyncio.run(_run(args.backend, args.url, args.users, args.updates))
+    )
+    p50 = statistics.median(latencies) * 1000
+    p99 = latencies[int(len(latencies) * 0.99) - 1] * 1000
+    print(f'n={len(latencies)} p50={p50:.3f}ms p99={p99:.3f}ms')  # noqa: T201
+
+
+if __name__ == '__main__':
+    main()
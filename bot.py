@@ -1,5 +1,8 @@
 import asyncio
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any
 
 import gspread
 from aiogram import Bot
@@ -11,10 +14,13 @@ from aiogram_dialog.api.exceptions import OutdatedIntent, UnknownIntent, Unknown
 from aiohttp import web
 from redis.asyncio.client import Redis
 
-from src.application.factory.telegram import create_dispatcher
+from src.application.domen.models.activity_type import ActivityEnum
+from src.application.factory.telegram import create_dispatcher, run_until_stopped
 from src.application.utils import mjson
+from src.application.utils.cache import LRUCache
 from src.config import get_config
 from src.infrastracture.adapters.repositories.activities import ActivityRepository
+from src.infrastracture.adapters.repositories.bootstrap import SheetsBootstrap
 from src.infrastracture.adapters.repositories.lessons import (
     ChildLessonsRepository,
     EveningSketchRepository,
@@ -22,10 +28,16 @@ from src.infrastracture.adapters.repositories.lessons import (
     MCLassesRepository,
 )
 from src.infrastracture.adapters.repositories.repo import UsersRepository
+from src.infrastracture.adapters.repositories.sheet_queue import SheetWriteQueue
+from src.infrastracture.adapters.repositories.signups import (
+    SignUpProjector,
+    SignUpsRepository,
+)
 from src.infrastracture.adapters.repositories.users import RepositoryUser
 from src.infrastracture.database.redis.repository import RedisRepository
 from src.infrastracture.database.sqlite.base import init_db
 from src.infrastracture.repository.users import UsersService
+from src.presentation.broadcast import Broadcaster
 from src.presentation.dialogs.admin import (
     admin_dialog,
     admin_payments_dialog,
@@ -45,8 +57,14 @@ from src.presentation.dialogs.utils import (
 )
 from src.presentation.handlers.deleoper_router import developer_router
 from src.presentation.handlers.router import main_router, not_handled_router
-from src.presentation.middlewares.throttling import ThrottlingMiddleware
+from src.presentation.message_sender import DripSender
+from src.presentation.middlewares.throttling import (
+    ThrottleRule,
+    ThrottlingMiddleware,
+    create_limiter,
+)
 from src.presentation.notifier import Notifier
+from src.presentation.outbox import TelegramOutbox
 from src.presentation.reminders.payment_reminder import PaymentReminder
 
 logger = logging.getLogger(__name__)
@@ -64,6 +82,10 @@ async def webhook_startup(bot: Bot) -> None:
     logger.info('Webhook registered')
 
 
+def _open_spreadsheet(settings: dict[str, Any], name: str) -> gspread.Spreadsheet:
+    return gspread.service_account_from_dict(settings).open(name)
+
+
 async def main() -> None:
     logging.basicConfig(level=logging.INFO)
 
@@ -73,9 +95,6 @@ async def main() -> None:
 
     bot = Bot(token=config.bot_token.get_secret_value())
 
-    spreadsheet = gspread.service_account_from_dict(
-        config.google_settings.model_dump()
-    ).open(config.GSHEET_NAME)
     await init_db()
     user_repository = RepositoryUser()
     redis = Redis(
@@ -92,17 +111,58 @@ async def main() -> None:
         cache_time=get_config().users_cache_time,
         redis=redis_repository,
         repository=user_repository,
+        local_cache=LRUCache(
+            maxsize=config.users_local_cache_size, ttl=config.users_local_cache_ttl
+        ),
     )
+    users_service.start()
 
-    lesssons_repo = LessonsRepository(spreadsheet.worksheet(config.LESSONS_PAGE))
-    child_repo = ChildLessonsRepository(spreadsheet.worksheet(config.CHILD_PAGE))
-    mclasses_repo = MCLassesRepository(spreadsheet.worksheet(config.MASTER_CL_PAGE))
-    evening_sketch_repo = EveningSketchRepository(
-        spreadsheet.worksheet(config.EVENING_PAGE)
+    sheets_executor = ThreadPoolExecutor(
+        max_workers=config.GSHEET_WORKERS, thread_name_prefix='gsheet'
+    )
+    lesssons_repo = LessonsRepository(executor=sheets_executor)
+    child_repo = ChildLessonsRepository(executor=sheets_executor)
+    mclasses_repo = MCLassesRepository(executor=sheets_executor)
+    evening_sketch_repo = EveningSketchRepository(executor=sheets_executor)
+    # листы подключаются в фоне, вебхук начинает работать сразу
+    sheets_bootstrap = SheetsBootstrap(
+        partial(
+            _open_spreadsheet, config.google_settings.model_dump(), config.GSHEET_NAME
+        ),
+        {
+            config.LESSONS_PAGE: lesssons_repo,
+            config.CHILD_PAGE: child_repo,
+            config.MASTER_CL_PAGE: mclasses_repo,
+            config.EVENING_PAGE: evening_sketch_repo,
+        },
+        sheets_executor,
     )
+    sheets_bootstrap.start()
+
+    sheets = {
+        ActivityEnum.LESSON.value: lesssons_repo,
+        ActivityEnum.CHILD_STUDIO.value: child_repo,
+        ActivityEnum.MASS_CLASS.value: mclasses_repo,
+        ActivityEnum.EVENING_SKETCH.value: evening_sketch_repo,
+    }
+    sheet_queue = SheetWriteQueue(
+        redis_repository, sheets, flush_interval=config.GSHEET_FLUSH_INTERVAL
+    )
+    sheet_queue.start()
+    signups_repo = SignUpsRepository()
+    signup_projector = SignUpProjector(
+        signups_repo, sheets, sheet_queue, interval=config.SIGNUP_SYNC_INTERVAL
+    )
+    signup_projector.start()
 
     gspread_repository = UsersRepository(
-        users_service, lesssons_repo, child_repo, mclasses_repo, evening_sketch_repo
+        users_service,
+        lesssons_repo,
+        child_repo,
+        mclasses_repo,
+        evening_sketch_repo,
+        signups_repo,
+        write_queue=sheet_queue,
     )
     activity_repository = ActivityRepository(redis=redis_repository)
 
@@ -112,18 +172,50 @@ async def main() -> None:
         json_dumps=mjson.encode,
         json_loads=mjson.decode,
     )
-    payment_reminder = PaymentReminder(bot, redis_repository)
+    outbox = TelegramOutbox(
+        bot,
+        redis_repository,
+        global_rate=config.TG_GLOBAL_RATE,
+        chat_rate=config.TG_CHAT_RATE,
+        max_pending=config.OUTBOX_MAX_PENDING,
+    )
+    outbox.start()
+    payment_reminder = PaymentReminder(bot, redis_repository, outbox)
     await payment_reminder.start()
 
+    notifier = Notifier(outbox)
+    drip = DripSender(bot, outbox)
+    broadcaster = Broadcaster(bot, user_repository, redis_repository, outbox)
+    await broadcaster.resume()
     dp = create_dispatcher(
         storage=storage,
         repository=gspread_repository,
         redis_repository=redis_repository,
         activity_repository=activity_repository,
-        notifier=Notifier(),
+        notifier=notifier,
         payment_notifier=payment_reminder,
+        sheet_queue=sheet_queue,
+        outbox=outbox,
+        broadcaster=broadcaster,
+        drip=drip,
+    )
+    limiter = create_limiter(config.THROTTLE_BACKEND, config.REPLICAS, redis)
+    dp.message.middleware.register(
+        ThrottlingMiddleware(
+            limiter,
+            ThrottleRule(config.THROTTLE_MESSAGE_LIMIT, config.THROTTLE_MESSAGE_WINDOW),
+            commands={
+                command: ThrottleRule(*rule)
+                for command, rule in config.THROTTLE_COMMANDS.items()
+            },
+        )
+    )
+    dp.callback_query.middleware.register(
+        ThrottlingMiddleware(
+            limiter,
+            ThrottleRule(config.THROTTLE_CALLBACK_LIMIT, config.THROTTLE_CALLBACK_WINDOW),
+        )
     )
-    dp.message.middleware.register(ThrottlingMiddleware(storage=storage))
 
     dp.errors.register(
         on_unknown_intent,
@@ -151,17 +243,27 @@ async def main() -> None:
         not_handled_router,
     )
     dp.startup.register(webhook_startup)
+    # проектор останавливается раньше, чтобы очередь сбросила его изменения
+    dp.shutdown.register(payment_reminder.stop)
+    dp.shutdown.register(notifier.drain)
+    dp.shutdown.register(broadcaster.stop)
+    dp.shutdown.register(drip.drain)
+    dp.shutdown.register(outbox.drain)
+    dp.shutdown.register(users_service.stop)
+    dp.shutdown.register(sheets_bootstrap.stop)
+    dp.shutdown.register(signup_projector.stop)
+    dp.shutdown.register(sheet_queue.stop)
     setup_dialogs(dp)
     app = web.Application()
-    SimpleRequestHandler(
-        dispatcher=dp, bot=bot, secret_token=config.WEBHOOK_SECRET
-    ).register(app, path=config.WEBHOOK_PATH)
-
+    # хуки dp.shutdown должны отработать раньше, чем закроется сессия бота
     setup_application(
         app,
         dp,
         bot=bot,
     )
+    SimpleRequestHandler(
+        dispatcher=dp, bot=bot, secret_token=config.WEBHOOK_SECRET
+    ).register(app, path=config.WEBHOOK_PATH)
 
     runner = web.AppRunner(app)
 
@@ -178,7 +280,7 @@ async def main() -> None:
     logger.info("WEBHOOK INFO: %s", webhook_info)
     logger.info('Webhook started')
 
-    await asyncio.Event().wait()
+    await run_until_stopped(runner)
 
 
 if __name__ == '__main__':
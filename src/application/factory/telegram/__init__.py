@@ -1,5 +1,7 @@
 from .dispatcher import create_dispatcher
+from .webhook import run_until_stopped
 
 __all__ = [
     'create_dispatcher',
+    'run_until_stopped',
 ]
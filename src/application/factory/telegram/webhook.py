@@ -0,0 +1,34 @@
+import asyncio
+import logging
+import signal
+from contextlib import suppress
+
+from aiohttp import web
+
+logger = logging.getLogger(__name__)
+
+_STOP_SIGNALS = (signal.SIGINT, signal.SIGTERM)
+
+
+async def run_until_stopped(
+    runner: web.AppRunner, stop: asyncio.Event | None = None
+) -> None:
+    """Ждёт SIGINT/SIGTERM (или ``stop``) и корректно останавливает приложение.
+
+    ``runner.cleanup()`` вызывает on_shutdown приложения, а через него —
+    хуки ``dp.shutdown``: без этого очереди не сбрасываются при остановке.
+    """
+    stop = stop or asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in _STOP_SIGNALS:
+        # не во всех окружениях (Windows, не главный поток) это поддерживается
+        with suppress(NotImplementedError, RuntimeError):
+            loop.add_signal_handler(sig, stop.set)
+    try:
+        await stop.wait()
+        logger.info('Shutting down...')
+    finally:
+        for sig in _STOP_SIGNALS:
+            with suppress(NotImplementedError, RuntimeError):
+                loop.remove_signal_handler(sig)
+        await runner.cleanup()
@@ -0,0 +1,58 @@
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
+from dataclasses import dataclass
+from typing import Generic, TypeVar
+
+V = TypeVar('V')
+
+
+@dataclass(slots=True, frozen=True)
+class CacheStats:
+    size: int
+    hits: int
+    misses: int
+
+
+class LRUCache(Generic[V]):
+    """Кэш в памяти процесса, ограниченный по размеру и возрасту записей.
+
+    Вытесняет давно не использованные записи, если их больше ``maxsize``,
+    и не отдаёт записи старше ``ttl`` секунд.
+    """
+
+    def __init__(self, maxsize: int = 10_000, ttl: float = 60.0) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict[Hashable, tuple[float, V]] = OrderedDict()
+
+    def get(self, key: Hashable) -> V | None:
+        item = self._data.get(key)
+        if item is None or item[0] < time.monotonic():
+            if item is not None:
+                del self._data[key]
+            self.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return item[1]
+
+    def set(self, key: Hashable, value: V) -> None:
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: Hashable) -> None:
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def stats(self) -> CacheStats:
+        return CacheStats(size=len(self._data), hits=self.hits, misses=self.misses)
+
+    def __len__(self) -> int:
+        return len(self._data)
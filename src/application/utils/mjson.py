@@ -1,9 +1,10 @@
 import logging
 from collections.abc import Callable
+from functools import cache
 from typing import Any, Final
 
 from msgspec.json import Decoder, Encoder
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter
 
 
 def pydantic_hook(obj: Any) -> Any:
@@ -21,3 +22,16 @@ logger = logging.getLogger(__name__)
 def encode(obj: Any) -> str:
     data: bytes = bytes_encode(obj)
     return data.decode()
+
+
+@cache
+def typed_decoder(type_: Any) -> Callable[[str | bytes], Any]:
+    """Декодер JSON сразу в ``type_``, создаётся один раз на тип.
+
+    Dataclass, Struct и встроенные типы разбирает msgspec за один проход,
+    остальное (pydantic-модели) — ``TypeAdapter.validate_json``.
+    """
+    try:
+        return Decoder(type_, strict=False).decode
+    except TypeError:
+        return TypeAdapter(type_).validate_json
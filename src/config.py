@@ -2,7 +2,7 @@ import base64
 import zoneinfo
 from functools import lru_cache
 from pathlib import Path
-from typing import Any
+from typing import Any, Literal
 
 from pydantic import BaseModel, Field, SecretStr, field_serializer, model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -28,6 +28,32 @@ class GoogleSettings(BaseModel):
         return v.get_secret_value()
 
 
+class SQLiteSettings(BaseModel):
+    """Профиль движка SQLite, применяется PRAGMA при каждом подключении."""
+
+    # WAL: читатели не ждут писателя, запись не делает fsync на каждый коммит
+    journal_mode: Literal['WAL', 'DELETE', 'TRUNCATE', 'MEMORY'] = 'WAL'
+    synchronous: Literal['OFF', 'NORMAL', 'FULL'] = 'NORMAL'
+    # размер отображаемой в память части файла, байты
+    mmap_size: int = 256 * 1024 * 1024
+    # кэш страниц: отрицательное значение — в килобайтах
+    cache_size: int = -64_000
+    # сколько ждать снятия блокировки другим подключением, миллисекунды
+    busy_timeout: int = 5_000
+    # постоянные подключения в пуле и сверх него на пиках
+    pool_size: int = 5
+    max_overflow: int = 5
+
+    def pragmas(self) -> list[str]:
+        return [
+            f'PRAGMA journal_mode={self.journal_mode}',
+            f'PRAGMA synchronous={self.synchronous}',
+            f'PRAGMA mmap_size={self.mmap_size}',
+            f'PRAGMA cache_size={self.cache_size}',
+            f'PRAGMA busy_timeout={self.busy_timeout}',
+        ]
+
+
 class Config(BaseSettings):
     # Желательно вместо str использовать SecretStr
     # для конфиденциальных данных, например, токена бота
@@ -40,12 +66,37 @@ class Config(BaseSettings):
     CHILD_PAGE: str = Field(default='детская студия')
     MASTER_CL_PAGE: str = Field(default='мастер-классы')
     EVENING_PAGE: str = Field(default='вечерние наброски')
+    # потоки для синхронных вызовов gspread
+    GSHEET_WORKERS: int = Field(default=4)
+    # как часто очередь изменений сбрасывается в таблицу, секунды
+    GSHEET_FLUSH_INTERVAL: float = Field(default=1.0)
+    # как часто новые заявки из SQLite переносятся в таблицу, секунды
+    SIGNUP_SYNC_INTERVAL: float = Field(default=1.0)
     zone_info: zoneinfo.ZoneInfo = zoneinfo.ZoneInfo('Europe/Moscow')
 
     REDIS_PASSWORD: SecretStr
     REDIS_HOST: str = Field(default='keydb')
     REDIS_PORT: int
     users_cache_time: int = Field(default=60 * 60)
+    # лимиты исходящих запросов к Telegram, в секунду: общий и на один чат
+    TG_GLOBAL_RATE: float = Field(default=30.0)
+    TG_CHAT_RATE: float = Field(default=1.0)
+    # сколько рассылок держать в памяти, остальное ждёт в Redis
+    OUTBOX_MAX_PENDING: int = Field(default=1000)
+    # число запущенных реплик бота
+    REPLICAS: int = Field(default=1)
+    # где считать антифлуд: memory — в процессе, только при REPLICAS=1
+    THROTTLE_BACKEND: Literal['redis', 'memory'] = Field(default='redis')
+    # антифлуд: столько событий от пользователя за окно в секундах
+    THROTTLE_MESSAGE_LIMIT: int = Field(default=1)
+    THROTTLE_MESSAGE_WINDOW: float = Field(default=1.0)
+    THROTTLE_CALLBACK_LIMIT: int = Field(default=3)
+    THROTTLE_CALLBACK_WINDOW: float = Field(default=1.0)
+    # отдельные лимиты команд: {"report": [1, 10]} — одна команда за 10 секунд
+    THROTTLE_COMMANDS: dict[str, tuple[int, float]] = Field(default_factory=dict)
+    # локальный кэш пользователей в памяти процесса: размер и время жизни, секунды
+    users_local_cache_size: int = Field(default=10_000)
+    users_local_cache_ttl: float = Field(default=60.0)
     admins: list[int]
     # welcome images/videos
     static_data_path: Path = Path('static_data')
@@ -75,6 +126,8 @@ class Config(BaseSettings):
         return self.static_data_path / 'first_seen.jpg'
 
     DB_PATH: str = '/sqlite_data/kamey_art.db'
+    # JSON, например SQLITE='{"journal_mode": "DELETE"}'
+    SQLITE: SQLiteSettings = Field(default_factory=SQLiteSettings)
 
     @property
     def db_url(self) -> str:
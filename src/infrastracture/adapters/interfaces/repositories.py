@@ -1,21 +1,22 @@
+import asyncio
 import logging
-import re
 from abc import ABC, abstractmethod
-from collections.abc import Sequence
-from contextlib import suppress
-from datetime import date, datetime
-from typing import Any
+from collections.abc import Callable, Iterable, Mapping, Sequence
+from concurrent.futures import Executor
+from datetime import date, datetime, time
+from functools import partial
+from typing import Any, TypeVar
 
-from gspread.cell import Cell
-from gspread.utils import rowcol_to_a1
+from gspread.utils import a1_to_rowcol, rowcol_to_a1
 from gspread.worksheet import Worksheet
 
-from src.application.domen.models import LessonActivity
 from src.application.models import UserDTO
 from src.infrastracture.database.sqlite.models import Activity
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar('T')
+
 
 class UsersAbstractRepository(ABC):
     @abstractmethod
@@ -38,48 +39,133 @@ class UsersAbstractRepository(ABC):
     async def delete_user(self, id: int) -> UserDTO | None:
         raise NotImplementedError
 
+    @abstractmethod
+    async def get_user_ids(self, after: int = 0, limit: int = 500) -> list[int]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def count_users(self) -> int:
+        raise NotImplementedError
+
 
 class BaseRepository:
-    def __init__(self, wsheet: Worksheet) -> None:
+    """Репозиторий листа Google Sheets.
+
+    gspread синхронный, поэтому все обращения к листу выполняются в отдельном
+    пуле потоков и не блокируют event loop бота. Лист можно передать позже
+    через ``bind``: до этого обращения к таблице ждут его готовности.
+    """
+
+    def __init__(
+        self, wsheet: Worksheet | None = None, executor: Executor | None = None
+    ) -> None:
         self._wsheet = wsheet
+        self._executor = executor
+        self._ready = asyncio.Event()
+        if wsheet is not None:
+            self._ready.set()
+        # {название_столбца: номер_столбца}, общий для всех обновлений строки
+        self._headers: dict[str, int] | None = None
+
+    def bind(self, wsheet: Worksheet) -> None:
+        self._wsheet = wsheet
+        self._headers = None
+        self._ready.set()
+
+    @property
+    def is_ready(self) -> bool:
+        return self._ready.is_set()
 
-    def _find_component(self, component_name: str, row: int) -> Cell | None:
-        return self._wsheet.find(component_name, in_row=row)
+    async def wait_ready(self) -> None:
+        await self._ready.wait()
 
-    def change_value_in_row(self, num_row: int, column_name: str, value: Any) -> None:
-        cell = self._find_component(column_name, 1)
-        self._wsheet.update_cell(num_row, cell.col, value)
+    async def _run(self, func: Callable[..., T], *args: Any) -> T:
+        await self._ready.wait()
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, partial(func, *args))
 
-    def update_cells_by_headers(self, num_row: int, updates: dict) -> None:
+    def _load_headers(self) -> dict[str, int]:
+        headers: dict[str, int] = {}
+        for col_idx, col_name in enumerate(self._wsheet.row_values(1), start=1):
+            headers.setdefault(col_name, col_idx)
+        self._headers = headers
+        return headers
+
+    def _header_index(self, columns: Iterable[str]) -> dict[str, int]:
+        headers = self._headers
+        if headers is None or any(col_name not in headers for col_name in columns):
+            # заголовки могли поменять руками в таблице, перечитываем
+            headers = self._load_headers()
+        return headers
+
+    def invalidate_headers(self) -> None:
+        self._headers = None
+
+    def _change_value_in_row(self, num_row: int, column_name: str, value: Any) -> None:
+        self._update_cells_by_headers(num_row, {column_name: value})
+
+    def _update_cells_by_headers(self, num_row: int, updates: dict) -> None:
         """Обновляет ячейки в указанной строке по названиям столбцов.
 
         :param row_num: Номер строки (начинается с 1)
         :param updates: Словарь {название_столбца: новое_значение}
         """
-        # Получаем все заголовки
-        headers = self._wsheet.row_values(1)
+        self._update_rows_by_headers({num_row: updates})
+
+    def _update_rows_by_headers(self, rows: Mapping[int, Mapping[str, Any]]) -> None:
+        """Обновляет несколько строк одним batch_update.
+
+        :param rows: Словарь {номер_строки: {название_столбца: новое_значение}}
+        """
+        headers = self._header_index({col for row in rows.values() for col in row})
 
         requests = []
-        for col_name, value in updates.items():
-            with suppress(ValueError):
-                col_idx = headers.index(col_name) + 1
+        for num_row, updates in rows.items():
+            for col_name, value in updates.items():
+                col_idx = headers.get(col_name)
+                if col_idx is None:
+                    logger.warning('Column %s not found in %s', col_name, self._wsheet)
+                    continue
                 cell = rowcol_to_a1(num_row, col_idx)
                 requests.append({'range': cell, 'values': [[value]]})
 
         if requests:
             self._wsheet.batch_update(requests)
 
-    def change_values_in_row(self, num_row: int, values: dict) -> None:
-        self.update_cells_by_headers(num_row, values)
+    def _append_row_sync(self, values: list[Any]) -> int:
+        # values.append сам находит конец таблицы, лист целиком не скачиваем
+        response = self._wsheet.append_row(
+            values,
+            insert_data_option='INSERT_ROWS',
+            table_range='A1',
+        )
+        return self._row_from_range(response['updates']['updatedRange'])
+
+    @staticmethod
+    def _row_from_range(range_str: str) -> int:
+        # "'уроки'!A12:H12" -> 12
+        first_cell = range_str.rsplit('!', 1)[-1].split(':')[0]
+        return a1_to_rowcol(first_cell)[0]
+
+    async def load_headers(self) -> None:
+        await self._run(self._load_headers)
+
+    async def change_value_in_row(
+        self, num_row: int, column_name: str, value: Any
+    ) -> None:
+        await self._run(self._change_value_in_row, num_row, column_name, value)
+
+    async def update_cells_by_headers(self, num_row: int, updates: dict) -> None:
+        await self._run(self._update_cells_by_headers, num_row, updates)
 
-    def _sign_up_user(self, user: UserDTO, lesson_activity: LessonActivity) -> str:
-        values = user.to_dict(sign_up=True)
-        values.update(lesson_activity.model_dump_for_store())
-        last_row = len(self._wsheet.get_all_values())
-        response = self._wsheet.insert_row(list(values.values()), index=last_row + 1)
-        range_str = response['updates']['updatedRange']
-        m_obj = re.search(r'\d+', range_str)
-        return range_str[m_obj.start() : m_obj.end()]
+    async def change_values_in_row(self, num_row: int, values: dict) -> None:
+        await self.update_cells_by_headers(num_row, values)
+
+    async def update_rows(self, rows: Mapping[int, Mapping[str, Any]]) -> None:
+        await self._run(self._update_rows_by_headers, rows)
+
+    async def append_row(self, values: list[Any]) -> int:
+        return await self._run(self._append_row_sync, values)
 
 
 class ActivityAbstractRepository(ABC):
@@ -99,6 +185,38 @@ class ActivityAbstractRepository(ABC):
     async def get_all_activity_by_type(self, activity_type: str) -> Sequence[dict]:
         raise NotImplementedError
 
+    @abstractmethod
+    async def patch_activity(
+        self, activity_type: str, theme: str, values: dict[str, Any]
+    ) -> Activity | None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_activity_by_id(self, activity_id: int) -> Activity | None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def patch_activity_by_id(
+        self, activity_type: str, activity_id: int, values: dict[str, Any]
+    ) -> Activity | None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def update_activity_date_by_id(
+        self, activity_type: str, activity_id: int, new_date: date | None
+    ) -> Activity | None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def update_activity_time_by_id(
+        self, activity_type: str, activity_id: int, new_time: time | None
+    ) -> Activity | None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def remove_activity_by_id(self, activity_type: str, activity_id: int) -> bool:
+        raise NotImplementedError
+
     @abstractmethod
     async def update_activity_name_by_name(
         self, activity_type: str, old_theme: str, new_theme: str
@@ -1,5 +1,7 @@
 import logging
+from collections.abc import Mapping
 from datetime import date, datetime, time
+from types import MappingProxyType
 from typing import Any
 
 import emoji
@@ -12,6 +14,7 @@ from src.infrastracture.database.redis.keys import ActivityKey
 from src.infrastracture.database.redis.repository import RedisRepository
 from src.infrastracture.database.sqlite import dao
 from src.infrastracture.database.sqlite.db import async_session_maker
+from src.infrastracture.database.sqlite.models import Activity, ActivityTypeEnum
 from src.presentation.dialogs.utils import format_date_russian
 
 logger = logging.getLogger(__name__)
@@ -21,6 +24,17 @@ def de_emojify(text) -> str:
     return emoji.replace_emoji(text, replace='')
 
 
+# Имя типа занятия (с эмодзи или без) → ключ кэша занятий в Redis.
+# Типы не меняются, поэтому ключи считаются один раз при импорте
+_activity_keys: Mapping[str, ActivityKey] = MappingProxyType(
+    {
+        name: ActivityKey(key=de_emojify(activity_type))
+        for activity_type in ActivityTypeEnum
+        for name in (activity_type.value, de_emojify(activity_type))
+    }
+)
+
+
 class ActivityModel(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
@@ -75,7 +89,8 @@ class ActivityRepository(ActivityAbstractRepository):
 
     @classmethod
     def get_activity_key(cls, activity_type: str) -> ActivityKey:
-        return ActivityKey(key=de_emojify(activity_type))
+        key = _activity_keys.get(activity_type)
+        return key if key is not None else ActivityKey(key=de_emojify(activity_type))
 
     async def add_activity(
         self,
@@ -116,6 +131,59 @@ class ActivityRepository(ActivityAbstractRepository):
                 await self.__redis.set(activity_key, activities, 60 * 2)
             return activities
 
+    async def patch_activity(
+        self, activity_type: str, theme: str, values: dict[str, Any]
+    ) -> ActivityModel | None:
+        """Меняет несколько полей занятия за один запрос."""
+        async with self.__session_maker() as session:
+            activity = await dao.patch_activity(session, activity_type, theme, values)
+        return await self._changed(activity_type, activity)
+
+    async def get_activity_by_id(self, activity_id: int) -> ActivityModel | None:
+        async with self.__session_maker() as session:
+            activity = await dao.get_activity_by_id(session, activity_id)
+            return ActivityModel.model_validate(activity) if activity else None
+
+    async def patch_activity_by_id(
+        self, activity_type: str, activity_id: int, values: dict[str, Any]
+    ) -> ActivityModel | None:
+        async with self.__session_maker() as session:
+            activity = await dao.patch_activity_by_id(session, activity_id, values)
+        return await self._changed(activity_type, activity)
+
+    async def update_activity_date_by_id(
+        self, activity_type: str, activity_id: int, new_date: date | None
+    ) -> ActivityModel | None:
+        async with self.__session_maker() as session:
+            activity = await dao.update_activity_date_by_id(
+                session, activity_id, new_date
+            )
+        return await self._changed(activity_type, activity)
+
+    async def update_activity_time_by_id(
+        self, activity_type: str, activity_id: int, new_time: time | None
+    ) -> ActivityModel | None:
+        async with self.__session_maker() as session:
+            activity = await dao.update_activity_time_by_id(
+                session, activity_id, new_time
+            )
+        return await self._changed(activity_type, activity)
+
+    async def remove_activity_by_id(self, activity_type: str, activity_id: int) -> bool:
+        async with self.__session_maker() as session:
+            removed = await dao.remove_activity_by_id(session, activity_id)
+        if removed:
+            await self.__redis.delete(self.get_activity_key(activity_type))
+        return removed
+
+    async def _changed(
+        self, activity_type: str, activity: Activity | None
+    ) -> ActivityModel | None:
+        if not activity:
+            return None
+        await self.__redis.delete(self.get_activity_key(activity_type))
+        return ActivityModel.model_validate(activity)
+
     async def update_activity_name_by_name(
         self, activity_type: str, old_theme: str, new_theme: str
     ) -> ActivityModel | None:
@@ -126,10 +194,7 @@ class ActivityRepository(ActivityAbstractRepository):
                 old_theme=old_theme,
                 new_theme=new_theme,
             )
-            if activity:
-                activity_key = self.get_activity_key(activity_type)
-                await self.__redis.delete(activity_key)
-                return activity
+        return await self._changed(activity_type, activity)
 
     async def update_activity_description_by_name(
         self, activity_type: str, theme: str, new_description: str
@@ -141,10 +206,7 @@ class ActivityRepository(ActivityAbstractRepository):
                 theme=theme,
                 new_description=new_description,
             )
-            if activity:
-                activity_key = self.get_activity_key(activity_type)
-                await self.__redis.delete(activity_key)
-                return activity
+        return await self._changed(activity_type, activity)
 
     async def update_activity_date_by_name(
         self,
@@ -159,10 +221,7 @@ class ActivityRepository(ActivityAbstractRepository):
                 theme=theme,
                 new_date=new_date,
             )
-            if activity:
-                activity_key = self.get_activity_key(activity_type)
-                await self.__redis.delete(activity_key)
-                return activity
+        return await self._changed(activity_type, activity)
 
     async def update_activity_time_by_name(
         self,
@@ -177,10 +236,7 @@ class ActivityRepository(ActivityAbstractRepository):
                 theme=theme,
                 new_time=new_time,
             )
-            if activity:
-                activity_key = self.get_activity_key(activity_type)
-                await self.__redis.delete(activity_key)
-                return activity
+        return await self._changed(activity_type, activity)
 
     async def get_activity_by_theme_and_type(
         self,
@@ -204,10 +260,7 @@ class ActivityRepository(ActivityAbstractRepository):
                 file_id=file_id,
                 content_type=content_type,
             )
-            if activity:
-                activity_key = self.get_activity_key(activity_type)
-                await self.__redis.delete(activity_key)
-                return activity
+        return await self._changed(activity_type, activity)
 
     async def remove_activity_by_theme_and_type(
         self, activity_type: str, theme: str
@@ -0,0 +1,102 @@
+import asyncio
+import logging
+from collections.abc import Callable, Mapping
+from concurrent.futures import Executor
+from contextlib import suppress
+from functools import partial
+from typing import Any, TypeVar
+
+from gspread.spreadsheet import Spreadsheet
+from gspread.worksheet import Worksheet
+
+from src.infrastracture.adapters.interfaces.repositories import BaseRepository
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+
+class SheetsBootstrap:
+    """Фоновое подключение листов Google Sheets.
+
+    Таблица открывается после старта бота, список листов запрашивается одним
+    обращением, заголовки листов читаются параллельно. Пока лист не найден,
+    обращения его репозитория ждут готовности, недоступность Google не мешает
+    боту принимать обновления.
+    """
+
+    def __init__(
+        self,
+        open_spreadsheet: Callable[[], Spreadsheet],
+        pages: Mapping[str, BaseRepository],
+        executor: Executor | None = None,
+        retry_delay: float = 1.0,
+        max_delay: float = 60.0,
+    ) -> None:
+        self.__open_spreadsheet = open_spreadsheet
+        self.__pages = pages
+        self.__executor = executor
+        self.retry_delay = retry_delay
+        self.max_delay = max_delay
+        self._task: asyncio.Task | None = None
+
+    async def _retry(self, func: Callable[..., T], *args: Any) -> T:
+        loop = asyncio.get_running_loop()
+        delay = self.retry_delay
+        while True:
+            try:
+                return await loop.run_in_executor(self.__executor, partial(func, *args))
+            except Exception as exc:
+                logger.warning(
+                    'Google Sheets is unavailable, retry in %.1fs', delay, exc_info=exc
+                )
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.max_delay)
+
+    async def _bind_page(
+        self, page: str, worksheet: Worksheet, repo: BaseRepository
+    ) -> None:
+        repo.bind(worksheet)
+        try:
+            await repo.load_headers()
+        except Exception as exc:
+            # не критично: заголовки перечитаются при первой записи
+            logger.warning('Failed to load headers of %s', page, exc_info=exc)
+        logger.info('Worksheet %s is ready', page)
+
+    async def run(self) -> None:
+        spreadsheet = await self._retry(self.__open_spreadsheet)
+        pending = dict(self.__pages)
+        delay = self.retry_delay
+        while True:
+            worksheets = {
+                worksheet.title: worksheet
+                for worksheet in await self._retry(spreadsheet.worksheets)
+            }
+            await asyncio.gather(
+                *(
+                    self._bind_page(page, worksheets[page], repo)
+                    for page, repo in pending.items()
+                    if page in worksheets
+                )
+            )
+            pending = {p: r for p, r in pending.items() if p not in worksheets}
+            if not pending:
+                return
+            # лист могли переименовать или ещё не создать в таблице
+            logger.warning(
+                'Worksheets %s not found, retry in %.1fs', list(pending), delay
+            )
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.max_delay)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self.run(), name='sheets-bootstrap')
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
@@ -1,4 +1,5 @@
 import logging
+from collections.abc import Mapping
 from typing import Any
 
 from src.application.domen.models import LessonActivity
@@ -12,6 +13,8 @@ from src.infrastracture.adapters.repositories.lessons import (
     LessonsRepository,
     MCLassesRepository,
 )
+from src.infrastracture.adapters.repositories.sheet_queue import SheetWriteQueue
+from src.infrastracture.adapters.repositories.signups import SignUpsRepository
 from src.infrastracture.repository.users import UsersService
 
 logger = logging.getLogger(__name__)
@@ -25,41 +28,77 @@ class UsersRepository:
         child_lessons_repo,
         mclasses_repo,
         evening_sketch_repo,
+        signups_repo,
+        write_queue: SheetWriteQueue | None = None,
     ) -> None:
         self.user: UsersService = user_repo
         self.lessons_repo: LessonsRepository = lessons_repo
         self.child_lessons_repo: ChildLessonsRepository = child_lessons_repo
         self.mclasses_repo: MCLassesRepository = mclasses_repo
         self.evening_sketch_repo: EveningSketchRepository = evening_sketch_repo
+        self.signups: SignUpsRepository = signups_repo
+        self.write_queue = write_queue
 
-    def __get_repo(
-        self,
-        lesson_activity: str,
-    ) -> BaseRepository:
+    @staticmethod
+    def get_sheet_key(lesson_activity: str) -> str:
         match lesson_activity:
             case ActivityEnum.LESSON.value | RU.lesson:
-                return self.lessons_repo
+                return ActivityEnum.LESSON.value
             case ActivityEnum.CHILD_STUDIO.value | RU.child_studio:
-                return self.child_lessons_repo
+                return ActivityEnum.CHILD_STUDIO.value
             case ActivityEnum.MASS_CLASS.value | RU.mass_class:
-                return self.mclasses_repo
+                return ActivityEnum.MASS_CLASS.value
             case ActivityEnum.EVENING_SKETCH.value | RU.evening_sketch:
-                return self.evening_sketch_repo
+                return ActivityEnum.EVENING_SKETCH.value
             case _:
                 raise NotImplementedError
 
-    def signup_user(self, lesson_activity: LessonActivity, user: UserDTO) -> int:
-        repo = self.__get_repo(lesson_activity.activity_type.name)
-        return repo._sign_up_user(user, lesson_activity)
+    @property
+    def sheets(self) -> dict[str, BaseRepository]:
+        return {
+            ActivityEnum.LESSON.value: self.lessons_repo,
+            ActivityEnum.CHILD_STUDIO.value: self.child_lessons_repo,
+            ActivityEnum.MASS_CLASS.value: self.mclasses_repo,
+            ActivityEnum.EVENING_SKETCH.value: self.evening_sketch_repo,
+        }
+
+    def __get_repo(
+        self,
+        lesson_activity: str,
+    ) -> BaseRepository:
+        return self.sheets[self.get_sheet_key(lesson_activity)]
+
+    async def signup_user(self, lesson_activity: LessonActivity, user: UserDTO) -> int:
+        # заявка сохраняется локально, в таблицу её переносит SignUpProjector
+        sheet = self.get_sheet_key(lesson_activity.activity_type.name)
+        signup_id = await self.signups.add_signup(user, lesson_activity, sheet)
+        if signup_id is None:
+            raise RuntimeError(f'Sign-up of user {user.id} was not saved')
+        return signup_id
+
+    async def update_signup(self, signup: Mapping[str, Any], values: dict) -> None:
+        """Меняет заявку по данным из уведомления администратора."""
+        if signup_id := signup.get('signup_id'):
+            await self.signups.update_signup(int(signup_id), values)
+            return
+        # заявки, созданные до переноса в SQLite, знают только номер строки листа
+        await self.change_values_in_signup_user(
+            signup['activity_type'], int(signup['num_row']), values
+        )
 
-    def change_value_in_signup_user(
+    async def change_value_in_signup_user(
         self, activity_type: str, num_row: int, column_name: str, value: Any
     ) -> None:
-        repo = self.__get_repo(activity_type)
-        repo.change_value_in_row(num_row, column_name, value)
+        await self.change_values_in_signup_user(
+            activity_type, num_row, {column_name: value}
+        )
 
-    def change_values_in_signup_user(
+    async def change_values_in_signup_user(
         self, activity_type: str, num_row: int, values: dict
     ) -> None:
+        if self.write_queue is not None:
+            sheet = self.get_sheet_key(activity_type)
+            await self.write_queue.enqueue(sheet, num_row, values)
+            return
         repo = self.__get_repo(activity_type)
-        repo.change_values_in_row(num_row, values)
+        await repo.change_values_in_row(num_row, values)
@@ -0,0 +1,226 @@
+import asyncio
+import logging
+import time
+from collections import defaultdict
+from collections.abc import Mapping
+from contextlib import suppress
+from dataclasses import dataclass
+from typing import Any
+from uuid import uuid4
+
+from gspread.exceptions import APIError
+from redis.commands.core import AsyncScript
+
+from src.application.utils import mjson
+from src.infrastracture.adapters.interfaces.repositories import BaseRepository
+from src.infrastracture.database.redis.repository import RedisRepository
+
+logger = logging.getLogger(__name__)
+
+# снимает обработанную пачку с головы очереди и отпускает блокировку, но
+# только если блокировка всё ещё наша: иначе пачку уже взяла другая реплика
+# и она сама снимет её после повторной (идемпотентной) записи
+_COMMIT_SCRIPT = """
+if redis.call('GET', KEYS[2]) ~= ARGV[1] then
+    return 0
+end
+if #ARGV > 2 then
+    redis.call('RPUSH', KEYS[3], unpack(ARGV, 3))
+end
+redis.call('LTRIM', KEYS[1], ARGV[2], -1)
+redis.call('DEL', KEYS[2])
+return 1
+"""
+
+# коды ответа Google API, при которых запись стоит повторить
+_TRANSIENT_CODES = frozenset({429, 500, 502, 503, 504})
+
+
+def _is_transient(exc: Exception) -> bool:
+    if isinstance(exc, APIError):
+        return exc.code in _TRANSIENT_CODES
+    # сеть и таймауты, в том числе ошибки requests
+    return isinstance(exc, OSError)
+
+
+@dataclass(slots=True, frozen=True)
+class QueueMetrics:
+    depth: int
+    lag: float  # возраст самой старой записи в очереди, секунды
+
+
+class SheetWriteQueue:
+    """Отложенная запись изменений в Google Sheets.
+
+    Изменения складываются в список Redis и переживают перезапуск бота.
+    Фоновая задача раз в ``flush_interval`` секунд забирает пачку записей,
+    схлопывает их по листам и отправляет одним batch_update на лист.
+    Пачку с головы очереди пишет одна реплика за раз (блокировка
+    ``LOCK_KEY``), снимается она только вместе с блокировкой.
+    При ошибке записи остаются в очереди, повтор идёт с экспоненциальной
+    задержкой. Сетевые ошибки, квоты и ещё не подключённые листы повторяются
+    без ограничений, а записи листа, который ``max_attempts`` раз подряд
+    отклонил их по другой причине, записи неизвестных листов и нечитаемые
+    записи переносятся в ``DEAD_LETTER_KEY``, чтобы не блокировать очередь.
+    """
+
+    QUEUE_KEY: str = 'sheets:write_queue'
+    DEAD_LETTER_KEY: str = 'sheets:write_queue:dead'
+    LOCK_KEY: str = 'sheets:write_queue:lock'
+
+    def __init__(
+        self,
+        redis: RedisRepository,
+        repositories: Mapping[str, BaseRepository],
+        flush_interval: float = 1.0,
+        batch_size: int = 200,
+        max_backoff: float = 60.0,
+        max_attempts: int = 5,
+        lock_ttl: int = 60,
+        ready_timeout: float = 30.0,
+    ) -> None:
+        self.__redis = redis
+        self.__repositories = repositories
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.max_backoff = max_backoff
+        self.max_attempts = max_attempts
+        self.lock_ttl = lock_ttl
+        # сколько ждать подключения листа, дольше блокировку не держим
+        self.ready_timeout = ready_timeout
+        self.flushed = 0
+        self.failures = 0
+        self.dead_lettered = 0
+        # неудачные попытки записи подряд по листам, без учёта сетевых ошибок
+        self._attempts: dict[str, int] = {}
+        self._commit: AsyncScript | None = None
+        self._task: asyncio.Task | None = None
+
+    async def enqueue(self, sheet: str, num_row: int, values: dict[str, Any]) -> None:
+        if sheet not in self.__repositories:
+            raise KeyError(f'Unknown sheet {sheet!r}')
+        entry = {'sheet': sheet, 'row': num_row, 'values': values, 'ts': time.time()}
+        await self.__redis.rpush(self.QUEUE_KEY, mjson.encode(entry))
+
+    async def _release(self, token: str, processed: int, dead: list[str]) -> bool:
+        if self._commit is None:
+            self._commit = self.__redis.client.register_script(_COMMIT_SCRIPT)
+        committed = await self._commit(
+            keys=[self.QUEUE_KEY, self.LOCK_KEY, self.DEAD_LETTER_KEY],
+            args=[token, processed, *dead],
+        )
+        return bool(committed)
+
+    async def flush(self) -> int:
+        """Отправляет одну пачку из очереди, возвращает число обработанных записей.
+
+        Если пачку сейчас пишет другая реплика, возвращает 0.
+        """
+        token = uuid4().hex
+        client = self.__redis.client
+        if not await client.set(self.LOCK_KEY, token, nx=True, ex=self.lock_ttl):
+            return 0
+        try:
+            entries = await client.lrange(self.QUEUE_KEY, 0, self.batch_size - 1)
+            dead = await self._write(entries) if entries else []
+        except BaseException:
+            await self._release(token, 0, [])
+            raise
+        if not await self._release(token, len(entries), dead):
+            logger.warning('Sheet writes lock expired, batch is left to other replica')
+            return 0
+        self.flushed += len(entries) - len(dead)
+        self.dead_lettered += len(dead)
+        return len(entries)
+
+    async def _write(self, entries: list[str]) -> list[str]:
+        """Пишет пачку в листы, возвращает записи для DEAD_LETTER_KEY."""
+
+        batches: dict[str, dict[int, dict[str, Any]]] = defaultdict(dict)
+        raw_by_sheet: dict[str, list[str]] = defaultdict(list)
+        dead: list[str] = []
+        for raw in entries:
+            try:
+                entry = mjson.decode(raw)
+                rows = batches[entry['sheet']]
+                rows.setdefault(int(entry['row']), {}).update(entry['values'])
+            except Exception as exc:
+                logger.error('Malformed sheet write %r', raw, exc_info=exc)
+                dead.append(raw)
+            else:
+                raw_by_sheet[entry['sheet']].append(raw)
+
+        error: Exception | None = None
+        for sheet, rows in batches.items():
+            repo = self.__repositories.get(sheet)
+            if repo is None:
+                logger.error('Move writes for unknown sheet %s to dead letter', sheet)
+                dead.extend(raw_by_sheet[sheet])
+                continue
+            # запись идемпотентна: при ошибке пачка целиком уйдёт повторно
+            try:
+                # лист может так и не подключиться: TimeoutError повторится позже
+                async with asyncio.timeout(self.ready_timeout):
+                    await repo.wait_ready()
+                await repo.update_rows(rows)
+            except Exception as exc:
+                if _is_transient(exc):
+                    raise
+                attempts = self._attempts[sheet] = self._attempts.get(sheet, 0) + 1
+                if attempts < self.max_attempts:
+                    error = exc
+                    continue
+                logger.error(
+                    'Move %s writes for %s to dead letter after %s attempts',
+                    len(raw_by_sheet[sheet]),
+                    sheet,
+                    attempts,
+                    exc_info=exc,
+                )
+                dead.extend(raw_by_sheet[sheet])
+            self._attempts.pop(sheet, None)
+        if error is not None:
+            raise error
+        return dead
+
+    async def metrics(self) -> QueueMetrics:
+        async with self.__redis.client.pipeline(transaction=True) as pipe:
+            pipe.llen(self.QUEUE_KEY)
+            pipe.lindex(self.QUEUE_KEY, 0)
+            depth, oldest = await pipe.execute()
+        lag = time.time() - float(mjson.decode(oldest)['ts']) if oldest else 0.0
+        return QueueMetrics(depth=depth, lag=lag)
+
+    async def run(self) -> None:
+        delay = self.flush_interval
+        while True:
+            await asyncio.sleep(delay)
+            try:
+                while await self.flush() >= self.batch_size:
+                    pass
+                delay = self.flush_interval
+            except Exception as exc:
+                self.failures += 1
+                delay = min(delay * 2, self.max_backoff)
+                logger.warning(
+                    'Sheet writes flush failed, retry in %.1fs', delay, exc_info=exc
+                )
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self.run(), name='sheet-write-queue')
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        if not all(repo.is_ready for repo in self.__repositories.values()):
+            # листы так и не подключились, записи дождутся следующего запуска
+            logger.warning('Sheets are not ready, writes left in queue on shutdown')
+            return
+        try:
+            await self.flush()
+        except Exception as exc:
+            logger.warning('Sheet writes left in queue on shutdown', exc_info=exc)
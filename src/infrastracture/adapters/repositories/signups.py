@@ -0,0 +1,165 @@
+import asyncio
+import logging
+from collections.abc import Mapping
+from contextlib import suppress
+from typing import Any
+
+from src.application.domen.models import LessonActivity
+from src.application.models import UserDTO
+from src.infrastracture.adapters.interfaces.repositories import BaseRepository
+from src.infrastracture.adapters.repositories.sheet_queue import SheetWriteQueue
+from src.infrastracture.database.sqlite import dao
+from src.infrastracture.database.sqlite.db import async_session_maker
+from src.infrastracture.database.sqlite.models import SignUp
+
+logger = logging.getLogger(__name__)
+
+# столбцы таблицы, которые меняются после создания заявки
+_MUTABLE_COLUMNS = ('status', 'cost')
+
+
+class SignUpsRepository:
+    def __init__(self, session_maker=async_session_maker) -> None:
+        self.__session_maker = session_maker
+
+    async def add_signup(
+        self, user: UserDTO, lesson_activity: LessonActivity, activity_type: str
+    ) -> int | None:
+        stored = lesson_activity.model_dump_for_store()
+        async with self.__session_maker() as session:
+            signup = await dao.add_signup(
+                session,
+                user_id=user.id,
+                activity_type=activity_type,
+                phone=str(user.phone),
+                name=user.name,
+                last_name=user.last_name,
+                topic=stored['topic'],
+                option=stored['option'],
+                signed_up_at=stored['datetime'],
+                num_tickets=stored['num_tickets'],
+                status=stored['status'],
+            )
+        return signup.id if signup else None
+
+    async def update_signup(self, signup_id: int, values: dict[str, Any]) -> bool:
+        values = {
+            col_name: str(value) if col_name == 'cost' else value
+            for col_name, value in values.items()
+            if col_name in _MUTABLE_COLUMNS
+        }
+        async with self.__session_maker() as session:
+            return await dao.update_signup(session, signup_id, values)
+
+    async def get_unsynced(self, limit: int) -> list[SignUp]:
+        async with self.__session_maker() as session:
+            return list(await dao.get_unsynced_signups(session, limit))
+
+    async def claim_unsynced(self, limit: int, lease: float) -> list[SignUp]:
+        async with self.__session_maker() as session:
+            return list(await dao.claim_unsynced_signups(session, limit, lease))
+
+    async def release(self, signup_ids: list[int]) -> None:
+        async with self.__session_maker() as session:
+            await dao.release_signups(session, signup_ids)
+
+    async def mark_synced(self, signup_id: int, version: int, sheet_row: int) -> None:
+        async with self.__session_maker() as session:
+            await dao.mark_signup_synced(session, signup_id, version, sheet_row)
+
+
+class SignUpProjector:
+    """Переносит заявки из SQLite в Google Sheets.
+
+    Новые заявки дописываются в конец листа, изменения статуса и стоимости
+    уходят через очередь отложенной записи. Заявка, изменённая во время
+    синхронизации, остаётся несинхронизированной и уйдёт на следующем проходе.
+    Перед переносом реплика забирает заявки на ``lease`` секунд, поэтому
+    другие реплики их не дописывают в лист повторно.
+    """
+
+    def __init__(
+        self,
+        signups: SignUpsRepository,
+        repositories: Mapping[str, BaseRepository],
+        write_queue: SheetWriteQueue,
+        interval: float = 1.0,
+        batch_size: int = 50,
+        max_backoff: float = 60.0,
+        lease: float = 300.0,
+    ) -> None:
+        self.__signups = signups
+        self.__repositories = repositories
+        self.__write_queue = write_queue
+        self.interval = interval
+        self.batch_size = batch_size
+        self.max_backoff = max_backoff
+        self.lease = lease
+        self._task: asyncio.Task | None = None
+
+    @staticmethod
+    def row_values(signup: SignUp) -> list[Any]:
+        # единственное место, где задан порядок столбцов листа записей
+        return [
+            signup.phone,
+            signup.name,
+            signup.last_name,
+            signup.topic,
+            signup.option,
+            signup.signed_up_at,
+            signup.num_tickets,
+            signup.status,
+        ]
+
+    async def sync(self) -> int:
+        """Синхронизирует одну пачку заявок, возвращает их количество."""
+        signups = await self.__signups.claim_unsynced(self.batch_size, self.lease)
+        for idx, signup in enumerate(signups):
+            try:
+                await self._sync_one(signup)
+            except BaseException:
+                # необработанные заявки сразу доступны следующему проходу
+                await self.__signups.release([s.id for s in signups[idx:]])
+                raise
+        return len(signups)
+
+    async def _sync_one(self, signup: SignUp) -> None:
+        repo = self.__repositories[signup.activity_type]
+        changes = {'status': signup.status}
+        if signup.cost is not None:
+            changes['cost'] = signup.cost
+        if signup.sheet_row is None:
+            # если бот упадёт между append и сохранением номера строки,
+            # после истечения захвата строка будет добавлена повторно
+            sheet_row = await repo.append_row(self.row_values(signup))
+            changes.pop('status')
+        else:
+            sheet_row = signup.sheet_row
+        if changes:
+            await self.__write_queue.enqueue(signup.activity_type, sheet_row, changes)
+        await self.__signups.mark_synced(signup.id, signup.version, sheet_row)
+
+    async def run(self) -> None:
+        delay = self.interval
+        while True:
+            await asyncio.sleep(delay)
+            try:
+                while await self.sync() >= self.batch_size:
+                    pass
+                delay = self.interval
+            except Exception as exc:
+                delay = min(delay * 2, self.max_backoff)
+                logger.warning(
+                    'Sign-ups sync failed, retry in %.1fs', delay, exc_info=exc
+                )
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self.run(), name='signup-projector')
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
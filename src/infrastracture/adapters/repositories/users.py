@@ -41,6 +41,14 @@ class RepositoryUser(UsersAbstractRepository):
                 for user in users
             ]
 
+    async def get_user_ids(self, after: int = 0, limit: int = 500) -> list[int]:
+        async with self.__session_maker() as session:
+            return list(await dao.get_user_ids(session, after=after, limit=limit))
+
+    async def count_users(self) -> int:
+        async with self.__session_maker() as session:
+            return await dao.count_users(session)
+
     async def add_user(self, user: UserDTO) -> bool:
         async with self.__session_maker() as session:
             if await dao.get_user(session, user.id):
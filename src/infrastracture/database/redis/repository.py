@@ -4,8 +4,9 @@ from collections.abc import Callable
 from functools import wraps
 from typing import Any, TypeVar, cast
 
-from pydantic import BaseModel, TypeAdapter
+from pydantic import BaseModel
 from redis.asyncio import Redis
+from redis.commands.core import AsyncScript
 from redis.typing import ExpiryT
 
 from src.application.models import UserDTO
@@ -20,6 +21,27 @@ _HOUR = _MINUTE * 60
 _DAY = _HOUR * 24
 _MONTH = _DAY * 30
 
+# атомарно дописывает поля в JSON-словарь под ключом; ключа нет — ничего не делает.
+# ARGV[2] — срок жизни в секундах, 0 — сохранить текущий
+_MERGE_SCRIPT = """
+local raw = redis.call('GET', KEYS[1])
+if not raw then
+    return nil
+end
+local data = cjson.decode(raw)
+for k, v in pairs(cjson.decode(ARGV[1])) do
+    data[k] = v
+end
+local encoded = cjson.encode(data)
+local ttl = tonumber(ARGV[2])
+if ttl > 0 then
+    redis.call('SET', KEYS[1], encoded, 'EX', ttl)
+else
+    redis.call('SET', KEYS[1], encoded, 'KEEPTTL')
+end
+return encoded
+"""
+
 
 def auto_pack_key_async(func: Callable[..., T]) -> Callable[..., T]:
     @wraps(func)
@@ -33,14 +55,14 @@ def auto_pack_key_async(func: Callable[..., T]) -> Callable[..., T]:
 class RedisRepository:
     def __init__(self, client: Redis) -> None:
         self.client = client
+        self._merge_script: AsyncScript | None = None
 
     @auto_pack_key_async
     async def get(self, key: StorageKey | str, validator: type[T]) -> T | None:
         value: Any | None = await self.client.get(key)
         if value is None:
             return None
-        value = mjson.decode(value)
-        return TypeAdapter[T](validator).validate_python(value)
+        return mjson.typed_decoder(validator)(value)
 
     async def hgetall(self, key: str) -> dict:
         return await self.client.hgetall(key)
@@ -50,8 +72,7 @@ class RedisRepository:
         value: Any | None = await self.client.getdel(key)
         if value is None:
             return None
-        value = mjson.decode(value)
-        return TypeAdapter[T](validator).validate_python(value)
+        return mjson.typed_decoder(validator)(value)
 
     @auto_pack_key_async
     async def rpush(self, key: StorageKey | str, *values: list[str]) -> None:
@@ -63,15 +84,43 @@ class RedisRepository:
 
     @auto_pack_key_async
     async def set(
-        self, key: StorageKey | str, value: Any, ex: ExpiryT | None = _MONTH
+        self,
+        key: StorageKey | str,
+        value: Any,
+        ex: ExpiryT | None = _MONTH,
+        lock: bool = False,
     ) -> None:
+        """Записывает значение одним SET.
+
+        lock: взять распределённую блокировку на время записи. Нужна только
+            если запись должна ждать чужой lock по тому же ключу, для
+            read-modify-write используйте ``merge``.
+        """
         if isinstance(value, BaseModel):
             value = value.model_dump(exclude_defaults=True)
         if isinstance(value, UserDTO):
             value = value.to_dict()
+        if not lock:
+            await self.client.set(name=key, value=mjson.encode(value), ex=ex)
+            return
         async with self.client.lock(f'lock:{key}'):
             await self.client.set(name=key, value=mjson.encode(value), ex=ex)
 
+    @auto_pack_key_async
+    async def merge(
+        self, key: StorageKey | str, fields: dict[str, Any], ex: int | None = _MONTH
+    ) -> dict | None:
+        """Атомарно дописывает поля в словарь под ключом (Lua на стороне Redis).
+
+        Возвращает словарь после изменения или None, если ключа нет.
+        """
+        if self._merge_script is None:
+            self._merge_script = self.client.register_script(_MERGE_SCRIPT)
+        value = await self._merge_script(keys=[key], args=[mjson.encode(fields), ex or 0])
+        if value is None:
+            return None
+        return mjson.decode(value)
+
     async def hset(
         self,
         name: str,
@@ -80,9 +129,14 @@ class RedisRepository:
         mapping: dict | None = None,
         ex: ExpiryT | None = _MONTH,
     ) -> None:
-        await self.client.hset(name, key, value, mapping)
-        if ex:
-            await self.client.expire(name, ex)
+        if not ex:
+            await self.client.hset(name, key, value, mapping)
+            return
+        # HSET и EXPIRE одной транзакцией: один round trip, ключ не живёт без TTL
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.hset(name, key, value, mapping)
+            pipe.expire(name, ex)
+            await pipe.execute()
 
     @auto_pack_key_async
     async def delete(self, key: StorageKey | str) -> None:
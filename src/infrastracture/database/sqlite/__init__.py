@@ -1,11 +1,17 @@
 from .dao import (
     add_activity,
+    get_activity_by_id,
     get_all_activity_by_type,
+    patch_activity,
+    patch_activity_by_id,
+    remove_activity_by_id,
     remove_activity_by_theme_and_type,
+    update_activity_date_by_id,
     update_activity_date_by_name,
     update_activity_description_by_name,
     update_activity_fileid_by_name,
     update_activity_name_by_name,
+    update_activity_time_by_id,
     update_activity_time_by_name,
 )
 
@@ -18,4 +24,10 @@ __all__ = [
     'update_activity_name_by_name',
     'update_activity_date_by_name',
     'update_activity_time_by_name',
+    'patch_activity',
+    'get_activity_by_id',
+    'patch_activity_by_id',
+    'update_activity_date_by_id',
+    'update_activity_time_by_id',
+    'remove_activity_by_id',
 ]
@@ -1,4 +1,5 @@
-from collections.abc import Callable
+from collections.abc import Callable, Mapping
+from types import MappingProxyType
 
 import emoji
 from sqlalchemy import select
@@ -13,6 +14,32 @@ def de_emojify(text: str) -> str:
     return emoji.replace_emoji(text.strip(), replace='')
 
 
+# Имя типа занятия (значение ActivityTypeEnum с эмодзи или без, без пробелов
+# по краям) → id. Заполняется в init_db, после этого типы не меняются
+_activity_type_ids: Mapping[str, int] = MappingProxyType({})
+
+
+def activity_type_id(name: str) -> int | None:
+    if not _activity_type_ids:
+        raise RuntimeError('Activity types are not loaded, call init_db first')
+    return _activity_type_ids.get(name.strip())
+
+
+async def load_activity_type_ids(session: AsyncSession) -> Mapping[str, int]:
+    global _activity_type_ids
+    by_name = dict(
+        (await session.execute(select(ActivityType.name, ActivityType.id))).all()
+    )
+    ids: dict[str, int] = {}
+    for activity_type in ActivityTypeEnum:
+        safe_str = de_emojify(activity_type)
+        if safe_str in by_name:
+            type_id = by_name[safe_str]
+            ids[activity_type.value.strip()] = ids[safe_str.strip()] = type_id
+    _activity_type_ids = MappingProxyType(ids)
+    return _activity_type_ids
+
+
 async def _create_db() -> None:
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
@@ -31,7 +58,7 @@ def connection(func) -> Callable:
 async def init_db() -> None:
     await _create_db()
     async with async_session_maker() as session:
-        existing_types = (await session.execute(select(ActivityType.name))).all()
+        existing_types = (await session.scalars(select(ActivityType.name))).all()
         try:
             # Создаем предопределенные типы, если их нет
             for activity_type in ActivityTypeEnum:
@@ -42,5 +69,4 @@ async def init_db() -> None:
             await session.commit()
         except IntegrityError:
             await session.rollback()
-        finally:
-            await session.close()
+        await load_activity_type_ids(session)
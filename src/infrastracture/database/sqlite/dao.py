@@ -1,25 +1,33 @@
 import logging
 from collections.abc import Sequence
-from datetime import date, datetime, time
-
-from sqlalchemy import select, update
+from datetime import UTC, date, datetime, time
+from typing import Any
+
+from sqlalchemy import (
+    ColumnElement,
+    String,
+    case,
+    delete,
+    func,
+    literal,
+    or_,
+    select,
+    update,
+)
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.application.domen.models.activity_type import ActivityType as ActType
-from src.config import get_config
-from src.infrastracture.database.sqlite.base import de_emojify
-from src.infrastracture.database.sqlite.models import Activity, ActivityType, User
+from src.infrastracture.database.sqlite.base import activity_type_id
+from src.infrastracture.database.sqlite.models import (
+    Activity,
+    SignUp,
+    User,
+)
 
 logger = logging.getLogger(__name__)
 
 
-async def get_act_type_by_name(session: AsyncSession, name: str) -> ActivityType | None:
-    return await session.scalar(
-        select(ActivityType).where(ActivityType.name == de_emojify(name))
-    )
-
-
 async def add_activity(
     session: AsyncSession,
     activity_type: str,
@@ -30,11 +38,11 @@ async def add_activity(
     date_time: datetime | None = None,
 ) -> Activity | None:
     try:
-        act_type = await get_act_type_by_name(session, activity_type)
-        if not act_type:
+        type_id = activity_type_id(activity_type)
+        if type_id is None:
             return None
         activity = Activity(
-            activity_type=act_type,
+            type_id=type_id,
             theme=theme,
             file_id=image_id,
             content_type=content_type,
@@ -54,65 +62,147 @@ async def add_activity(
 async def get_all_activity_by_type(
     session: AsyncSession, activity_type: str
 ) -> Sequence[Activity]:
+    type_id = activity_type_id(activity_type)
+    if type_id is None:
+        return []
     stmt = (
         select(Activity)
-        .join(ActivityType)
-        .where(ActivityType.name == de_emojify(activity_type))
+        .where(Activity.type_id == type_id)
         .order_by(Activity.created_at.desc())
     )
     return (await session.scalars(stmt)).all()
 
 
-async def update_activity_name_by_name(
-    session: AsyncSession, activity_type: ActType, old_theme: str, new_theme: str
+# SQLite хранит DateTime строкой 'YYYY-MM-DD HH:MM:SS.ffffff': дату и время
+# можно заменить по отдельности прямо в UPDATE, не читая строку заранее
+_MIDNIGHT = '00:00:00.000000'
+# без даты время не задаётся
+_HAS_DATE = Activity.date_time.is_not(None)
+
+
+def _date_value(new_date: date | None) -> ColumnElement | None:
+    if not new_date:
+        return None
+    new_date_str = literal(new_date.isoformat(), String)
+    # время сохраняется, если было задано
+    return func.coalesce(
+        new_date_str.concat(func.substr(Activity.date_time, 11)),
+        new_date_str.concat(f' {_MIDNIGHT}'),
+    )
+
+
+def _time_value(new_time: time | None) -> ColumnElement:
+    new_time_str = new_time.strftime('%H:%M:%S.%f') if new_time else _MIDNIGHT
+    return func.substr(Activity.date_time, 1, 11).concat(new_time_str)
+
+
+async def _update_activity(
+    session: AsyncSession, values: dict[str, Any], *where: ColumnElement[bool]
 ) -> Activity | None:
+    if not values:
+        return None
+    stmt = update(Activity).where(*where).values(**values).returning(Activity)
     try:
-        activity = await get_activity_by_theme_and_type(session, activity_type, old_theme)
-        activity.theme = new_theme
+        activity = (await session.scalars(stmt)).first()
+        if activity is not None:
+            # отвязываем от сессии, чтобы commit не сбросил загруженные поля
+            session.expunge(activity)
         await session.commit()
         return activity
     except SQLAlchemyError:
-        logger.error('Update new_name activity %s failed', old_theme)
+        logger.error('Patch activity failed')
         await session.rollback()
 
 
-async def update_activity_description_by_name(
-    session: AsyncSession, activity_type: str, theme: str, new_description: str
+async def patch_activity(
+    session: AsyncSession,
+    activity_type: str,
+    theme: str,
+    values: dict[str, Any],
+    *where: ColumnElement[bool],
 ) -> Activity | None:
+    """Меняет поля занятия одним ``UPDATE ... RETURNING``.
+
+    В ``values`` можно передать сразу несколько полей, значения могут быть
+    SQL-выражениями над текущей строкой. Темы не уникальны, поэтому меняется
+    только первое подходящее занятие, как и в ``get_activity_by_theme_and_type``.
+    """
+    type_id = activity_type_id(activity_type)
+    if type_id is None:
+        return None
+    first = (
+        select(Activity.id)
+        .where(Activity.type_id == type_id, Activity.theme == theme, *where)
+        .order_by(Activity.id)
+        .limit(1)
+        .scalar_subquery()
+    )
+    return await _update_activity(session, values, Activity.id == first)
+
+
+async def get_activity_by_id(session: AsyncSession, activity_id: int) -> Activity | None:
+    return await session.get(Activity, activity_id)
+
+
+async def patch_activity_by_id(
+    session: AsyncSession,
+    activity_id: int,
+    values: dict[str, Any],
+    *where: ColumnElement[bool],
+) -> Activity | None:
+    """Как ``patch_activity``, но занятие ищется по первичному ключу."""
+    return await _update_activity(session, values, Activity.id == activity_id, *where)
+
+
+async def update_activity_date_by_id(
+    session: AsyncSession, activity_id: int, new_date: date | None
+) -> Activity | None:
+    return await patch_activity_by_id(
+        session, activity_id, {'date_time': _date_value(new_date)}
+    )
+
+
+async def update_activity_time_by_id(
+    session: AsyncSession, activity_id: int, new_time: time | None = None
+) -> Activity | None:
+    return await patch_activity_by_id(
+        session, activity_id, {'date_time': _time_value(new_time)}, _HAS_DATE
+    )
+
+
+async def remove_activity_by_id(session: AsyncSession, activity_id: int) -> bool:
     try:
-        activity = await get_activity_by_theme_and_type(session, activity_type, theme)
-        activity.description = new_description
+        removed = await session.scalar(
+            delete(Activity).where(Activity.id == activity_id).returning(Activity.id)
+        )
         await session.commit()
-        return activity
     except SQLAlchemyError:
-        logger.error('Update description activity failed', theme)
+        logger.error('Removing activity %s failed', activity_id)
         await session.rollback()
+        return False
+    return removed is not None
+
+
+async def update_activity_name_by_name(
+    session: AsyncSession, activity_type: ActType, old_theme: str, new_theme: str
+) -> Activity | None:
+    return await patch_activity(session, activity_type, old_theme, {'theme': new_theme})
+
+
+async def update_activity_description_by_name(
+    session: AsyncSession, activity_type: str, theme: str, new_description: str
+) -> Activity | None:
+    return await patch_activity(
+        session, activity_type, theme, {'description': new_description}
+    )
 
 
 async def update_activity_date_by_name(
     session: AsyncSession, activity_type: str, theme: str, new_date: date | None
 ) -> Activity | None:
-    try:
-        activity = await get_activity_by_theme_and_type(session, activity_type, theme)
-        old_datetime = activity.date_time
-        if not new_date:
-            activity.date_time = None
-        elif old_datetime:
-            activity.date_time = datetime.combine(
-                new_date, old_datetime.time(), tzinfo=get_config().zone_info
-            )
-        else:
-            activity.date_time = datetime(
-                new_date.year,
-                new_date.month,
-                new_date.day,
-                tzinfo=get_config().zone_info,
-            )
-        await session.commit()
-        return activity
-    except SQLAlchemyError:
-        logger.error('Update description activity failed', theme)
-        await session.rollback()
+    return await patch_activity(
+        session, activity_type, theme, {'date_time': _date_value(new_date)}
+    )
 
 
 async def update_activity_time_by_name(
@@ -121,25 +211,9 @@ async def update_activity_time_by_name(
     theme: str,
     new_time: time | None = None,
 ) -> Activity | None:
-    z_i = get_config().zone_info
-    try:
-        activity = await get_activity_by_theme_and_type(session, activity_type, theme)
-        old_datetime = activity.date_time
-        if old_datetime:
-            if new_time:
-                activity.date_time = datetime.combine(
-                    old_datetime.date(), new_time, tzinfo=z_i
-                )
-            else:
-                activity.date_time = datetime(
-                    old_datetime.year, old_datetime.month, old_datetime.day, tzinfo=z_i
-                )
-            await session.commit()
-            return activity
-        return None
-    except SQLAlchemyError:
-        logger.error('Update description activity failed', theme)
-        await session.rollback()
+    return await patch_activity(
+        session, activity_type, theme, {'date_time': _time_value(new_time)}, _HAS_DATE
+    )
 
 
 async def update_activity_fileid_by_name(
@@ -149,15 +223,12 @@ async def update_activity_fileid_by_name(
     file_id: str,
     content_type: str,
 ) -> Activity | None:
-    try:
-        activity = await get_activity_by_theme_and_type(session, activity_type, theme)
-        activity.file_id = file_id
-        activity.content_type = content_type
-        await session.commit()
-        return activity
-    except SQLAlchemyError:
-        logger.error('Update description activity %s failed', theme)
-        await session.rollback()
+    return await patch_activity(
+        session,
+        activity_type,
+        theme,
+        {'file_id': file_id, 'content_type': content_type},
+    )
 
 
 async def get_activity_by_theme_and_type(
@@ -165,12 +236,12 @@ async def get_activity_by_theme_and_type(
     activity_type: str,
     theme: str,
 ) -> Activity | None:
-    stmt = (
-        select(Activity)
-        .join(Activity.activity_type)  # Используем relationship для join
-        .where(Activity.theme == theme, ActivityType.name == de_emojify(activity_type))
+    type_id = activity_type_id(activity_type)
+    if type_id is None:
+        return None
+    return await session.scalar(
+        select(Activity).where(Activity.type_id == type_id, Activity.theme == theme)
     )
-    return await session.scalar(stmt)
 
 
 async def remove_activity_by_theme_and_type(
@@ -217,6 +288,25 @@ async def get_users(session: AsyncSession) -> list[User] | None:
     return (await session.scalars(select(User).order_by(User.created_at))).all()
 
 
+async def get_user_ids(
+    session: AsyncSession, after: int = 0, limit: int = 500
+) -> Sequence[int]:
+    """Порция id пользователей больше ``after``, по возрастанию.
+
+    Пагинация по первичному ключу: каждая порция — поиск по индексу,
+    без OFFSET, который перебирает все пропущенные строки.
+    """
+    return (
+        await session.scalars(
+            select(User.id).where(User.id > after).order_by(User.id).limit(limit)
+        )
+    ).all()
+
+
+async def count_users(session: AsyncSession) -> int:
+    return await session.scalar(select(func.count()).select_from(User))
+
+
 async def delete_user(session: AsyncSession, tg_id: int) -> bool:
     user = await get_user(session, tg_id)
     if user:
@@ -240,3 +330,87 @@ async def update_user(session: AsyncSession, tg_id: int, update_data: dict) -> b
         logger.error('Update user failed')
         await session.rollback()
         return False
+
+
+async def add_signup(session: AsyncSession, **values: Any) -> SignUp | None:
+    try:
+        signup = SignUp(**values)
+        session.add(signup)
+        await session.commit()
+        await session.refresh(signup)
+        logger.info('Added signup %s for user %s', signup.id, signup.user_id)
+        return signup
+    except SQLAlchemyError:
+        logger.error('Adding signup failed')
+        await session.rollback()
+
+
+async def update_signup(session: AsyncSession, signup_id: int, values: dict) -> bool:
+    try:
+        stmt = (
+            update(SignUp)
+            .where(SignUp.id == signup_id)
+            .values(**values, version=SignUp.version + 1, synced=False)
+        )
+        result = await session.execute(stmt)
+        await session.commit()
+        return result.rowcount > 0
+    except SQLAlchemyError:
+        logger.error('Update signup %s failed', signup_id)
+        await session.rollback()
+        return False
+
+
+async def get_unsynced_signups(session: AsyncSession, limit: int) -> Sequence[SignUp]:
+    stmt = select(SignUp).where(SignUp.synced.is_(False)).order_by(SignUp.id).limit(limit)
+    return (await session.scalars(stmt)).all()
+
+
+async def claim_unsynced_signups(
+    session: AsyncSession, limit: int, lease: float
+) -> Sequence[SignUp]:
+    """Забирает несинхронизированные заявки на ``lease`` секунд.
+
+    Выбор и захват — один UPDATE ... RETURNING, поэтому две реплики не
+    получат одну заявку. Захват упавшей реплики истечёт сам.
+    """
+    now = datetime.now(UTC).timestamp()
+    free = select(SignUp.id).where(
+        SignUp.synced.is_(False),
+        or_(SignUp.claimed_until.is_(None), SignUp.claimed_until < now),
+    )
+    stmt = (
+        update(SignUp)
+        .where(SignUp.id.in_(free.order_by(SignUp.id).limit(limit).scalar_subquery()))
+        .values(claimed_until=now + lease)
+        .returning(SignUp)
+    )
+    signups = (await session.scalars(stmt)).all()
+    for signup in signups:
+        session.expunge(signup)
+    await session.commit()
+    return sorted(signups, key=lambda signup: signup.id)
+
+
+async def release_signups(session: AsyncSession, signup_ids: Sequence[int]) -> None:
+    stmt = update(SignUp).where(SignUp.id.in_(signup_ids)).values(claimed_until=None)
+    await session.execute(stmt)
+    await session.commit()
+
+
+async def mark_signup_synced(
+    session: AsyncSession, signup_id: int, version: int, sheet_row: int
+) -> None:
+    # строку запоминаем всегда, а синхронизированной заявка считается, только
+    # если её не успели изменить — иначе она уйдёт в таблицу ещё раз
+    stmt = (
+        update(SignUp)
+        .where(SignUp.id == signup_id)
+        .values(
+            sheet_row=sheet_row,
+            synced=case((SignUp.version == version, True), else_=SignUp.synced),
+            claimed_until=None,
+        )
+    )
+    await session.execute(stmt)
+    await session.commit()
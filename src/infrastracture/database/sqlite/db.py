@@ -1,17 +1,38 @@
 from datetime import datetime
+from typing import Any
 
-from sqlalchemy import func
+from sqlalchemy import event, func
 from sqlalchemy.ext.asyncio import (
     AsyncAttrs,
+    AsyncEngine,
     AsyncSession,
     async_sessionmaker,
     create_async_engine,
 )
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
-from src.config import get_config
+from src.config import SQLiteSettings, get_config
 
-engine = create_async_engine(url=get_config().db_url)
+
+def create_engine(url: str, settings: SQLiteSettings) -> AsyncEngine:
+    """Движок SQLite с пулом подключений и PRAGMA из ``settings``."""
+    engine = create_async_engine(
+        url,
+        pool_size=settings.pool_size,
+        max_overflow=settings.max_overflow,
+    )
+
+    @event.listens_for(engine.sync_engine, 'connect')
+    def _apply_pragmas(dbapi_connection: Any, connection_record: Any) -> None:
+        cursor = dbapi_connection.cursor()
+        for pragma in settings.pragmas():
+            cursor.execute(pragma)
+        cursor.close()
+
+    return engine
+
+
+engine = create_engine(get_config().db_url, get_config().SQLITE)
 async_session_maker = async_sessionmaker(engine, class_=AsyncSession)
 
 
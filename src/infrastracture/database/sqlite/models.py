@@ -2,7 +2,16 @@ from datetime import datetime
 from enum import StrEnum
 
 from aiogram.types import ContentType
-from sqlalchemy import DateTime, ForeignKey, Integer, String
+from sqlalchemy import (
+    Boolean,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    false,
+)
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.application.domen.text import RU
@@ -33,6 +42,13 @@ class ActivityType(Base):
 # Модель для таблицы пользователей
 class Activity(Base):
     __tablename__ = 'activities'
+    __table_args__ = (
+        # поиск занятия по типу и теме
+        Index('ix_activities_type_id_theme', 'type_id', 'theme'),
+        # список занятий типа по дате создания: SQLite читает индекс в обратном
+        # порядке, поэтому ORDER BY created_at DESC обходится без сортировки
+        Index('ix_activities_type_id_created_at', 'type_id', 'created_at'),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     theme: Mapped[str] = mapped_column(String)
@@ -59,3 +75,32 @@ class User(Base):
     phone: Mapped[str] = mapped_column(String, nullable=True)
     name: Mapped[str] = mapped_column(String, nullable=True)
     last_name: Mapped[str] = mapped_column(String, nullable=True)
+
+
+class SignUp(Base):
+    """Заявка на занятие. Таблица Google Sheets — только её отображение."""
+
+    __tablename__ = 'signups'
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    user_id: Mapped[int] = mapped_column(Integer, index=True)
+    # ключ листа, значение ActivityEnum
+    activity_type: Mapped[str] = mapped_column(String)
+    phone: Mapped[str] = mapped_column(String, nullable=True)
+    name: Mapped[str] = mapped_column(String, nullable=True)
+    last_name: Mapped[str] = mapped_column(String, nullable=True)
+    topic: Mapped[str] = mapped_column(String, nullable=True)
+    option: Mapped[str] = mapped_column(String, nullable=True)
+    # время заявки в том виде, в каком оно пишется в таблицу
+    signed_up_at: Mapped[str] = mapped_column(String, nullable=True)
+    num_tickets: Mapped[int] = mapped_column(Integer, default=1)
+    status: Mapped[str] = mapped_column(String)
+    cost: Mapped[str | None] = mapped_column(String, nullable=True)
+
+    sheet_row: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    version: Mapped[int] = mapped_column(Integer, default=1, server_default='1')
+    synced: Mapped[bool] = mapped_column(
+        Boolean, default=False, server_default=false(), index=True
+    )
+    # до какого времени (unix timestamp) заявку переносит одна из реплик
+    claimed_until: Mapped[float | None] = mapped_column(Float, nullable=True)
@@ -1,9 +1,12 @@
+import asyncio
 import csv
 import io
 import logging
-from dataclasses import fields
+from contextlib import suppress
+from dataclasses import fields, replace
 
 from src.application.models import UserDTO, UserTgId
+from src.application.utils.cache import LRUCache
 from src.infrastracture.adapters.interfaces.repositories import UsersAbstractRepository
 from src.infrastracture.database.redis.repository import RedisRepository
 
@@ -41,32 +44,64 @@ def generate_csv_buffer(users: list[UserDTO]) -> tuple[io.BytesIO, str]:
 
 
 class UsersService:
-    def __init__(self, cache_time, repository, redis) -> None:
+    """Пользователи: SQLite, кэш в Redis и локальный кэш процесса перед ним.
+
+    Изменения пользователя публикуются в канал ``INVALIDATE_CHANNEL``,
+    другие реплики бота по нему сбрасывают свой локальный кэш.
+    """
+
+    INVALIDATE_CHANNEL: str = 'users:invalidate'
+
+    def __init__(
+        self,
+        cache_time,
+        repository,
+        redis,
+        local_cache: LRUCache[UserDTO] | None = None,
+    ) -> None:
         self.cache_time_for_users: int = cache_time
         self.__redis: RedisRepository = redis
         self.__repository: UsersAbstractRepository = repository
+        self.local_cache: LRUCache[UserDTO] = local_cache or LRUCache()
+        self._listener: asyncio.Task | None = None
 
     async def add_user(self, user: UserDTO) -> UserDTO:
         await self.__repository.add_user(user)
         await self._save_user(user)
+        await self._invalidate(user.id)
         return user
 
     async def _save_user(self, user: UserDTO) -> None:
         await self.__redis.save_user(user.id, user, self.cache_time_for_users)
 
+    async def _invalidate(self, user_id: UserTgId) -> None:
+        self.local_cache.pop(user_id)
+        try:
+            await self.__redis.client.publish(self.INVALIDATE_CHANNEL, user_id)
+        except Exception as exc:
+            # другие реплики увидят изменения не позже, чем через ttl кэша
+            logger.warning('Failed to publish invalidation of %s', user_id, exc_info=exc)
+
     async def update_user(self, user: UserDTO) -> bool:
         if success := await self.__repository.update_user(user):
             await self._save_user(user)
+            await self._invalidate(user.id)
         return success
 
     async def get_user(
         self, user_id: UserTgId, update_reg: bool = False
     ) -> UserDTO | None:
+        if user := self.local_cache.get(user_id):
+            # копия: вызывающий код может менять поля до update_user
+            return replace(user)
         if (user := await self.__redis.get_user(user_id)) or update_reg:
+            if user:
+                self.local_cache.set(user_id, replace(user))
             return user
         user = await self.__repository.get_user(user_id)
         if user:
             await self._save_user(user)
+            self.local_cache.set(user_id, replace(user))
         return user
 
     async def get_users(self) -> list[UserDTO]:
@@ -75,5 +110,33 @@ class UsersService:
 
     async def remove_user(self, user_id: UserTgId, only_cache: bool = False) -> bool:
         await self.__redis.delete_user(user_id)
+        await self._invalidate(user_id)
         if not only_cache:
             return await self.__repository.delete_user(user_id)
+
+    async def listen_invalidations(self) -> None:
+        while True:
+            try:
+                async with self.__redis.client.pubsub() as pubsub:
+                    await pubsub.subscribe(self.INVALIDATE_CHANNEL)
+                    # пока подписки не было, сообщения могли потеряться
+                    self.local_cache.clear()
+                    async for message in pubsub.listen():
+                        if message['type'] == 'message':
+                            self.local_cache.pop(int(message['data']))
+            except Exception as exc:
+                logger.warning('Users invalidation channel lost', exc_info=exc)
+                await asyncio.sleep(1)
+
+    def start(self) -> None:
+        if self._listener is None:
+            self._listener = asyncio.create_task(
+                self.listen_invalidations(), name='users-invalidation'
+            )
+
+    async def stop(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._listener
+            self._listener = None
@@ -0,0 +1,255 @@
+import asyncio
+import logging
+from collections import Counter
+from contextlib import suppress
+from dataclasses import dataclass
+from enum import StrEnum
+from functools import partial
+from uuid import uuid4
+
+from aiogram import Bot
+from aiogram.enums.parse_mode import ParseMode
+from aiogram.exceptions import TelegramForbiddenError
+
+from src.infrastracture.adapters.interfaces.repositories import UsersAbstractRepository
+from src.infrastracture.database.redis.repository import RedisRepository
+from src.presentation.outbox import Priority, TelegramOutbox
+
+logger = logging.getLogger(__name__)
+
+
+class BroadcastStatus(StrEnum):
+    RUNNING = 'running'
+    DONE = 'done'
+    CANCELLED = 'cancelled'
+    FAILED = 'failed'
+
+
+class Delivery(StrEnum):
+    DELIVERED = 'delivered'
+    BLOCKED = 'blocked'  # пользователь остановил бота
+    FAILED = 'failed'
+
+
+@dataclass(slots=True, frozen=True)
+class BroadcastProgress:
+    status: BroadcastStatus | None
+    total: int = 0
+    delivered: int = 0
+    blocked: int = 0
+    failed: int = 0
+
+    @property
+    def processed(self) -> int:
+        return self.delivered + self.blocked + self.failed
+
+
+class Broadcaster:
+    """Рассылка сообщения всем зарегистрированным пользователям.
+
+    Получатели читаются из таблицы ``users`` порциями по ``chunk_size``,
+    сообщения уходят через общую очередь ``TelegramOutbox`` с приоритетом BULK,
+    поэтому рассылка не мешает ответам пользователям. После каждой порции
+    курсор и счётчики сохраняются в Redis: после перезапуска рассылка
+    продолжится со следующей порции, повторно могут уйти только сообщения
+    прерванной порции. Рассылку ведёт одна реплика, её держит блокировка,
+    пока рассылка идёт, блокировка продлевается каждые ``lock_ttl / 3`` секунд.
+    """
+
+    STATE_KEY: str = 'broadcast:state'
+    LOCK_KEY: str = 'broadcast:lock'
+
+    def __init__(
+        self,
+        bot: Bot,
+        users: UsersAbstractRepository,
+        redis: RedisRepository,
+        outbox: TelegramOutbox,
+        chunk_size: int = 100,
+        lock_ttl: int = 60,
+    ) -> None:
+        self.bot = bot
+        self.users = users
+        self.redis = redis
+        self.outbox = outbox
+        self.chunk_size = chunk_size
+        self.lock_ttl = lock_ttl
+        self._token = uuid4().hex
+        self._task: asyncio.Task | None = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def _lock(self) -> bool:
+        locked = await self.redis.client.set(
+            self.LOCK_KEY, self._token, nx=True, ex=self.lock_ttl
+        )
+        return bool(locked)
+
+    async def _keep_lock(self) -> None:
+        client = self.redis.client
+        while True:
+            await asyncio.sleep(self.lock_ttl / 3)
+            if await client.get(self.LOCK_KEY) == self._token:
+                await client.expire(self.LOCK_KEY, self.lock_ttl)
+
+    async def _unlock(self) -> None:
+        client = self.redis.client
+        if await client.get(self.LOCK_KEY) == self._token:
+            await client.delete(self.LOCK_KEY)
+
+    async def start(self, admin_id: int, text: str) -> bool:
+        """Запускает рассылку, False — если другая рассылка ещё идёт."""
+        if self.is_running or not await self._lock():
+            return False
+        total = await self.users.count_users()
+        async with self.redis.client.pipeline(transaction=True) as pipe:
+            pipe.delete(self.STATE_KEY)
+            pipe.hset(
+                self.STATE_KEY,
+                mapping={
+                    'status': BroadcastStatus.RUNNING,
+                    'admin_id': admin_id,
+                    'text': text,
+                    'cursor': 0,
+                    'total': total,
+                },
+            )
+            await pipe.execute()
+        logger.info('Broadcast to %s users started by %s', total, admin_id)
+        self._task = asyncio.create_task(self._run(), name='broadcast')
+        return True
+
+    async def resume(self) -> None:
+        """Продолжает рассылку, прерванную перезапуском бота."""
+        status = await self.redis.client.hget(self.STATE_KEY, 'status')
+        if status != BroadcastStatus.RUNNING or self.is_running:
+            return
+        self._task = asyncio.create_task(self._resume(), name='broadcast')
+
+    async def _resume(self) -> None:
+        client = self.redis.client
+        # блокировку мог оставить процесс, который не успел её снять: ждём, пока
+        # истечёт её срок. Живая реплика её продлевает и продолжит рассылку сама
+        while not await self._lock():
+            pttl = await client.pttl(self.LOCK_KEY)
+            await asyncio.sleep(pttl / 1000 if pttl > 0 else 0.1)
+            if await client.hget(self.STATE_KEY, 'status') != BroadcastStatus.RUNNING:
+                return
+        logger.info('Resume broadcast')
+        await self._run()
+
+    async def cancel(self) -> None:
+        """Останавливает рассылку по просьбе администратора."""
+        await self.stop()
+        if (await self.progress()).status is BroadcastStatus.RUNNING:
+            await self._finish(BroadcastStatus.CANCELLED)
+
+    async def stop(self) -> None:
+        """Прерывает рассылку при выключении, она продолжится после запуска."""
+        if self._task is not None:
+            self._task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+            await self._unlock()
+
+    async def progress(self) -> BroadcastProgress:
+        state = await self.redis.client.hgetall(self.STATE_KEY)
+        if not state:
+            return BroadcastProgress(status=None)
+        return BroadcastProgress(
+            status=BroadcastStatus(state['status']),
+            total=int(state.get('total', 0)),
+            **{d.value: int(state.get(d.value, 0)) for d in Delivery},
+        )
+
+    async def _send(self, user_id: int, text: str) -> Delivery:
+        try:
+            await self.outbox.run(
+                user_id,
+                partial(self.bot.send_message, user_id, text, parse_mode=ParseMode.HTML),
+                Priority.BULK,
+            )
+        except TelegramForbiddenError:
+            return Delivery.BLOCKED
+        except Exception as exc:
+            logger.warning('Broadcast to %s failed: %s', user_id, exc)
+            return Delivery.FAILED
+        return Delivery.DELIVERED
+
+    async def _checkpoint(self, cursor: int, counts: Counter) -> None:
+        async with self.redis.client.pipeline(transaction=True) as pipe:
+            pipe.hset(self.STATE_KEY, 'cursor', cursor)
+            for delivery, count in counts.items():
+                pipe.hincrby(self.STATE_KEY, delivery.value, count)
+            pipe.expire(self.LOCK_KEY, self.lock_ttl)
+            await pipe.execute()
+
+    async def _run(self) -> None:
+        keep_lock = asyncio.create_task(self._keep_lock())
+        try:
+            await self._deliver()
+        finally:
+            keep_lock.cancel()
+
+    async def _deliver(self) -> None:
+        try:
+            state = await self.redis.client.hgetall(self.STATE_KEY)
+            text, cursor = state['text'], int(state['cursor'])
+            while ids := await self.users.get_user_ids(cursor, self.chunk_size):
+                # рассылку могли остановить с другой реплики
+                status = await self.redis.client.hget(self.STATE_KEY, 'status')
+                if status != BroadcastStatus.RUNNING:
+                    await self._unlock()
+                    return
+                counts = Counter(
+                    await asyncio.gather(*(self._send(user_id, text) for user_id in ids))
+                )
+                cursor = ids[-1]
+                await self._checkpoint(cursor, counts)
+        except Exception as exc:
+            logger.error('Broadcast failed', exc_info=exc)
+            await self._finish(BroadcastStatus.FAILED)
+        else:
+            await self._finish(BroadcastStatus.DONE)
+
+    async def _finish(self, status: BroadcastStatus) -> None:
+        client = self.redis.client
+        try:
+            admin_id = await client.hget(self.STATE_KEY, 'admin_id')
+            if admin_id is not None:
+                await client.hset(self.STATE_KEY, 'status', status)
+        finally:
+            # без снятой блокировки новая рассылка не стартует до истечения ttl
+            await self._unlock()
+        if admin_id is None:
+            return
+        progress = await self.progress()
+        logger.info('Broadcast %s: %s', status, progress)
+        text = (
+            f'📣 Рассылка: {status_text(status)}\n\n'
+            f'Доставлено: {progress.delivered}\n'
+            f'Заблокировали бота: {progress.blocked}\n'
+            f'Ошибки: {progress.failed}'
+        )
+        with suppress(Exception):
+            await self.outbox.run(
+                int(admin_id),
+                partial(self.bot.send_message, int(admin_id), text),
+                Priority.ADMIN,
+            )
+
+
+def status_text(status: BroadcastStatus | None) -> str:
+    match status:
+        case BroadcastStatus.RUNNING:
+            return 'идёт'
+        case BroadcastStatus.DONE:
+            return 'завершена'
+        case BroadcastStatus.CANCELLED:
+            return 'остановлена'
+        case BroadcastStatus.FAILED:
+            return 'прервана из-за ошибки'
+    return 'не запускалась'
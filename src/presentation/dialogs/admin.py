@@ -2,11 +2,11 @@ import asyncio
 import logging
 import re
 from datetime import date, datetime, time
+from functools import partial
 from typing import Any
 
 from aiogram import Bot, F
 from aiogram.enums.parse_mode import ParseMode
-from aiogram.exceptions import TelegramNetworkError, TelegramServerError
 from aiogram.types import BufferedInputFile, CallbackQuery, ContentType, Message
 from aiogram.utils.deep_linking import create_start_link
 from aiogram.utils.keyboard import InlineKeyboardBuilder
@@ -55,6 +55,7 @@ from src.infrastracture.adapters.repositories.repo import UsersRepository
 from src.infrastracture.database.redis.keys import AdminKey
 from src.infrastracture.database.redis.repository import RedisRepository
 from src.infrastracture.repository.users import generate_csv_buffer
+from src.presentation.broadcast import Broadcaster, BroadcastStatus, status_text
 from src.presentation.callbacks import (
     PaymentCallback,
     PaymentScreenCallback,
@@ -79,6 +80,8 @@ from src.presentation.dialogs.utils import (
     safe_text_with_link,
     store_activities_by_type,
 )
+from src.presentation.message_sender import DripMessage, DripSender
+from src.presentation.outbox import Priority, TelegramOutbox
 from src.presentation.reminders.payment_reminder import PaymentReminder
 
 logger = logging.getLogger(__name__)
@@ -108,24 +111,6 @@ def parse_time_regex(time_str: str | None) -> time | None:
     return None
 
 
-async def safe_call(coro, *, retries=3, base_delay=1):
-    for i in range(retries):
-        try:
-            return await coro
-        except (TelegramNetworkError, TelegramServerError):
-            if i == retries - 1:
-                raise
-            await asyncio.sleep(base_delay * (2**i))
-
-
-sem = asyncio.Semaphore(5)  # ограничение параллелизма
-
-
-async def limited(coro):
-    async with sem:
-        return await safe_call(coro)
-
-
 def _get_activity_repo(dialog_manager: DialogManager) -> ActivityAbstractRepository:
     return dialog_manager.middleware_data['activity_repository']
 
@@ -144,19 +129,11 @@ async def generate_deep_link(
     await callback.message.answer(f'Cсылка для перехода:\n\n{deep_link}')
 
 
-async def send_signup_message(
+def send_signup_message(
     manager: DialogManager, messages: list[str], callback: CallbackQuery
 ) -> None:
     user_id = manager.start_data['user_id']
     d = manager.start_data
-    for m in messages:
-        await manager.event.bot.send_message(
-            chat_id=user_id,
-            text=m,
-            parse_mode=ParseMode.HTML,
-        )
-        await manager.event.bot.send_chat_action(user_id, 'typing')
-        await asyncio.sleep(1.5)
     builder = InlineKeyboardBuilder()
     builder.button(
         text='Прикрепить чек',
@@ -166,16 +143,16 @@ async def send_signup_message(
             admin_id=callback.from_user.id,
         ),
     )
-    await manager.event.bot.send_message(
-        chat_id=user_id,
-        text=(
+    payment_message = DripMessage(
+        (
             'Здесь можно прикрепить чек об оплате\n'
             'псс-с, говорят что это ускоряет обработку оплаты 🤭'
             '\n\n<i>можете оставить комментарий по желанию</i>'
         ),
         reply_markup=builder.as_markup(),
-        parse_mode=ParseMode.HTML,
     )
+    drip: DripSender = manager.middleware_data['drip']
+    drip.enqueue(user_id, [*messages, payment_message], delay=1.5)
 
 
 async def back_step_or_back_to_menu(
@@ -281,9 +258,9 @@ async def send_user_payment(
         reply_markup=builder.as_markup(),
     )
     redis_repository: RedisRepository = manager.middleware_data['redis_repository']
-    reply_to_mess = await redis_repository.get(AdminKey(key=message_id), dict)
-    reply_to_mess[str(callback.from_user.id)] = mess.message_id
-    await redis_repository.set(AdminKey(key=message_id), reply_to_mess, ex=MONTH)
+    reply_to_mess = await redis_repository.merge(
+        AdminKey(key=message_id), {str(callback.from_user.id): mess.message_id}, ex=MONTH
+    )
     logger.info('set new value=%s for message_id=%s', reply_to_mess, message_id)
     await manager.done()
     await manager.reset_stack()
@@ -294,8 +271,6 @@ async def send_to_user(
 ) -> None:
     message_id = manager.start_data['message_id']
     user_id = manager.start_data['user_id']
-    act_type = manager.start_data['activity_type']
-    num_row = int(manager.start_data['num_row'])
     if await message_is_sended(
         manager,
         user_id=message_id,
@@ -308,31 +283,27 @@ async def send_to_user(
     payment_notifier: PaymentReminder = manager.middleware_data['payment_notifier']
     try:
         async with asyncio.TaskGroup() as tg:
-            await limited(
-                close_app_form_for_other_admins(
-                    manager,
-                    message_id=message_id,
-                    responding_admin_id=callback.from_user.id,
-                )
+            await close_app_form_for_other_admins(
+                manager,
+                message_id=message_id,
+                responding_admin_id=callback.from_user.id,
             )
             if a_m := manager.dialog_data.get('admin_messages'):
-                tg.create_task(limited(send_signup_message(manager, a_m, callback)))
+                send_signup_message(manager, a_m, callback)
 
             cost = manager.dialog_data.get('cost', manager.start_data['cost'])
             if cost == 0:
-                tg.create_task(limited(approve_payment(callback, None, manager)))
+                tg.create_task(approve_payment(callback, None, manager))
             else:
-                tg.create_task(limited(send_user_payment(callback, button, manager)))
+                tg.create_task(send_user_payment(callback, button, manager))
     except Exception:
         raise
     repository: UsersRepository = manager.middleware_data['repository']
-    repository.change_values_in_signup_user(
-        act_type,
-        num_row,
-        {'cost': cost, 'status': 'не оплачено'},
+    await repository.update_signup(
+        manager.start_data, {'cost': cost, 'status': 'не оплачено'}
     )
     if cost != 0:
-        await limited(payment_notifier.add_reminder(user_id))
+        await payment_notifier.add_reminder(user_id)
 
 
 async def get_image(
@@ -353,23 +324,25 @@ async def cancel_payment(
     callback: CallbackQuery, button: Button, manager: DialogManager, *_
 ) -> None:
     repository: UsersRepository = manager.middleware_data['repository']
-    repository.change_value_in_signup_user(
-        manager.start_data['activity_type'],
-        int(manager.start_data['num_row']),
-        column_name='status',
-        value='Отменено',
-    )
-    await manager.event.bot.send_message(
-        chat_id=manager.start_data['user_id'],
-        text=(
-            '<i>Привет! 💔'
-            '\nК сожалению нам пришлось отменить занятие — '
-            'загадочные обстоятельства!</i>'
-            '\n\nКамея | Арт-Студия 🎨✨'
-            '<b>\n\nВ случае возникших вопросов свяжитесь с нами '
-            f'{RU.kameya_tg_contact}</b>'
+    await repository.update_signup(manager.start_data, {'status': 'Отменено'})
+    user_id = manager.start_data['user_id']
+    outbox: TelegramOutbox = manager.middleware_data['outbox']
+    await outbox.run(
+        user_id,
+        partial(
+            manager.event.bot.send_message,
+            chat_id=user_id,
+            text=(
+                '<i>Привет! 💔'
+                '\nК сожалению нам пришлось отменить занятие — '
+                'загадочные обстоятельства!</i>'
+                '\n\nКамея | Арт-Студия 🎨✨'
+                '<b>\n\nВ случае возникших вопросов свяжитесь с нами '
+                f'{RU.kameya_tg_contact}</b>'
+            ),
+            parse_mode=_PARSE_MODE_TO_USER,
         ),
-        parse_mode=_PARSE_MODE_TO_USER,
+        Priority.USER,
     )
     user_phone = manager.start_data['user_phone']
     await callback.message.answer(
@@ -399,12 +372,7 @@ async def approve_payment(
         'activity_repository'
     ]
     activity_type = manager.start_data['activity_type']
-    repository.change_value_in_signup_user(
-        activity_type,
-        int(manager.start_data['num_row']),
-        column_name='status',
-        value='оплачено',
-    )
+    await repository.update_signup(manager.start_data, {'status': 'оплачено'})
     cost = manager.dialog_data.get('cost', manager.start_data['cost'])
     topic = manager.dialog_data.get('topic', manager.start_data['topic'])
 
@@ -441,16 +409,22 @@ async def approve_payment(
             '<b>В случае отмены необходимо свяжитесь с '
             f'нами \n{RU.kameya_tg_contact}</b>'
         )
-    await manager.event.bot.send_message(
-        chat_id=manager.start_data['user_id'],
-        text=manager.dialog_data['approve_message'],
-        parse_mode=_PARSE_MODE_TO_USER,
+    user_id = manager.start_data['user_id']
+    send = partial(
+        manager.event.bot.send_message, chat_id=user_id, parse_mode=_PARSE_MODE_TO_USER
+    )
+    outbox: TelegramOutbox = manager.middleware_data['outbox']
+    await outbox.run(
+        user_id, partial(send, text=manager.dialog_data['approve_message']), Priority.USER
     )
     if manager.start_data['activity_type'] != ActivityEnum.CHILD_STUDIO.value:
-        await manager.event.bot.send_message(
-            chat_id=manager.start_data['user_id'],
-            text=('Чтобы узнать как до нас добраться, используйте команду 👉 /how_to'),
-            parse_mode=_PARSE_MODE_TO_USER,
+        await outbox.run(
+            user_id,
+            partial(
+                send,
+                text='Чтобы узнать как до нас добраться, используйте команду 👉 /how_to',
+            ),
+            Priority.USER,
         )
     payment_notifier: PaymentReminder = manager.middleware_data['payment_notifier']
     await approve_form_for_other_admins(
@@ -483,12 +457,11 @@ async def description_handler(
                 'Так как в активности имеется медифайл, '
                 'то описание не должно быть выше 1024 символов'
             )
-        activity_theme = dialog_manager.dialog_data['activity']['theme']
         activ_repository = _get_activity_repo(dialog_manager)
-        activity = await activ_repository.update_activity_description_by_name(
+        activity = await activ_repository.patch_activity_by_id(
             activity_type=dialog_manager.dialog_data['act_type'],
-            theme=activity_theme,
-            new_description=new_description,
+            activity_id=current_act['id'],
+            values={'description': new_description},
         )
         dialog_manager.dialog_data[_IS_EDIT] = False
         if activity:
@@ -516,9 +489,9 @@ async def on_date_selected(
 ) -> None:
     if dialog_manager.dialog_data.get(_IS_EDIT):
         activ_repository = _get_activity_repo(dialog_manager)
-        activity = await activ_repository.update_activity_date_by_name(
+        activity = await activ_repository.update_activity_date_by_id(
             activity_type=dialog_manager.dialog_data['act_type'],
-            theme=dialog_manager.dialog_data['activity']['theme'],
+            activity_id=dialog_manager.dialog_data['activity']['id'],
             new_date=selected_date,
         )
         if activity:
@@ -543,9 +516,9 @@ async def no_date(
     selected_date = None
     if dialog_manager.dialog_data.get(_IS_EDIT):
         activ_repository = _get_activity_repo(dialog_manager)
-        activity = await activ_repository.update_activity_date_by_name(
+        activity = await activ_repository.update_activity_date_by_id(
             activity_type=dialog_manager.dialog_data['act_type'],
-            theme=dialog_manager.dialog_data['activity']['theme'],
+            activity_id=dialog_manager.dialog_data['activity']['id'],
             new_date=selected_date,
         )
         if activity:
@@ -575,9 +548,9 @@ async def time_handler(event: Message, widget, dialog_manager: DialogManager, *_
             await event.answer('Сначал нужно установить дату')
             return dialog_manager.switch_to(AdminActivity.DATE)
         activ_repository = _get_activity_repo(dialog_manager)
-        activity = await activ_repository.update_activity_time_by_name(
+        activity = await activ_repository.update_activity_time_by_id(
             activity_type=dialog_manager.dialog_data['act_type'],
-            theme=dialog_manager.dialog_data['activity']['theme'],
+            activity_id=dialog_manager.dialog_data['activity']['id'],
             new_time=new_time,
         )
         dialog_manager.dialog_data[_IS_EDIT] = False
@@ -601,9 +574,9 @@ async def no_time(
 
     if dialog_manager.dialog_data.get(_IS_EDIT):
         activ_repository = _get_activity_repo(dialog_manager)
-        activity = await activ_repository.update_activity_time_by_name(
+        activity = await activ_repository.update_activity_time_by_id(
             activity_type=dialog_manager.dialog_data['act_type'],
-            theme=dialog_manager.dialog_data['activity']['theme'],
+            activity_id=dialog_manager.dialog_data['activity']['id'],
             new_time=new_time,
         )
         dialog_manager.dialog_data[_IS_EDIT] = False
@@ -629,10 +602,10 @@ async def name_activity_handler(
 ) -> None:
     if dialog_manager.dialog_data.get(_IS_EDIT):
         activ_repository = _get_activity_repo(dialog_manager)
-        activity = await activ_repository.update_activity_name_by_name(
+        activity = await activ_repository.patch_activity_by_id(
             activity_type=dialog_manager.dialog_data['act_type'],
-            old_theme=dialog_manager.dialog_data['activity']['theme'],
-            new_theme=message.text,
+            activity_id=dialog_manager.dialog_data['activity']['id'],
+            values={'theme': message.text},
         )
         if activity:
             scroll: ManagedScroll = dialog_manager.find('scroll')
@@ -653,14 +626,12 @@ async def change_photo(
     file_id: str | None,
     content_type: str | None,
 ) -> None:
-    mclass_theme = dialog_manager.dialog_data['activity']['theme']
     activ_repository = _get_activity_repo(dialog_manager)
 
-    activity = await activ_repository.update_activity_fileid_by_name(
+    activity = await activ_repository.patch_activity_by_id(
         activity_type=dialog_manager.dialog_data['act_type'],
-        theme=mclass_theme,
-        file_id=file_id,
-        content_type=content_type,
+        activity_id=dialog_manager.dialog_data['activity']['id'],
+        values={'file_id': file_id, 'content_type': content_type},
     )
     if activity:
         scroll: ManagedScroll | None = dialog_manager.find('scroll')
@@ -808,9 +779,9 @@ async def remove_activity_from_db(
     activities = dialog_manager.dialog_data.get('activities', [])
     activ_repository = _get_activity_repo(dialog_manager)
 
-    await activ_repository.remove_activity_by_theme_and_type(
+    await activ_repository.remove_activity_by_id(
         activity_type=dialog_manager.dialog_data['act_type'],
-        theme=activities[media_number]['theme'],
+        activity_id=activities[media_number]['id'],
     )
     del activities[media_number]
     l_activities = len(activities)
@@ -889,13 +860,64 @@ async def get_users(
     repository: UsersRepository = manager.middleware_data['repository']
     users = await repository.user.get_users()
     buffer, filename = generate_csv_buffer(users)
-    await manager.event.bot.send_document(
-        chat_id=callback.from_user.id,
-        document=BufferedInputFile(buffer.getvalue(), filename),
-        caption=f'Экспорт пользователей ({len(users)} шт.)',
+    outbox: TelegramOutbox = manager.middleware_data['outbox']
+    await outbox.run(
+        callback.from_user.id,
+        partial(
+            manager.event.bot.send_document,
+            chat_id=callback.from_user.id,
+            document=BufferedInputFile(buffer.getvalue(), filename),
+            caption=f'Экспорт пользователей ({len(users)} шт.)',
+        ),
+        Priority.ADMIN,
     )
 
 
+async def broadcast_text_handler(
+    message: Message, message_input: MessageInput, manager: DialogManager
+) -> None:
+    if not message.text:
+        await message.answer('Рассылка поддерживает только текст')
+        return
+    manager.dialog_data['broadcast_text'] = message.html_text
+    await manager.switch_to(Administration.BROADCAST_CONFIRM)
+
+
+async def start_broadcast(
+    callback: CallbackQuery, button: Button, manager: DialogManager
+) -> None:
+    broadcaster: Broadcaster = manager.middleware_data['broadcaster']
+    text = manager.dialog_data['broadcast_text']
+    if not await broadcaster.start(callback.from_user.id, text):
+        await callback.answer('Предыдущая рассылка ещё идёт', show_alert=True)
+    await manager.switch_to(Administration.BROADCAST_STATUS)
+
+
+async def cancel_broadcast(
+    callback: CallbackQuery, button: Button, manager: DialogManager
+) -> None:
+    broadcaster: Broadcaster = manager.middleware_data['broadcaster']
+    await broadcaster.cancel()
+
+
+async def get_broadcast_preview(dialog_manager: DialogManager, **kwargs) -> dict:
+    broadcaster: Broadcaster = dialog_manager.middleware_data['broadcaster']
+    return {
+        'text': dialog_manager.dialog_data['broadcast_text'],
+        'total': await broadcaster.users.count_users(),
+    }
+
+
+async def get_broadcast_progress(dialog_manager: DialogManager, **kwargs) -> dict:
+    broadcaster: Broadcaster = dialog_manager.middleware_data['broadcaster']
+    progress = await broadcaster.progress()
+    return {
+        'status': status_text(progress.status),
+        'progress': progress,
+        'is_running': progress.status is BroadcastStatus.RUNNING,
+    }
+
+
 def __validate_description(file_id: str | None, description: str | None) -> str | None:
     if not description:
         return description
@@ -1017,6 +1039,11 @@ admin_dialog = Dialog(
             id='change_image',
             state=Administration.IMAGE,
         ),
+        SwitchTo(
+            Const('📣 Рассылка всем пользователям'),
+            id='broadcast',
+            state=Administration.BROADCAST,
+        ),
         _CANCEL,
         state=Administration.START,
     ),
@@ -1056,6 +1083,48 @@ admin_dialog = Dialog(
         MessageInput(menu_image_handler),
         state=Administration.IMAGE,
     ),
+    Window(
+        Const('📣 Рассылка всем пользователям'),
+        Const('Отправьте текст рассылки сообщением'),
+        SwitchTo(
+            Const('Ход последней рассылки'),
+            id='broadcast_status',
+            state=Administration.BROADCAST_STATUS,
+        ),
+        SwitchTo(Const('Назад'), id='back', state=Administration.START),
+        MessageInput(broadcast_text_handler),
+        state=Administration.BROADCAST,
+    ),
+    Window(
+        Format('Сообщение получат {total} пользователей:\n'),
+        Format('{text}'),
+        Row(
+            SwitchTo(Const('Исправить'), id='redo', state=Administration.BROADCAST),
+            Button(Const('Отправить'), id='send_broadcast', on_click=start_broadcast),
+        ),
+        state=Administration.BROADCAST_CONFIRM,
+        getter=get_broadcast_preview,
+        parse_mode=ParseMode.HTML,
+    ),
+    Window(
+        Format('📣 Рассылка: {status}\n'),
+        Format(
+            'Обработано: {progress.processed} из {progress.total}\n'
+            'Доставлено: {progress.delivered}\n'
+            'Заблокировали бота: {progress.blocked}\n'
+            'Ошибки: {progress.failed}'
+        ),
+        Button(Const('Обновить'), id='refresh_broadcast'),
+        Button(
+            Const('Остановить'),
+            id='cancel_broadcast',
+            on_click=cancel_broadcast,
+            when='is_running',
+        ),
+        SwitchTo(Const('Назад'), id='back', state=Administration.START),
+        state=Administration.BROADCAST_STATUS,
+        getter=get_broadcast_progress,
+    ),
     launch_mode=LaunchMode.ROOT,
 )
 change_activity_dialog = Dialog(
@@ -6,7 +6,9 @@ class SignUpCallbackFactory(BaseModel):
     user_id: int
     user_phone: str
     activity_type: str
-    num_row: str
     message: str
+    signup_id: int | str = ''
+    # номер строки листа у заявок, созданных до хранения в SQLite
+    num_row: str = ''
     cost: int | str = ''
     topic: str = ''
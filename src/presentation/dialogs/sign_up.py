@@ -137,8 +137,9 @@ async def stay_form(
     )
     message = await callback.message.answer(RU.random_wait)
     user: UserDTO = await repository.user.get_user(manager.event.from_user.id)
-    num_row = repository.signup_user(lesson_activity=lesson_activity, user=user)
-    await notifier.sign_up_notify(user, lesson_activity, num_row, manager)
+    signup_id = await repository.signup_user(lesson_activity=lesson_activity, user=user)
+    # заявка уже сохранена, администраторам уведомление уйдёт в фоне
+    notifier.schedule_sign_up_notify(user, lesson_activity, signup_id, manager)
     await message.delete()
     await callback.message.answer(RU.application_form, parse_mode=ParseMode.HTML)
     await manager.done()
@@ -46,6 +46,9 @@ class Administration(StatesGroup):
     START = State()
     EDIT_ACTS = State()
     IMAGE = State()
+    BROADCAST = State()
+    BROADCAST_CONFIRM = State()
+    BROADCAST_STATUS = State()
 
 
 class AdminActivity(StatesGroup):
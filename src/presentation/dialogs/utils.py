@@ -1,6 +1,7 @@
 import contextlib
 import logging
 from datetime import date
+from functools import partial
 from html import escape
 from typing import Any
 
@@ -23,6 +24,7 @@ from src.infrastracture.adapters.repositories.repo import UsersRepository
 from src.infrastracture.database.redis.keys import AdminKey
 from src.infrastracture.database.redis.repository import RedisRepository
 from src.presentation.dialogs.states import BaseMenu
+from src.presentation.outbox import TelegramOutbox
 
 logger = logging.getLogger(__name__)
 
@@ -154,6 +156,36 @@ async def message_is_sended(dialog_manager: DialogManager, user_id: int) -> bool
     return admin_mess_ids.get(_SENDED, False)
 
 
+async def _edit_other_admins_markup(
+    dialog_manager: DialogManager,
+    admin_mess_ids: dict,
+    responding_admin_id: int,
+    builder: InlineKeyboardBuilder,
+) -> None:
+    """Параллельно меняет кнопки уведомления у остальных администраторов."""
+    outbox: TelegramOutbox = dialog_manager.middleware_data['outbox']
+    bot = dialog_manager.event.bot
+    reply_markup = builder.as_markup()
+    calls = {
+        admin_id: partial(
+            bot.edit_message_reply_markup,
+            chat_id=admin_id,
+            message_id=admin_mess_ids[str(admin_id)],
+            reply_markup=reply_markup,
+            request_timeout=1,
+        )
+        for admin_id in get_config().admins
+        if admin_id != responding_admin_id and str(admin_id) in admin_mess_ids
+    }
+    result = await outbox.run_all(calls)
+    logger.info(
+        'edited admin messages: sent=%s retrying=%s failed=%s',
+        list(result.sent),
+        result.retrying,
+        list(result.failed),
+    )
+
+
 async def close_app_form_for_other_admins(
     dialog_manager: DialogManager, message_id: int, responding_admin_id: int
 ) -> None:
@@ -163,20 +195,11 @@ async def close_app_form_for_other_admins(
     builder.button(text='Ждём пользователя 👻', callback_data='ignore_this_callback')
     if not admin_mess_ids:
         return None
-    for admin_id in get_config().admins:
-        if responding_admin_id == admin_id:
-            continue
-        try:
-            await dialog_manager.event.bot.edit_message_reply_markup(
-                chat_id=admin_id,
-                message_id=admin_mess_ids[str(admin_id)],
-                reply_markup=builder.as_markup(),
-                request_timeout=1,
-            )
-        except Exception as exc:
-            logger.error('Failed while edit admin message', exc_info=exc)
-    admin_mess_ids[_SENDED] = True
-    await redis_repository.set(AdminKey(key=message_id), admin_mess_ids, ex=MONTH)
+    await _edit_other_admins_markup(
+        dialog_manager, admin_mess_ids, responding_admin_id, builder
+    )
+    # только флаг: ответы других админов, записанные за это время, не затираются
+    await redis_repository.merge(AdminKey(key=message_id), {_SENDED: True}, ex=MONTH)
     logger.info('set sended flag for message_id=%s', message_id)
 
 
@@ -193,18 +216,9 @@ async def approve_form_for_other_admins(
         return None
     builder = InlineKeyboardBuilder()
     builder.button(text=message_text, callback_data='ignore_this_callback')
-    for admin_id in get_config().admins:
-        if responding_admin_id == admin_id:
-            continue
-        try:
-            await dialog_manager.event.bot.edit_message_reply_markup(
-                chat_id=admin_id,
-                message_id=admin_mess_ids[str(admin_id)],
-                reply_markup=builder.as_markup(),
-                request_timeout=1,
-            )
-        except Exception as exc:
-            logger.error('Failed while edit admin message', exc_info=exc)
+    await _edit_other_admins_markup(
+        dialog_manager, admin_mess_ids, responding_admin_id, builder
+    )
 
 
 def safe_text_with_link(message: Message) -> str:
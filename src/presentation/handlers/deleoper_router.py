@@ -7,6 +7,7 @@ from aiogram_dialog import DialogManager
 
 from src.config import get_config
 from src.infrastracture.adapters.repositories.repo import UsersRepository
+from src.infrastracture.adapters.repositories.sheet_queue import SheetWriteQueue
 from src.presentation.dialogs.states import Developer
 from src.presentation.notifier import Notifier
 
@@ -38,3 +39,31 @@ async def send_to_admins_handler(
         await dialog_manager.start(Developer.TO_ADMIN)
     except ValueError:
         await message.answer('Завершите предыдущее действие')
+
+
+@developer_router.message(
+    Command('sheets_queue'), F.from_user.id == get_config().DEVELOPER_ID
+)
+async def sheets_queue_handler(message: Message, sheet_queue: SheetWriteQueue) -> None:
+    metrics = await sheet_queue.metrics()
+    await message.answer(
+        f'В очереди: {metrics.depth}\n'
+        f'Задержка: {metrics.lag:.1f} с\n'
+        f'Записано: {sheet_queue.flushed}\n'
+        f'Ошибок: {sheet_queue.failures}'
+    )
+
+
+@developer_router.message(
+    Command('users_cache'), F.from_user.id == get_config().DEVELOPER_ID
+)
+async def users_cache_handler(message: Message, repository: UsersRepository) -> None:
+    stats = repository.user.local_cache.stats()
+    total = stats.hits + stats.misses
+    hit_rate = stats.hits / total * 100 if total else 0.0
+    await message.answer(
+        f'Пользователей в кэше: {stats.size}\n'
+        f'Попаданий: {stats.hits}\n'
+        f'Промахов: {stats.misses}\n'
+        f'Доля попаданий: {hit_rate:.1f}%'
+    )
@@ -1,21 +1,105 @@
 import asyncio
-from typing import Any
+import logging
+from collections import deque
+from collections.abc import Iterable
+from dataclasses import dataclass
+from functools import partial
 
 from aiogram import Bot
 from aiogram.enums.parse_mode import ParseMode
+from aiogram.types import InlineKeyboardMarkup
 
+from src.presentation.outbox import Priority, TelegramOutbox
 
-async def send_messages_to_user(
-    bot: Bot,
-    messages: list[str],
-    user_id: Any,
-    parse_mode: ParseMode = ParseMode.HTML,
-) -> None:
-    for m in messages:
-        await bot.send_message(
-            chat_id=user_id,
-            text=m,
-            parse_mode=parse_mode,
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True, frozen=True)
+class DripMessage:
+    text: str
+    reply_markup: InlineKeyboardMarkup | None = None
+    parse_mode: ParseMode = ParseMode.HTML
+
+
+@dataclass(slots=True)
+class _Sequence:
+    messages: list[DripMessage]
+    delay: float
+    priority: Priority
+
+
+class DripSender:
+    """Цепочки сообщений с паузой «печатает...» между ними.
+
+    Обработчик только ставит цепочку в очередь и сразу возвращается, сообщения
+    отправляет фоновая задача. У каждого чата своя очередь и своя задача:
+    цепочки одного чата уходят строго по порядку, медленный чат не задерживает
+    остальные. Задача чата завершается, когда его очередь пустеет.
+    """
+
+    def __init__(self, bot: Bot, outbox: TelegramOutbox, delay: float = 2.0) -> None:
+        self.bot = bot
+        self.outbox = outbox
+        self.delay = delay
+        self._queues: dict[int, deque[_Sequence]] = {}
+        self._workers: dict[int, asyncio.Task] = {}
+
+    @property
+    def pending(self) -> int:
+        return sum(len(queue) for queue in self._queues.values())
+
+    def enqueue(
+        self,
+        chat_id: int,
+        messages: Iterable[str | DripMessage],
+        delay: float | None = None,
+        priority: Priority = Priority.USER,
+    ) -> None:
+        sequence = _Sequence(
+            [m if isinstance(m, DripMessage) else DripMessage(m) for m in messages],
+            self.delay if delay is None else delay,
+            priority,
         )
-        await bot.send_chat_action(user_id, 'typing')
-        await asyncio.sleep(2)
+        self._queues.setdefault(chat_id, deque()).append(sequence)
+        if chat_id not in self._workers:
+            self._workers[chat_id] = asyncio.create_task(
+                self._worker(chat_id), name=f'drip-{chat_id}'
+            )
+
+    async def _worker(self, chat_id: int) -> None:
+        queue = self._queues[chat_id]
+        try:
+            while queue:
+                await self._send_sequence(chat_id, queue[0])
+                queue.popleft()
+        finally:
+            del self._workers[chat_id]
+            if not queue:
+                del self._queues[chat_id]
+
+    async def _send_sequence(self, chat_id: int, sequence: _Sequence) -> None:
+        send = partial(self.outbox.run, chat_id, priority=sequence.priority)
+        last = len(sequence.messages) - 1
+        for idx, message in enumerate(sequence.messages):
+            try:
+                await send(
+                    partial(
+                        self.bot.send_message,
+                        chat_id=chat_id,
+                        text=message.text,
+                        parse_mode=message.parse_mode,
+                        reply_markup=message.reply_markup,
+                    )
+                )
+                if idx != last:
+                    await send(partial(self.bot.send_chat_action, chat_id, 'typing'))
+            except Exception as exc:
+                # без предыдущих сообщений остаток цепочки потеряет смысл
+                logger.error('Drop messages to %s', chat_id, exc_info=exc)
+                return
+            if idx != last:
+                await asyncio.sleep(sequence.delay)
+
+    async def drain(self) -> None:
+        """Дожидается отправки всех поставленных цепочек."""
+        await asyncio.gather(*self._workers.values(), return_exceptions=True)
@@ -1,38 +1,172 @@
 import logging
-from collections.abc import Awaitable, Callable
-from typing import Any
+import time
+from collections.abc import Awaitable, Callable, Mapping
+from dataclasses import dataclass
+from typing import Any, Literal, Protocol
+from uuid import uuid4
 
 from aiogram import BaseMiddleware
 from aiogram.enums.parse_mode import ParseMode
-from aiogram.fsm.storage.redis import RedisStorage
-from aiogram.types import Message, TelegramObject
+from aiogram.types import CallbackQuery, Message, TelegramObject
+from redis.asyncio import Redis
+from redis.commands.core import AsyncScript
 
 logger = logging.getLogger(__name__)
 
+_THROTTLED_TEXT = 'ой ой, не так быстро...\n\n<i>повторите действие через пару секунд</i>'
+
+# скользящее окно на ZSET: в окне не больше ARGV[3] событий.
+# Возвращает 0, если событие пропущено, иначе номер отказа в текущем окне.
+_SLIDING_WINDOW_SCRIPT = """
+local now = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local limit = tonumber(ARGV[3])
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now - window)
+if redis.call('ZCARD', KEYS[1]) < limit then
+    redis.call('ZADD', KEYS[1], now, ARGV[4])
+    redis.call('PEXPIRE', KEYS[1], window)
+    redis.call('DEL', KEYS[2])
+    return 0
+end
+local rejected = redis.call('INCR', KEYS[2])
+redis.call('PEXPIRE', KEYS[2], window)
+return rejected
+"""
+
+
+@dataclass(slots=True, frozen=True)
+class ThrottleRule:
+    limit: int  # событий в окне
+    window: float  # длина окна, секунды
+
+
+class Limiter(Protocol):
+    async def hit(self, key: str, rule: ThrottleRule) -> int: ...
+
+
+class SlidingWindowLimiter:
+    """Ограничитель частоты на Redis: одно решение — один вызов Lua-скрипта."""
+
+    def __init__(self, redis: Redis, prefix: str = 'throttle') -> None:
+        self.redis = redis
+        self.prefix = prefix
+        self._script: AsyncScript | None = None
+
+    async def hit(self, key: str, rule: ThrottleRule) -> int:
+        """Регистрирует событие, возвращает 0 или номер отказа подряд."""
+        if self._script is None:
+            self._script = self.redis.register_script(_SLIDING_WINDOW_SCRIPT)
+        now_ms = int(time.time() * 1000)
+        window_ms = int(rule.window * 1000)
+        return int(
+            await self._script(
+                keys=[f'{self.prefix}:{key}', f'{self.prefix}:{key}:rejected'],
+                args=[now_ms, window_ms, rule.limit, f'{now_ms}:{uuid4().hex}'],
+            )
+        )
+
+
+@dataclass(slots=True)
+class _Bucket:
+    tokens: float
+    updated: float
+    window: float
+    rejected: int = 0
+
+
+class MemoryTokenBucketLimiter:
+    """Token bucket в памяти процесса, без обращений к Redis.
+
+    Подходит только для одной реплики бота. Корзина вмещает ``rule.limit``
+    событий и пополняется за ``rule.window`` секунд. Корзины пользователей,
+    которые давно молчат, раз в ``evict_interval`` секунд удаляются.
+    """
+
+    def __init__(self, evict_interval: float = 60.0) -> None:
+        self.evict_interval = evict_interval
+        self._buckets: dict[str, _Bucket] = {}
+        self._next_eviction = time.monotonic() + evict_interval
+
+    async def hit(self, key: str, rule: ThrottleRule) -> int:
+        now = time.monotonic()
+        if now >= self._next_eviction:
+            self._evict(now)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = _Bucket(rule.limit, now, rule.window)
+        else:
+            refill = (now - bucket.updated) * rule.limit / rule.window
+            bucket.tokens = min(rule.limit, bucket.tokens + refill)
+            bucket.updated = now
+        if bucket.tokens >= 1:
+            bucket.tokens -= 1
+            bucket.rejected = 0
+            return 0
+        bucket.rejected += 1
+        return bucket.rejected
+
+    def _evict(self, now: float) -> None:
+        # за окно корзина наполняется целиком, такая ничем не отличается от новой
+        idle = [key for key, b in self._buckets.items() if now - b.updated > b.window]
+        for key in idle:
+            del self._buckets[key]
+        self._next_eviction = now + self.evict_interval
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+
+def create_limiter(
+    backend: Literal['redis', 'memory'], replicas: int, redis: Redis
+) -> Limiter:
+    if backend == 'memory':
+        if replicas == 1:
+            return MemoryTokenBucketLimiter()
+        # у каждой реплики были бы свои счётчики, лимит умножился бы на их число
+        logger.warning('Memory throttling needs a single replica, using Redis')
+    return SlidingWindowLimiter(redis)
+
 
 class ThrottlingMiddleware(BaseMiddleware):
-    def __init__(self, storage: RedisStorage) -> None:
-        self.storage = storage
+    """Ограничивает частоту сообщений и нажатий кнопок от одного пользователя.
+
+    Для команд можно задать собственные лимиты в ``commands``, счётчик у каждой
+    команды свой. Предупреждение отправляется только на первый отказ в окне,
+    но на нажатие кнопки отвечается всегда, иначе у клиента крутятся часики.
+    """
+
+    def __init__(
+        self,
+        limiter: Limiter,
+        default: ThrottleRule,
+        commands: Mapping[str, ThrottleRule] | None = None,
+    ) -> None:
+        self.limiter = limiter
+        self.default = default
+        self.commands = commands or {}
+
+    def _scope(self, event: TelegramObject) -> tuple[str, ThrottleRule]:
+        if isinstance(event, CallbackQuery):
+            return 'callback', self.default
+        text = getattr(event, 'text', None) or ''
+        if text.startswith('/'):
+            command = text.split(maxsplit=1)[0][1:].split('@', 1)[0]
+            if rule := self.commands.get(command):
+                return f'cmd:{command}', rule
+        return 'message', self.default
 
     async def __call__(
         self,
         handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
-        event: Message,
+        event: Message | CallbackQuery,
         data: dict[str, Any],
     ) -> Any:
-        user = f'user{event.from_user.id}'
-
-        check_user = await self.storage.redis.get(name=user)
-
-        if check_user:
-            if int(check_user) == 1:
-                await self.storage.redis.set(name=user, value=0, ex=1)
-                return await event.answer(
-                    'ой ой, не так быстро...\n\n'
-                    '<i>повторите действие через пару секунд</i>',
-                    parse_mode=ParseMode.HTML,
-                )
-            return
-        await self.storage.redis.set(name=user, value=1, ex=1)
-
-        return await handler(event, data)
+        scope, rule = self._scope(event)
+        rejected = await self.limiter.hit(f'{scope}:{event.from_user.id}', rule)
+        if not rejected:
+            return await handler(event, data)
+        if isinstance(event, CallbackQuery):
+            return await event.answer('Не так быстро 🙂' if rejected == 1 else None)
+        if rejected > 1:
+            return None
+        return await event.answer(_THROTTLED_TEXT, parse_mode=ParseMode.HTML)
@@ -1,6 +1,12 @@
+import asyncio
 import logging
+import time
+from collections.abc import Awaitable, Callable
+from functools import partial
+from typing import TypeVar
 from uuid import uuid4
 
+from aiogram import Bot
 from aiogram.enums.parse_mode import ParseMode
 from aiogram.utils.keyboard import InlineKeyboardBuilder
 from aiogram_dialog import DialogManager
@@ -13,6 +19,7 @@ from src.infrastracture.database.redis.keys import AdminKey
 from src.infrastracture.database.redis.repository import RedisRepository
 from src.presentation.callbacks import SignUpCallback
 from src.presentation.dialogs.models import SignUpCallbackFactory
+from src.presentation.outbox import Priority, TelegramOutbox
 
 logger = logging.getLogger(__name__)
 
@@ -21,26 +28,112 @@ _HOUR = _MINUTE * 60
 _DAY = _HOUR * 24
 _MONTH = _DAY * 30
 
+T = TypeVar('T')
+
 
 class Notifier:
+    """Уведомления администраторам.
+
+    Сообщения всем администраторам отправляются параллельно через общую
+    очередь ``TelegramOutbox``. Ошибка отправки одному администратору не
+    мешает остальным.
+    """
+
+    def __init__(self, outbox: TelegramOutbox | None = None) -> None:
+        self._outbox = outbox or TelegramOutbox()
+        # время последней отправки каждому администратору, секунды
+        self.latencies: dict[int, float] = {}
+        self._tasks: set[asyncio.Task] = set()
+
+    async def _send_to_admin(
+        self, admin_id: int, send: Callable[[int], Awaitable[T]]
+    ) -> T | None:
+        started = time.perf_counter()
+        try:
+            return await self._outbox.run(
+                admin_id, partial(send, admin_id), Priority.ADMIN
+            )
+        except Exception as exc:
+            logger.error('Failed while notify admin %s', admin_id, exc_info=exc)
+            return None
+        finally:
+            self.latencies[admin_id] = time.perf_counter() - started
+            logger.debug('Notify admin %s took %.3fs', admin_id, self.latencies[admin_id])
+
+    async def _fan_out(self, send: Callable[[int], Awaitable[T]]) -> dict[int, T]:
+        admins = get_config().admins
+        results = await asyncio.gather(
+            *(self._send_to_admin(admin_id, send) for admin_id in admins)
+        )
+        return {
+            admin_id: result
+            for admin_id, result in zip(admins, results, strict=True)
+            if result is not None
+        }
+
     async def admin_notify(self, manager: DialogManager, message_str: str) -> None:
-        for admin_id in get_config().admins:
-            try:
-                await manager.event.bot.send_message(
-                    admin_id,
-                    message_str,
-                    parse_mode=ParseMode.HTML,
-                    disable_notification=False,
-                )
-            except Exception as exc:
-                logger.error('Failed while notify admins', exc_info=exc)
+        await self._fan_out(
+            lambda admin_id: manager.event.bot.send_message(
+                admin_id,
+                message_str,
+                parse_mode=ParseMode.HTML,
+                disable_notification=False,
+            )
+        )
+
+    def schedule_sign_up_notify(
+        self,
+        user: UserDTO,
+        lesson_activity: LessonActivity,
+        signup_id: int,
+        manager: DialogManager,
+    ) -> asyncio.Task:
+        """Уведомляет администраторов о заявке в фоне, не задерживая пользователя."""
+        task = asyncio.create_task(
+            self._sign_up_notify(
+                manager.event.bot,
+                manager.middleware_data['redis_repository'],
+                user,
+                lesson_activity,
+                signup_id,
+            )
+        )
+        self._tasks.add(task)
+        task.add_done_callback(self._on_task_done)
+        return task
+
+    def _on_task_done(self, task: asyncio.Task) -> None:
+        self._tasks.discard(task)
+        if not task.cancelled() and (exc := task.exception()):
+            logger.error('Failed while notify admins about sign up', exc_info=exc)
+
+    async def drain(self) -> None:
+        """Дожидается фоновых уведомлений, вызывается при остановке бота."""
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
 
     async def sign_up_notify(
         self,
         user: UserDTO,
         lesson_activity: LessonActivity,
-        num_row: int,
+        signup_id: int,
         manager: DialogManager,
+    ) -> None:
+        await self._sign_up_notify(
+            manager.event.bot,
+            manager.middleware_data['redis_repository'],
+            user,
+            lesson_activity,
+            signup_id,
+        )
+
+    async def _sign_up_notify(
+        self,
+        bot: Bot,
+        redis_repository: RedisRepository,
+        user: UserDTO,
+        lesson_activity: LessonActivity,
+        signup_id: int,
     ) -> None:
         time = (
             f'Время: {lesson_activity.time.strftime("%H:%M")}\n'
@@ -78,33 +171,37 @@ class Notifier:
             callback_data=SignUpCallback(message_id=message_id, action='sign_up'),
         )
 
-        redis_repository: RedisRepository = manager.middleware_data['redis_repository']
-        send_mes_ids = {'sended': False}
-        for admin_id in get_config().admins:
-            try:
-                mess = await manager.event.bot.send_message(
-                    admin_id,
-                    message_to_admin,
-                    parse_mode=ParseMode.HTML,
-                    reply_markup=builder.as_markup(),
-                )
-                send_mes_ids[admin_id] = mess.message_id
-            except Exception as exc:
-                logger.error('Failed while notify admins', exc_info=exc)
-        # при ответе одним из администраторов у других уведомление (сообщение)
-        # о заявке редактируется (удаляется кнопка). актуально месяц
-        await redis_repository.set(AdminKey(key=message_id), send_mes_ids, ex=_MONTH)
-        logger.info('create value=%s for message_id=%s', send_mes_ids, message_id)
-        # admin message id
+        # данные заявки сохраняются до отправки: администратор может нажать
+        # кнопку раньше, чем уйдут сообщения остальным
         signup_data = SignUpCallbackFactory(
             message_id=message_id,
             user_id=user.id,
             user_phone=user.phone,
             activity_type=lesson_activity.activity_type.name,
             topic=lesson_activity.topic,
-            num_row=num_row,
+            signup_id=signup_id,
             message=message_to_admin,
         )
         await redis_repository.hset(
             message_id, mapping=signup_data.model_dump(), ex=_MONTH
         )
+        # при ответе одним из администраторов у других уведомление (сообщение)
+        # о заявке редактируется (удаляется кнопка). актуально месяц.
+        # без ключа нажатие считается уже обработанным, поэтому он создаётся
+        # до отправки, а id сообщений дописываются по мере готовности
+        admin_key = AdminKey(key=message_id)
+        await redis_repository.set(admin_key, {'sended': False}, ex=_MONTH)
+        sent = await self._fan_out(
+            lambda admin_id: bot.send_message(
+                admin_id,
+                message_to_admin,
+                parse_mode=ParseMode.HTML,
+                reply_markup=builder.as_markup(),
+            )
+        )
+        send_mes_ids = await redis_repository.merge(
+            admin_key,
+            {str(admin_id): mess.message_id for admin_id, mess in sent.items()},
+            ex=_MONTH,
+        )
+        logger.info('create value=%s for message_id=%s', send_mes_ids, message_id)
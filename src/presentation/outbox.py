@@ -0,0 +1,355 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable, Mapping
+from contextlib import suppress
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Any
+
+from aiogram import Bot
+from aiogram.exceptions import (
+    TelegramNetworkError,
+    TelegramRetryAfter,
+    TelegramServerError,
+)
+
+from src.application.utils import mjson
+from src.infrastracture.database.redis.repository import RedisRepository
+
+logger = logging.getLogger(__name__)
+
+# фабрика запроса: корутину нельзя ожидать дважды, для повтора нужна новая
+Call = Callable[[], Awaitable[Any]]
+
+_RETRYABLE = (
+    TelegramRetryAfter,
+    TelegramNetworkError,
+    TelegramServerError,
+    asyncio.TimeoutError,
+)
+
+
+class Priority(IntEnum):
+    USER = 0  # ответы пользователю
+    ADMIN = 1  # уведомления и правки у администраторов
+    BULK = 2  # напоминания и рассылки
+
+
+@dataclass(slots=True)
+class OutboxResult:
+    sent: dict[int, Any] = field(default_factory=dict)
+    # запросы, которые повторяются в фоне
+    retrying: list[int] = field(default_factory=list)
+    failed: dict[int, Exception] = field(default_factory=dict)
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: float) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def delay(self, now: float) -> float:
+        """Через сколько секунд будет доступен токен."""
+        self._refill(now)
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    def take(self, now: float) -> None:
+        self._refill(now)
+        self.tokens -= 1
+
+    def is_full(self, now: float) -> bool:
+        self._refill(now)
+        return self.tokens >= self.capacity
+
+
+@dataclass(slots=True)
+class _Request:
+    chat_id: int
+    call: Call
+    priority: Priority
+    future: asyncio.Future | None = None
+    # сообщение, которое можно сохранить в Redis при переполнении
+    payload: dict[str, Any] | None = None
+    attempts: int = 0
+
+
+class TelegramOutbox:
+    """Единая очередь исходящих запросов к Telegram.
+
+    Запросы выполняются в порядке приоритета с соблюдением лимитов Telegram:
+    общего (``global_rate`` в секунду) и на один чат (``chat_rate``).
+    На RetryAfter вся очередь замирает на указанное время, запрос повторяется.
+    Сообщения, поставленные через :meth:`send_message` с приоритетом BULK,
+    сверх ``max_pending`` и неотправленные при остановке складываются в Redis
+    и отправляются позже. Запросы :meth:`run` ждут результата вызывающего кода,
+    поэтому не сохраняются: их повтор — забота вызывающего.
+    """
+
+    OVERFLOW_KEY: str = 'outbox:overflow'
+
+    def __init__(
+        self,
+        bot: Bot | None = None,
+        redis: RedisRepository | None = None,
+        global_rate: float = 30.0,
+        chat_rate: float = 1.0,
+        chat_burst: float = 3.0,
+        concurrency: int = 10,
+        max_pending: int = 1000,
+        max_chats: int = 10_000,
+        max_retries: int = 3,
+        retry_delay: float = 1.0,
+    ) -> None:
+        self.bot = bot
+        self.redis = redis
+        self.chat_rate = chat_rate
+        self.chat_burst = chat_burst
+        self.max_pending = max_pending
+        # сколько лимитов по чатам держать, прежде чем выбросить полные
+        self.max_chats = max_chats
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self._global = TokenBucket(global_rate, global_rate)
+        self._chats: dict[int, TokenBucket] = {}
+        self._queues: dict[Priority, deque[_Request]] = {p: deque() for p in Priority}
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._wakeup = asyncio.Event()
+        self._paused_until = 0.0
+        self._dispatcher: asyncio.Task | None = None
+        self._inflight: set[asyncio.Task] = set()
+        self._retries: set[asyncio.Task] = set()
+
+    @property
+    def pending(self) -> int:
+        return sum(len(queue) for queue in self._queues.values())
+
+    def start(self) -> None:
+        if self._dispatcher is None:
+            self._dispatcher = asyncio.create_task(self._dispatch(), name='tg-outbox')
+
+    def _put(self, request: _Request) -> None:
+        self.start()
+        self._queues[request.priority].append(request)
+        self._wakeup.set()
+
+    async def run(
+        self, chat_id: int, call: Call, priority: Priority = Priority.USER
+    ) -> Any:
+        """Выполняет запрос в свою очередь и возвращает его результат."""
+        future = asyncio.get_running_loop().create_future()
+        self._put(_Request(chat_id, call, priority, future))
+        return await future
+
+    async def send_message(
+        self, chat_id: int, text: str, priority: Priority = Priority.BULK, **kwargs: Any
+    ) -> None:
+        """Ставит сообщение в очередь, не дожидаясь отправки."""
+        payload = {'chat_id': chat_id, 'text': text, **kwargs}
+        overflow = priority is Priority.BULK and self.pending >= self.max_pending
+        if overflow and await self._push_overflow([payload]):
+            return
+        self._put(self._from_payload(payload, priority))
+
+    def _from_payload(
+        self, payload: dict[str, Any], priority: Priority = Priority.BULK
+    ) -> _Request:
+        async def call() -> Any:
+            return await self.bot.send_message(**payload)
+
+        return _Request(payload['chat_id'], call, priority, payload=payload)
+
+    async def run_all(
+        self, calls: Mapping[int, Call], priority: Priority = Priority.ADMIN
+    ) -> OutboxResult:
+        """Выполняет запросы по чатам, ошибки одного чата не мешают остальным."""
+        chat_ids = list(calls)
+        results = await asyncio.gather(
+            *(self.run(chat_id, calls[chat_id], priority) for chat_id in chat_ids),
+            return_exceptions=True,
+        )
+        outcome = OutboxResult()
+        for chat_id, result in zip(chat_ids, results, strict=True):
+            if not isinstance(result, Exception):
+                outcome.sent[chat_id] = result
+            elif isinstance(result, _RETRYABLE):
+                outcome.retrying.append(chat_id)
+                self._spawn(self._retry(chat_id, calls[chat_id], priority), self._retries)
+            else:
+                outcome.failed[chat_id] = result
+                logger.error('Telegram request to %s failed', chat_id, exc_info=result)
+        return outcome
+
+    async def _retry(self, chat_id: int, call: Call, priority: Priority) -> None:
+        delay = self.retry_delay
+        for attempt in range(1, self.max_retries + 1):
+            await asyncio.sleep(delay)
+            try:
+                await self.run(chat_id, call, priority)
+                return
+            except _RETRYABLE:
+                delay *= 2
+                logger.warning(
+                    'Telegram request to %s failed, attempt %s', chat_id, attempt
+                )
+            except Exception as exc:
+                logger.error('Telegram request to %s dropped', chat_id, exc_info=exc)
+                return
+        logger.error('Telegram request to %s dropped after retries', chat_id)
+
+    @staticmethod
+    def _spawn(coro: Awaitable[Any], tasks: set[asyncio.Task]) -> None:
+        task = asyncio.ensure_future(coro)
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+
+    def _chat_bucket(self, chat_id: int) -> TokenBucket:
+        bucket = self._chats.get(chat_id)
+        if bucket is None:
+            bucket = self._chats[chat_id] = TokenBucket(self.chat_rate, self.chat_burst)
+        return bucket
+
+    def _pop_ready(self, now: float) -> tuple[_Request | None, float]:
+        """Первый по приоритету запрос, чей чат не упёрся в лимит."""
+        wait = float('inf')
+        for priority in Priority:
+            queue = self._queues[priority]
+            for idx, request in enumerate(queue):
+                delay = self._chat_bucket(request.chat_id).delay(now)
+                if delay == 0:
+                    del queue[idx]
+                    return request, 0.0
+                wait = min(wait, delay)
+        return None, wait
+
+    async def _sleep(self, delay: float) -> None:
+        self._wakeup.clear()
+        # новый запрос может оказаться в свободном чате, ждём и его
+        with suppress(TimeoutError):
+            await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+
+    async def _next(self) -> _Request:
+        """Ждёт запрос, который можно отправить, не нарушая лимитов."""
+        while True:
+            if not self.pending and not await self._pull_overflow():
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+            now = time.monotonic()
+            wait = max(self._paused_until - now, self._global.delay(now))
+            if wait > 0:
+                await asyncio.sleep(wait)
+                continue
+            request, wait = self._pop_ready(now)
+            if request is None:
+                await self._sleep(wait)
+                continue
+            self._global.take(now)
+            self._chat_bucket(request.chat_id).take(now)
+            if len(self._chats) > self.max_chats:
+                self._evict_chats(now)
+            return request
+
+    async def _dispatch(self) -> None:
+        while True:
+            # слот занимаем до выбора запроса, иначе уже выбранный запрос
+            # обгонит более срочный, пришедший пока все слоты заняты
+            await self._semaphore.acquire()
+            try:
+                request = await self._next()
+            except BaseException:
+                self._semaphore.release()
+                raise
+            self._spawn(self._execute(request), self._inflight)
+
+    def _evict_chats(self, now: float) -> None:
+        for chat_id in [c for c, b in self._chats.items() if b.is_full(now)]:
+            del self._chats[chat_id]
+
+    async def _execute(self, request: _Request) -> None:
+        if request.future is not None and request.future.cancelled():
+            # результат больше никто не ждёт, например рассылку остановили
+            self._semaphore.release()
+            return
+        try:
+            result = await request.call()
+        except TelegramRetryAfter as exc:
+            self._paused_until = max(
+                self._paused_until, time.monotonic() + exc.retry_after
+            )
+            logger.warning('Telegram flood control, pause for %ss', exc.retry_after)
+            request.attempts += 1
+            if request.attempts <= self.max_retries:
+                self._queues[request.priority].appendleft(request)
+                self._wakeup.set()
+            else:
+                self._fail(request, exc)
+        except Exception as exc:
+            self._fail(request, exc)
+        else:
+            if request.future is not None and not request.future.done():
+                request.future.set_result(result)
+        finally:
+            self._semaphore.release()
+
+    def _fail(self, request: _Request, exc: Exception) -> None:
+        if request.future is not None:
+            if not request.future.done():
+                request.future.set_exception(exc)
+        else:
+            logger.error('Failed to send message to %s', request.chat_id, exc_info=exc)
+
+    async def _push_overflow(self, payloads: list[dict[str, Any]]) -> bool:
+        if self.redis is None or not payloads:
+            return False
+        try:
+            await self.redis.rpush(self.OVERFLOW_KEY, *map(mjson.encode, payloads))
+        except Exception as exc:
+            logger.error('Failed to persist outbox overflow', exc_info=exc)
+            return False
+        return True
+
+    async def _pull_overflow(self) -> bool:
+        if self.redis is None or self.bot is None:
+            return False
+        batch = max(self.max_pending // 2, 1)
+        try:
+            async with self.redis.client.pipeline(transaction=True) as pipe:
+                pipe.lrange(self.OVERFLOW_KEY, 0, batch - 1)
+                pipe.ltrim(self.OVERFLOW_KEY, batch, -1)
+                raw_payloads, _ = await pipe.execute()
+        except Exception as exc:
+            logger.error('Failed to read outbox overflow', exc_info=exc)
+            return False
+        for raw in raw_payloads:
+            self._queues[Priority.BULK].append(self._from_payload(mjson.decode(raw)))
+        return bool(raw_payloads)
+
+    async def drain(self) -> None:
+        """Останавливает очередь при выключении бота.
+
+        Фоновые повторы и отправляемые запросы дожидаются, сообщения BULK,
+        до которых не дошла очередь, сохраняются в Redis.
+        """
+        await asyncio.gather(*self._retries, return_exceptions=True)
+        if self._dispatcher is not None:
+            self._dispatcher.cancel()
+            await asyncio.gather(self._dispatcher, return_exceptions=True)
+            self._dispatcher = None
+        # отправляемые запросы могут вернуться в очередь по RetryAfter,
+        # поэтому очереди разбираются только после них
+        await asyncio.gather(*self._inflight, return_exceptions=True)
+        bulk = self._queues[Priority.BULK]
+        if await self._push_overflow([r.payload for r in bulk if r.payload]):
+            bulk.clear()
+        for queue in self._queues.values():
+            for request in queue:
+                self._fail(request, RuntimeError('Outbox stopped'))
+            queue.clear()
@@ -0,0 +1,88 @@
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+from contextlib import suppress
+
+from src.presentation.reminders.job_store import ReminderJobStore
+
+logger = logging.getLogger(__name__)
+
+
+class ReminderDispatcher:
+    """Запускает наступившие напоминания из расписания в Redis.
+
+    Раз в ``poll_interval`` секунд забирает из ZSET пачку наступивших задач
+    (не больше, чем свободно мест в очереди) и передаёт их ``workers``
+    обработчикам. Забор атомарный, поэтому реплики не отправят одно
+    напоминание дважды. Обработчик сам переносит задачу или удаляет её из
+    расписания; если он упал, задача вернётся через ``lease`` секунд.
+    """
+
+    def __init__(
+        self,
+        jobs: ReminderJobStore,
+        handler: Callable[[int], Awaitable[None]],
+        poll_interval: float = 1.0,
+        batch_size: int = 100,
+        workers: int = 10,
+        lease: float = 300.0,
+    ) -> None:
+        self.jobs = jobs
+        self.handler = handler
+        self.poll_interval = poll_interval
+        self.batch_size = batch_size
+        self.workers = workers
+        self.lease = lease
+        self._queue: asyncio.Queue[int] = asyncio.Queue(maxsize=batch_size)
+        self._tasks: list[asyncio.Task] = []
+
+    async def poll(self) -> int:
+        """Забирает наступившие задачи в очередь, возвращает их число."""
+        free = self._queue.maxsize - self._queue.qsize()
+        if free <= 0:
+            return 0
+        due = await self.jobs.claim_due(free, self.lease)
+        for user_id in due:
+            self._queue.put_nowait(user_id)
+        return len(due)
+
+    async def _poll_loop(self) -> None:
+        while True:
+            try:
+                claimed = await self.poll()
+            except Exception as exc:
+                logger.warning('Reminder poll failed', exc_info=exc)
+                claimed = 0
+            # полная пачка — возможно, наступивших задач больше, забираем сразу
+            if claimed < self.batch_size:
+                await asyncio.sleep(self.poll_interval)
+
+    async def _worker(self) -> None:
+        while True:
+            user_id = await self._queue.get()
+            try:
+                await self.handler(user_id)
+            except Exception as exc:
+                logger.error('Reminder for %s failed', user_id, exc_info=exc)
+            finally:
+                self._queue.task_done()
+
+    def start(self) -> None:
+        if self._tasks:
+            return
+        self._tasks = [
+            asyncio.create_task(self._worker(), name=f'reminder-worker-{i}')
+            for i in range(self.workers)
+        ]
+        self._tasks.append(
+            asyncio.create_task(self._poll_loop(), name=f'reminders:{self.jobs.key}')
+        )
+
+    async def stop(self) -> None:
+        """Останавливает опрос; забранные задачи вернутся после аренды."""
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            with suppress(asyncio.CancelledError):
+                await task
+        self._tasks = []
@@ -0,0 +1,86 @@
+import time
+import zoneinfo
+from datetime import datetime
+
+from redis.commands.core import AsyncScript
+
+from src.infrastracture.database.redis.repository import RedisRepository
+
+# забирает наступившие задачи и сдвигает их на время аренды: пока задача
+# выполняется, другие реплики её не видят, а упавшая задача вернётся сама
+_CLAIM_SCRIPT = """
+local due = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, ARGV[2])
+for _, member in ipairs(due) do
+    redis.call('ZADD', KEYS[1], ARGV[3], member)
+end
+return due
+"""
+
+
+class ReminderJobStore:
+    """Расписание напоминаний в Redis.
+
+    Один ZSET на вид напоминаний: участник — id пользователя, вес — время
+    запуска (unix timestamp). Всё расписание читается одним запросом, поэтому
+    восстановление после перезапуска не зависит от числа напоминаний.
+    """
+
+    def __init__(
+        self, redis: RedisRepository, key: str, zone_info: zoneinfo.ZoneInfo
+    ) -> None:
+        self.redis = redis
+        self.key = key
+        self.zone_info = zone_info
+        self._claim: AsyncScript | None = None
+
+    async def add(self, user_id: int, run_date: datetime) -> None:
+        await self.redis.client.zadd(self.key, {str(user_id): run_date.timestamp()})
+
+    async def remove(self, user_id: int) -> None:
+        await self.redis.client.zrem(self.key, str(user_id))
+
+    async def count(self) -> int:
+        return await self.redis.client.zcard(self.key)
+
+    async def claim_due(self, limit: int, lease: float) -> list[int]:
+        """Атомарно забирает до ``limit`` наступивших задач на ``lease`` секунд."""
+        if self._claim is None:
+            self._claim = self.redis.client.register_script(_CLAIM_SCRIPT)
+        now = time.time()
+        due = await self._claim(keys=[self.key], args=[now, limit, now + lease])
+        return [int(user_id) for user_id in due]
+
+    async def load(self) -> list[tuple[int, datetime]]:
+        jobs = await self.redis.client.zrange(self.key, 0, -1, withscores=True)
+        return [
+            (int(user_id), datetime.fromtimestamp(run_at, self.zone_info))
+            for user_id, run_at in jobs
+        ]
+
+
+async def scan_hashes(
+    redis: RedisRepository, match: str, chunk_size: int = 500
+) -> list[dict[str, str]]:
+    """Все хеши по шаблону ключа.
+
+    Ключи ищутся через SCAN с подсказкой COUNT, содержимое читается пачками
+    по ``chunk_size`` ключей: одна пачка — один pipeline из HGETALL.
+    """
+    client = redis.client
+    hashes: list[dict[str, str]] = []
+    keys: list[str] = []
+
+    async def fetch() -> None:
+        async with client.pipeline(transaction=False) as pipe:
+            for key in keys:
+                pipe.hgetall(key)
+            hashes.extend(data for data in await pipe.execute() if data)
+        keys.clear()
+
+    async for key in client.scan_iter(match=match, count=chunk_size):
+        keys.append(key)
+        if len(keys) >= chunk_size:
+            await fetch()
+    if keys:
+        await fetch()
+    return hashes
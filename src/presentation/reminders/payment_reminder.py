@@ -1,17 +1,18 @@
-import asyncio
 import logging
+import time
 import zoneinfo
 from datetime import datetime, timedelta
 from typing import Any
 
 from aiogram import Bot
 from aiogram.enums.parse_mode import ParseMode
-from apscheduler.schedulers.asyncio import AsyncIOScheduler
-from apscheduler.triggers.date import DateTrigger
 
 from src.application.domen.text import RU
 from src.config import get_config
 from src.infrastracture.database.redis.repository import RedisRepository
+from src.presentation.outbox import TelegramOutbox
+from src.presentation.reminders.dispatcher import ReminderDispatcher
+from src.presentation.reminders.job_store import ReminderJobStore, scan_hashes
 
 logger = logging.getLogger(__name__)
 
@@ -23,36 +24,52 @@ _DAYS_14 = _DAY * 14
 
 class PaymentReminder:
     REMINDER_KEY_PREFIX: str = 'payment:pending:'
+    SCHEDULE_KEY: str = 'payment:schedule'
     MAX_REMINDER_COUNT: int = 3
     zone_info: zoneinfo.ZoneInfo = get_config().zone_info
 
-    def __init__(self, bot: Bot, redis_repository: RedisRepository) -> None:
+    def __init__(
+        self,
+        bot: Bot,
+        redis_repository: RedisRepository,
+        outbox: TelegramOutbox | None = None,
+    ) -> None:
         self.redis_repository = redis_repository
         self.bot = bot
-        self.scheduler = AsyncIOScheduler()
-
-    async def get_keys_by_pattern(self) -> list[str]:
-        return [
-            key.encode('utf-8')
-            async for key in self.redis_repository.client.scan_iter(
-                match=f'{self.REMINDER_KEY_PREFIX}*'
-            )
-        ]
+        self.outbox = outbox or TelegramOutbox(bot)
+        self.jobs = ReminderJobStore(redis_repository, self.SCHEDULE_KEY, self.zone_info)
+        self.dispatcher = ReminderDispatcher(self.jobs, self._process_reminder)
 
     async def start(self) -> None:
-        self.scheduler.start()
         await self.setup_reminders()
+        self.dispatcher.start()
+
+    async def stop(self) -> None:
+        await self.dispatcher.stop()
 
     async def setup_reminders(self) -> None:
-        keys = await self.get_keys_by_pattern()
-        for key in keys:
-            reminder_data = await self._get_reminder_data(key)
-            if reminder_data:
-                reminder_count = int(reminder_data['reminder_count'])
-                if reminder_count < self.MAX_REMINDER_COUNT:
-                    await self._schedule_reminder(reminder_data['user_id'], reminder_data)
-                else:
-                    await self.delete_payment(reminder_data['user_id'])
+        started = time.perf_counter()
+        # расписание уже в Redis, его разбирает диспетчер
+        if not (restored := await self.jobs.count()):
+            # напоминания могли остаться от версии без расписания в Redis
+            restored = await self._restore_from_keys()
+        logger.info(
+            'restored %s payment reminders in %.3fs',
+            restored,
+            time.perf_counter() - started,
+        )
+
+    async def _restore_from_keys(self) -> int:
+        restored = 0
+        pattern = f'{self.REMINDER_KEY_PREFIX}*'
+        for reminder_data in await scan_hashes(self.redis_repository, pattern):
+            reminder_count = int(reminder_data['reminder_count'])
+            if reminder_count < self.MAX_REMINDER_COUNT:
+                await self._schedule_reminder(reminder_data['user_id'], reminder_data)
+                restored += 1
+            else:
+                await self.delete_payment(reminder_data['user_id'])
+        return restored
 
     async def add_reminder(self, user_id: int) -> None:
         last_reminded = datetime.now(self.zone_info).timestamp()
@@ -89,27 +106,11 @@ class PaymentReminder:
             )
             reminder_data['run_date'] = run_date.timestamp()
         if current_count >= self.MAX_REMINDER_COUNT:
+            # последнее напоминание уже запланировано к отправке, больше не ждём
+            await self.delete_payment(user_id)
             return None
 
-        job_key = self.get_job_key(user_id)
-
-        if self.scheduler.get_job(job_key):
-            logger.info('job for user %s has already exists', user_id)
-        else:
-            self.scheduler.add_job(
-                self._process_reminder,
-                trigger=DateTrigger(run_date=run_date),
-                args=(user_id, current_count),
-                id=job_key,
-            )
-            await asyncio.sleep(0.1)
-            logger.info(
-                'add sheduler job for %s with date %s and count=%s',
-                user_id,
-                run_date,
-                current_count,
-            )
-
+        await self.jobs.add(user_id, run_date)
         reminder_key = self._get_reminder_key(user_id)
         await self._set_reminder_data(reminder_key, reminder_data)
 
@@ -144,24 +145,32 @@ class PaymentReminder:
 
         return adjusted_time
 
-    def get_job_key(self, user_id: int) -> str:
-        return f'reminder_{user_id}'
-
-    async def _process_reminder(
-        self,
-        user_id: int,
-        current_count: int,
-    ) -> None:
+    async def _process_reminder(self, user_id: int) -> None:
         reminder_key = self._get_reminder_key(user_id)
         reminder_data = await self._get_reminder_data(reminder_key)
 
         if not reminder_data:
+            await self.jobs.remove(user_id)
+            return
+        now = datetime.now(self.zone_info)
+        if (run_date := self.adjust_to_work_hours(now)) != now:
+            # просроченное напоминание, например после простоя, ждёт утра
+            await self.jobs.add(user_id, run_date)
             return
 
         # Обновляем данные напоминания
+        current_count = int(reminder_data['reminder_count'])
         reminder_data['reminder_count'] = current_count + 1
 
         if current_count < self.MAX_REMINDER_COUNT:
+            # Планируем следующее до отправки: задача снимается с аренды
+            # диспетчера сразу и не вернётся второй раз, если очередь
+            # сообщений долго разбирает рассылку
+            reminder_data['last_reminded'] = datetime.now(self.zone_info).timestamp()
+            await self._set_reminder_data(reminder_key, reminder_data)
+            reminder_data['run_date'] = None
+            await self._schedule_reminder(user_id, reminder_data)
+
             # Отправляем напоминание
             try:
                 match current_count:
@@ -175,22 +184,15 @@ class PaymentReminder:
                 connect_us = (
                     f'<i>\nВозникли вопросы? Напишите нам {RU.kameya_tg_contact}</i>'
                 )
-                await self.bot.send_message(
-                    user_id, message + connect_us, parse_mode=ParseMode.HTML
+                # сообщение уходит в фоне, при переполнении очереди — через Redis
+                await self.outbox.send_message(
+                    int(user_id), message + connect_us, parse_mode=ParseMode.HTML
                 )
-                reminder_data['last_reminded'] = datetime.now(self.zone_info).timestamp()
             except Exception as exc:
                 logger.error('Failed to send reminder to %s: %s', user_id, exc)
-
-            # Проверяем нужно ли продолжать напоминания
-            await self._set_reminder_data(reminder_key, reminder_data)
-
-            # Планируем следующее
-            reminder_data['run_date'] = None
-            await self._schedule_reminder(user_id, reminder_data)
         else:
             # Удаляем после последнего напоминания
-            await self.delete_payment(reminder_key)
+            await self.delete_payment(user_id)
 
     def _get_reminder_key(self, user_id: int) -> str:
         return f'{self.REMINDER_KEY_PREFIX}{user_id}'
@@ -208,7 +210,4 @@ class PaymentReminder:
         redis_key_reminder = f'{self.REMINDER_KEY_PREFIX}{user_id}'
         await self.redis_repository.delete(redis_key_reminder)
         logger.info('removed from redis %s', redis_key_reminder)
-        job_key = self.get_job_key(user_id)
-        if self.scheduler.get_job(job_key):
-            self.scheduler.remove_job(job_key)
-            logger.info('removed from sheduler %s', job_key)
+        await self.jobs.remove(user_id)
@@ -1,5 +1,5 @@
-import asyncio
 import logging
+import time
 import zoneinfo
 from datetime import datetime, timedelta
 from typing import Any
@@ -14,7 +14,9 @@ from src.config import get_config
 from src.infrastracture.adapters.repositories.activities import ActivityRepository
 from src.infrastracture.database.redis.repository import RedisRepository
 from src.infrastracture.repository.users import UsersService
-from src.presentation.message_sender import send_messages_to_user
+from src.presentation.message_sender import DripSender
+from src.presentation.outbox import Priority
+from src.presentation.reminders.job_store import ReminderJobStore, scan_hashes
 
 logger = logging.getLogger(__name__)
 
@@ -26,6 +28,7 @@ _DAYS_14 = _DAY * 14
 
 class SignUpReminder:
     REMINDER_KEY_PREFIX: str = 'signup:pending:'
+    SCHEDULE_KEY: str = 'signup:schedule'
     MAX_REMINDER_COUNT: int = 2
     zone_info: zoneinfo.ZoneInfo = get_config().zone_info
 
@@ -36,32 +39,44 @@ class SignUpReminder:
         scheduler: AsyncIOScheduler,
         user_service: UsersService,
         act_repository: ActivityRepository,
+        drip: DripSender,
     ) -> None:
         self.redis_repository = redis_repository
         self.bot = bot
+        self.drip = drip
         self._user_service = user_service
         self._act_repository = act_repository
         self.__scheduler = scheduler
-
-    async def get_keys_by_pattern(self) -> list[str]:
-        return [
-            key.encode('utf-8')
-            async for key in self.redis_repository.client.scan_iter(
-                match=f'{self.REMINDER_KEY_PREFIX}*'
-            )
-        ]
+        self.jobs = ReminderJobStore(redis_repository, self.SCHEDULE_KEY, self.zone_info)
 
     async def setup_reminders(self) -> None:
-        keys = await self.get_keys_by_pattern()
-        for key in keys:
-            reminder_data = await self._get_reminder_data(key)
-            if reminder_data:
-                reminder_count = int(reminder_data['reminder_count'])
-                user_id = reminder_data['user_id']
-                if reminder_count < self.MAX_REMINDER_COUNT:
-                    await self._schedule_reminder(user_id, reminder_data)
-                else:
-                    await self.delete_reminder(user_id)
+        started = time.perf_counter()
+        if jobs := await self.jobs.load():
+            now = datetime.now(self.zone_info)
+            for user_id, run_date in jobs:
+                self._add_job(user_id, max(run_date, now))
+            restored = len(jobs)
+        else:
+            # напоминания могли остаться от версии без расписания в Redis
+            restored = await self._restore_from_keys()
+        logger.info(
+            'restored %s signup reminders in %.3fs',
+            restored,
+            time.perf_counter() - started,
+        )
+
+    async def _restore_from_keys(self) -> int:
+        restored = 0
+        pattern = f'{self.REMINDER_KEY_PREFIX}*'
+        for reminder_data in await scan_hashes(self.redis_repository, pattern):
+            reminder_count = int(reminder_data['reminder_count'])
+            user_id = reminder_data['user_id']
+            if reminder_count < self.MAX_REMINDER_COUNT:
+                await self._schedule_reminder(user_id, reminder_data)
+                restored += 1
+            else:
+                await self.delete_reminder(user_id)
+        return restored
 
     async def add_reminder(
         self,
@@ -88,7 +103,11 @@ class SignUpReminder:
             return
         current_count = int(reminder_data['reminder_count'])
 
-        activity = await self._act_repository.get_activity_by_id(act_id)
+        activity = await self._act_repository.get_activity_by_id(int(act_id))
+        if not activity or not activity.date_time:
+            # занятие удалили или сняли с него дату
+            await self.delete_reminder(user_id)
+            return
         run_date = datetime.combine(
             activity.date_time.date(), activity.date_time.time(), self.zone_info
         ) - timedelta(days=1)
@@ -102,42 +121,38 @@ class SignUpReminder:
             current_count += 1
             run_date += timedelta(days=1, hours=-2)
 
-        reminder_data['run_date'] = run_date
+        reminder_data['reminder_count'] = current_count
+        reminder_data['run_date'] = run_date.timestamp()
 
-        job_key = self._generate_job_key(user_id)
+        self._add_job(user_id, run_date)
+        await self.jobs.add(user_id, run_date)
+        reminder_key = self._get_reminder_key(user_id)
+        await self._set_reminder_data(reminder_key, reminder_data)
 
+    def _add_job(self, user_id: int, run_date: datetime) -> None:
+        job_key = self._generate_job_key(user_id)
         if self.__scheduler.get_job(job_key):
             logger.info('job for user to signup %s has already exists', user_id)
-        else:
-            self.__scheduler.add_job(
-                self._process_reminder,
-                trigger=DateTrigger(run_date=run_date),
-                args=(user_id, current_count),
-                id=job_key,
-            )
-            await asyncio.sleep(0.1)
-            logger.info(
-                'add sheduler job for %s with date %s',
-                user_id,
-                run_date,
-            )
-
-        reminder_key = self._get_reminder_key(user_id)
-        await self._set_reminder_data(reminder_key, reminder_data)
+            return
+        self.__scheduler.add_job(
+            self._process_reminder,
+            trigger=DateTrigger(run_date=run_date),
+            args=(user_id,),
+            id=job_key,
+        )
+        logger.info('add sheduler job for %s with date %s', user_id, run_date)
 
     def _generate_job_key(self, user_id: int) -> str:
         return f'signup_reminder_{user_id}'
 
-    async def _process_reminder(
-        self,
-        user_id: int,
-        current_count: int,
-    ) -> None:
+    async def _process_reminder(self, user_id: int) -> None:
         reminder_key = self._get_reminder_key(user_id)
         reminder_data = await self._get_reminder_data(reminder_key)
 
         if not reminder_data:
+            await self.jobs.remove(user_id)
             return
+        current_count = int(reminder_data['reminder_count'])
 
         # Обновляем данные напоминания
         reminder_data['reminder_count'] = current_count + 1
@@ -173,8 +188,10 @@ class SignUpReminder:
                 connect_us = (
                     f'<i>\nВозникли вопросы? Напишите нам {RU.kameya_tg_contact}</i>'
                 )
-                await send_messages_to_user(
-                    self.bot, [hello_user, *remind_messages, connect_us], user_id
+                self.drip.enqueue(
+                    user_id,
+                    [hello_user, *remind_messages, connect_us],
+                    priority=Priority.BULK,
                 )
                 reminder_data['last_reminded'] = datetime.now(self.zone_info).timestamp()
             except Exception as exc:
@@ -188,7 +205,7 @@ class SignUpReminder:
             await self._schedule_reminder(user_id, reminder_data)
         else:
             # Удаляем после последнего напоминания
-            await self.delete_reminder(reminder_key)
+            await self.delete_reminder(user_id)
 
     def _get_reminder_key(self, user_id: int) -> str:
         return f'{self.REMINDER_KEY_PREFIX}{user_id}'
@@ -206,6 +223,7 @@ class SignUpReminder:
         redis_key_reminder = f'{self.REMINDER_KEY_PREFIX}{user_id}'
         await self.redis_repository.delete(redis_key_reminder)
         logger.info('removed from redis %s', redis_key_reminder)
+        await self.jobs.remove(user_id)
         job_key = self._generate_job_key(user_id)
         if self.__scheduler.get_job(job_key):
             self.__scheduler.remove_job(job_key)
@@ -11,6 +11,7 @@ import pytest_asyncio
 from aiogram import Bot
 from aiogram.types import CallbackQuery, Chat, Message, User
 from aiogram_dialog import DialogManager
+from fakeredis import FakeAsyncRedis, FakeServer
 
 from src.application.domen.models import LessonActivity
 from src.application.domen.models.activity_type import ActivityEnum
@@ -21,8 +22,10 @@ from src.infrastracture.adapters.interfaces.repositories import (
     UsersAbstractRepository,
 )
 from src.infrastracture.adapters.repositories.repo import UsersRepository
+from src.infrastracture.database.redis.repository import RedisRepository
 from src.infrastracture.database.sqlite.models import Activity
 from src.presentation.notifier import Notifier
+from src.presentation.outbox import TelegramOutbox
 
 # ============================================================================
 # ASYNCIO SETUP
@@ -99,6 +102,19 @@ async def mock_redis() -> AsyncGenerator[MagicMock, None]:
     yield redis_mock
 
 
+@pytest_asyncio.fixture
+async def fake_redis() -> AsyncGenerator[FakeAsyncRedis, None]:
+    """Redis в памяти (fakeredis): настоящие команды, пайплайны и Lua-скрипты."""
+    client = FakeAsyncRedis(server=FakeServer(), decode_responses=True)
+    yield client
+    await client.aclose()
+
+
+@pytest.fixture
+def redis_repository(fake_redis: FakeAsyncRedis) -> RedisRepository:
+    return RedisRepository(fake_redis)
+
+
 # ============================================================================
 # MOCK USER REPOSITORY
 # ============================================================================
@@ -137,6 +153,14 @@ class MockUserRepository(UsersAbstractRepository):
         """Удаление пользователя."""
         return self._users.pop(id, None)
 
+    async def get_user_ids(self, after: int = 0, limit: int = 500) -> list[int]:
+        """Порция id пользователей больше ``after``."""
+        return sorted(id for id in self._users if id > after)[:limit]
+
+    async def count_users(self) -> int:
+        """Количество пользователей."""
+        return len(self._users)
+
     def clear(self) -> None:
         """Очистка хранилища."""
         self._users.clear()
@@ -202,6 +226,58 @@ class MockActivityRepository(ActivityAbstractRepository):
             if a.activity_type == activity_type
         ]
 
+    async def patch_activity(
+        self, activity_type: str, theme: str, values: dict[str, Any]
+    ) -> Activity | None:
+        """Обновление нескольких полей активности."""
+        activity = self._activities.pop(f'{activity_type}:{theme}', None)
+        if activity is None:
+            return None
+        for field, value in values.items():
+            setattr(activity, field, value)
+        self._activities[f'{activity_type}:{activity.theme}'] = activity
+        return activity
+
+    def _key_by_id(self, activity_id: int) -> str | None:
+        return next(
+            (key for key, a in self._activities.items() if a.id == activity_id), None
+        )
+
+    async def get_activity_by_id(self, activity_id: int) -> Activity | None:
+        """Получение активности по id."""
+        key = self._key_by_id(activity_id)
+        return self._activities[key] if key else None
+
+    async def patch_activity_by_id(
+        self, activity_type: str, activity_id: int, values: dict[str, Any]
+    ) -> Activity | None:
+        """Обновление нескольких полей активности по id."""
+        key = self._key_by_id(activity_id)
+        if key is None:
+            return None
+        return await self.patch_activity(activity_type, key.split(':', 1)[1], values)
+
+    async def update_activity_date_by_id(
+        self, activity_type: str, activity_id: int, new_date: datetime | None
+    ) -> Activity | None:
+        """Обновление даты активности по id."""
+        return await self.patch_activity_by_id(
+            activity_type, activity_id, {'date_time': new_date}
+        )
+
+    async def update_activity_time_by_id(
+        self, activity_type: str, activity_id: int, new_time: datetime | None
+    ) -> Activity | None:
+        """Обновление времени активности по id."""
+        return await self.patch_activity_by_id(
+            activity_type, activity_id, {'date_time': new_time}
+        )
+
+    async def remove_activity_by_id(self, activity_type: str, activity_id: int) -> bool:
+        """Удаление активности по id."""
+        key = self._key_by_id(activity_id)
+        return key is not None and self._activities.pop(key) is not None
+
     async def update_activity_name_by_name(
         self, activity_type: str, old_theme: str, new_theme: str
     ) -> Activity | None:
@@ -306,16 +382,16 @@ async def mock_repository(
     from unittest.mock import MagicMock
 
     mock_lessons_repo = MagicMock()
-    mock_lessons_repo._sign_up_user = MagicMock(return_value='1')
 
     mock_child_lessons_repo = MagicMock()
-    mock_child_lessons_repo._sign_up_user = MagicMock(return_value='1')
 
     mock_mclasses_repo = MagicMock()
-    mock_mclasses_repo._sign_up_user = MagicMock(return_value='1')
 
     mock_evening_sketch_repo = MagicMock()
-    mock_evening_sketch_repo._sign_up_user = MagicMock(return_value='1')
+
+    mock_signups_repo = MagicMock()
+    mock_signups_repo.add_signup = AsyncMock(return_value=1)
+    mock_signups_repo.update_signup = AsyncMock(return_value=True)
 
     repo = UsersRepository(
         user_repo=mock_user_repo,
@@ -323,6 +399,7 @@ async def mock_repository(
         child_lessons_repo=mock_child_lessons_repo,
         mclasses_repo=mock_mclasses_repo,
         evening_sketch_repo=mock_evening_sketch_repo,
+        signups_repo=mock_signups_repo,
     )
 
     yield repo
@@ -339,6 +416,7 @@ async def mock_notifier() -> AsyncGenerator[AsyncMock, None]:
     notifier_mock = AsyncMock(spec=Notifier)
     notifier_mock.admin_notify = AsyncMock()
     notifier_mock.sign_up_notify = AsyncMock()
+    notifier_mock.schedule_sign_up_notify = MagicMock()
     yield notifier_mock
 
 
@@ -381,6 +459,8 @@ async def mock_dialog_manager(
         'repository': mock_repository,
         'redis_repository': mock_redis,
         'notifier': mock_notifier,
+        'outbox': TelegramOutbox(),
+        'drip': MagicMock(),
     }
 
     # Настройка event
@@ -492,6 +572,10 @@ async def mock_google_sheets() -> AsyncGenerator[MagicMock, None]:
     worksheet_mock.insert_row = MagicMock(
         return_value={'updates': {'updatedRange': 'A1'}}
     )
+    worksheet_mock.append_row = MagicMock(
+        return_value={'updates': {'updatedRange': "'header'!A2:B2"}}
+    )
+    worksheet_mock.col_values = MagicMock(return_value=['header1'])
     worksheet_mock.batch_update = MagicMock()
     worksheet_mock.get_all_values = MagicMock(return_value=[['header1', 'header2']])
 
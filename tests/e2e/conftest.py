@@ -11,6 +11,7 @@ from aiogram_dialog import DialogManager
 from src.application.domen.models.activity_type import ActivityEnum
 from src.application.models import UserDTO
 from src.infrastracture.adapters.repositories.repo import UsersRepository
+from src.presentation.outbox import TelegramOutbox
 
 # ============================================================================
 # E2E СПЕЦИФИЧНЫЕ ФИКСТУРЫ
@@ -47,6 +48,8 @@ async def e2e_dialog_manager(
         'repository': mock_repository,
         'redis_repository': mock_redis,
         'notifier': mock_notifier,
+        'outbox': TelegramOutbox(),
+        'drip': MagicMock(),
     }
 
     # Настраиваем event
@@ -154,6 +154,10 @@ class SheetFixtures:
         worksheet.find = MagicMock(return_value=MagicMock(col=1))
         worksheet.update_cell = MagicMock()
         worksheet.insert_row = MagicMock(return_value={'updates': {'updatedRange': 'A1'}})
+        worksheet.append_row = MagicMock(
+            return_value={'updates': {'updatedRange': "'уроки'!A2:G2"}}
+        )
+        worksheet.col_values = MagicMock(return_value=[SHEET_HEADERS[0]])
         worksheet.batch_update = MagicMock()
         worksheet.get_all_values = MagicMock(return_value=[SHEET_HEADERS])
         return worksheet
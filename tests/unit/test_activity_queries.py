@@ -0,0 +1,260 @@
+"""Тесты запросов к занятиям в SQLite."""
+
+from datetime import date, datetime, time
+from types import MappingProxyType
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import event, text
+
+from src.infrastracture.adapters.repositories import activities
+from src.infrastracture.adapters.repositories.activities import ActivityRepository
+from src.infrastracture.database.redis.keys import ActivityKey
+from src.infrastracture.database.sqlite import base, dao
+from src.infrastracture.database.sqlite.base import (
+    activity_type_id,
+    de_emojify,
+    load_activity_type_ids,
+)
+from src.infrastracture.database.sqlite.models import ActivityType, ActivityTypeEnum
+
+
+@pytest_asyncio.fixture
+async def session_maker(mock_database, monkeypatch):
+    monkeypatch.setattr(base, '_activity_type_ids', base._activity_type_ids)
+    async with mock_database.async_session_maker() as session:
+        session.add_all(ActivityType(name=de_emojify(name)) for name in ActivityTypeEnum)
+        await session.commit()
+        await load_activity_type_ids(session)
+    return mock_database.async_session_maker
+
+
+def _statements(engine) -> list[str]:
+    statements: list[str] = []
+
+    @event.listens_for(engine.sync_engine, 'before_cursor_execute')
+    def _log(conn, cursor, statement, parameters, context, executemany) -> None:
+        statements.append(statement)
+
+    return statements
+
+
+class TestActivityQueries:
+    @pytest.mark.asyncio
+    async def test_type_ids_loaded_once(self, session_maker) -> None:
+        type_ids = base._activity_type_ids
+        safe_str = de_emojify(ActivityTypeEnum.LESSON)
+        type_id = type_ids[safe_str.strip()]
+
+        assert activity_type_id(ActivityTypeEnum.LESSON) == type_id
+        # пробелы по краям, например после de_emojify, не мешают поиску
+        assert activity_type_id(safe_str) == type_id
+        assert activity_type_id(f' {ActivityTypeEnum.LESSON} ') == type_id
+        assert activity_type_id('Нет такого') is None
+        with pytest.raises(TypeError):
+            type_ids[safe_str] = 0  # type: ignore[index]
+
+    def test_type_ids_required(self, monkeypatch) -> None:
+        monkeypatch.setattr(base, '_activity_type_ids', MappingProxyType({}))
+
+        with pytest.raises(RuntimeError):
+            activity_type_id(ActivityTypeEnum.LESSON)
+
+    @pytest.mark.asyncio
+    async def test_lookup_by_cached_type_id(self, session_maker, mock_database) -> None:
+        async with session_maker() as session:
+            for theme in ('Акварель', 'Пастель'):
+                await dao.add_activity(
+                    session, ActivityTypeEnum.LESSON, theme, 'f', 'photo'
+                )
+            await dao.add_activity(
+                session, ActivityTypeEnum.MASTERCLASS, 'Пастель', 'f', 'p'
+            )
+        statements = _statements(mock_database.engine)
+
+        async with session_maker() as session:
+            lessons = await dao.get_all_activity_by_type(session, ActivityTypeEnum.LESSON)
+            activity = await dao.get_activity_by_theme_and_type(
+                session, ActivityTypeEnum.MASTERCLASS, 'Пастель'
+            )
+            missing = await dao.get_all_activity_by_type(session, 'Нет такого')
+
+        assert {a.theme for a in lessons} == {'Акварель', 'Пастель'}
+        assert activity.type_id == activity_type_id(ActivityTypeEnum.MASTERCLASS)
+        assert missing == []
+        # id типов загружены при старте: запросы идут только к activities
+        assert len(statements) == 2
+        assert not any('activity_types' in s for s in statements)
+
+    @pytest.mark.asyncio
+    async def test_queries_use_type_indexes(self, session_maker) -> None:
+        async with session_maker() as session:
+            plans = [
+                ' '.join(
+                    row[3]
+                    for row in await session.execute(text(f'EXPLAIN QUERY PLAN {query}'))
+                )
+                for query in (
+                    'SELECT * FROM activities WHERE type_id = 1 ORDER BY created_at DESC',
+                    "SELECT * FROM activities WHERE type_id = 1 AND theme = 'т'",
+                )
+            ]
+
+        assert 'ix_activities_type_id_created_at' in plans[0]
+        assert 'TEMP B-TREE' not in plans[0]
+        assert 'ix_activities_type_id_theme' in plans[1]
+
+
+class TestActivityPatch:
+    @pytest_asyncio.fixture
+    async def activity(self, session_maker):
+        async with session_maker() as session:
+            return await dao.add_activity(
+                session,
+                ActivityTypeEnum.LESSON,
+                'Акварель',
+                'file',
+                'photo',
+                date_time=datetime(2026, 5, 1, 18, 30),
+            )
+
+    @pytest.mark.asyncio
+    async def test_several_fields_in_one_statement(
+        self, session_maker, mock_database, activity
+    ) -> None:
+        statements = _statements(mock_database.engine)
+
+        async with session_maker() as session:
+            patched = await dao.patch_activity(
+                session,
+                ActivityTypeEnum.LESSON,
+                'Акварель',
+                {'theme': 'Гуашь', 'description': 'новое', 'file_id': None},
+            )
+
+        assert len(statements) == 1
+        assert statements[0].startswith('UPDATE activities')
+        assert 'RETURNING' in statements[0]
+        assert (patched.id, patched.theme, patched.description, patched.file_id) == (
+            activity.id,
+            'Гуашь',
+            'новое',
+            None,
+        )
+
+    @pytest.mark.asyncio
+    async def test_missing_activity(self, session_maker, activity) -> None:
+        async with session_maker() as session:
+            patched = await dao.update_activity_description_by_name(
+                session, ActivityTypeEnum.LESSON, 'Нет такого', 'описание'
+            )
+
+        assert patched is None
+
+    @pytest.mark.asyncio
+    async def test_date_and_time_changed_separately(
+        self, session_maker, activity
+    ) -> None:
+        lesson = ActivityTypeEnum.LESSON
+        async with session_maker() as session:
+            moved = await dao.update_activity_date_by_name(
+                session, lesson, 'Акварель', date(2026, 6, 2)
+            )
+            assert moved.date_time == datetime(2026, 6, 2, 18, 30)
+
+            moved = await dao.update_activity_time_by_name(
+                session, lesson, 'Акварель', time(11, 0)
+            )
+            assert moved.date_time == datetime(2026, 6, 2, 11, 0)
+
+            moved = await dao.update_activity_time_by_name(session, lesson, 'Акварель')
+            assert moved.date_time == datetime(2026, 6, 2)
+
+            cleared = await dao.update_activity_date_by_name(
+                session, lesson, 'Акварель', None
+            )
+            assert cleared.date_time is None
+
+            # без даты время не задаётся
+            assert not await dao.update_activity_time_by_name(
+                session, lesson, 'Акварель', time(12, 0)
+            )
+
+            moved = await dao.update_activity_date_by_name(
+                session, lesson, 'Акварель', date(2026, 7, 3)
+            )
+            assert moved.date_time == datetime(2026, 7, 3)
+
+
+class TestActivityById:
+    @pytest_asyncio.fixture
+    async def activity(self, session_maker):
+        async with session_maker() as session:
+            await dao.add_activity(session, ActivityTypeEnum.LESSON, 'Тема', 'f', 'photo')
+            # темы не уникальны: правка по id не должна задеть соседа
+            return await dao.add_activity(
+                session, ActivityTypeEnum.LESSON, 'Тема', 'f', 'photo'
+            )
+
+    @pytest.mark.asyncio
+    async def test_get_by_primary_key(
+        self, session_maker, mock_database, activity
+    ) -> None:
+        statements = _statements(mock_database.engine)
+
+        async with session_maker() as session:
+            found = await dao.get_activity_by_id(session, activity.id)
+            missing = await dao.get_activity_by_id(session, activity.id + 100)
+
+        assert found.id == activity.id
+        assert missing is None
+        assert all('WHERE activities.id = ?' in s for s in statements)
+
+    @pytest.mark.asyncio
+    async def test_patch_and_remove_by_id(self, session_maker, activity) -> None:
+        async with session_maker() as session:
+            renamed = await dao.patch_activity_by_id(
+                session, activity.id, {'theme': 'Новая тема'}
+            )
+            dated = await dao.update_activity_date_by_id(
+                session, activity.id, date(2026, 5, 1)
+            )
+            timed = await dao.update_activity_time_by_id(
+                session, activity.id, time(18, 30)
+            )
+            removed = await dao.remove_activity_by_id(session, activity.id)
+            removed_again = await dao.remove_activity_by_id(session, activity.id)
+            left = await dao.get_all_activity_by_type(session, ActivityTypeEnum.LESSON)
+
+        assert renamed.theme == 'Новая тема'
+        assert dated.date_time == datetime(2026, 5, 1)
+        assert timed.date_time == datetime(2026, 5, 1, 18, 30)
+        assert (removed, removed_again) == (True, False)
+        assert [(a.theme, a.date_time) for a in left] == [('Тема', None)]
+
+    @pytest.mark.asyncio
+    async def test_patch_by_theme_changes_one_activity(
+        self, session_maker, activity
+    ) -> None:
+        async with session_maker() as session:
+            patched = await dao.update_activity_description_by_name(
+                session, ActivityTypeEnum.LESSON, 'Тема', 'описание'
+            )
+            left = await dao.get_all_activity_by_type(session, ActivityTypeEnum.LESSON)
+
+        assert patched.id != activity.id
+        assert sorted(a.description or '' for a in left) == ['', 'описание']
+
+
+class TestActivityKey:
+    @pytest.mark.parametrize('activity_type', list(ActivityTypeEnum))
+    def test_key_precomputed(self, activity_type, monkeypatch) -> None:
+        expected = ActivityKey(key=activities.de_emojify(activity_type)).pack()
+
+        def fail(text):
+            raise AssertionError('de_emojify called for a known type')
+
+        monkeypatch.setattr(activities, 'de_emojify', fail)
+
+        for name in (activity_type.value, de_emojify(activity_type)):
+            assert ActivityRepository.get_activity_key(name).pack() == expected
@@ -0,0 +1,168 @@
+"""Тесты рассылки всем пользователям."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+import pytest_asyncio
+from aiogram.exceptions import TelegramForbiddenError
+
+from src.application.models import UserDTO
+from src.infrastracture.database.redis.repository import RedisRepository
+from src.presentation.broadcast import Broadcaster, BroadcastStatus
+from src.presentation.outbox import TelegramOutbox
+
+_ADMIN = 1000
+
+
+@pytest.fixture
+def redis(redis_repository) -> RedisRepository:
+    return redis_repository
+
+
+@pytest.fixture
+def bot() -> MagicMock:
+    bot = MagicMock()
+    bot.send_message = AsyncMock()
+    return bot
+
+
+@pytest_asyncio.fixture
+async def users(mock_user_repo):
+    for user_id in range(1, 6):
+        await mock_user_repo.add_user(UserDTO(id=user_id))
+    return mock_user_repo
+
+
+def _sent_to(bot: MagicMock) -> list[int]:
+    return [call.args[0] for call in bot.send_message.await_args_list]
+
+
+class TestBroadcaster:
+    @pytest.mark.asyncio
+    async def test_all_users_reached_in_chunks(self, bot, users, redis) -> None:
+        forbidden = TelegramForbiddenError(MagicMock(), 'bot was blocked by the user')
+
+        async def send_message(chat_id, *args, **kwargs):
+            if chat_id == 2:
+                raise forbidden
+            if chat_id == 4:
+                raise ValueError('boom')
+
+        bot.send_message = AsyncMock(side_effect=send_message)
+        broadcaster = Broadcaster(bot, users, redis, TelegramOutbox(), chunk_size=2)
+
+        assert await broadcaster.start(_ADMIN, 'привет')
+        await broadcaster._task
+
+        progress = await broadcaster.progress()
+        assert progress.status is BroadcastStatus.DONE
+        assert (progress.delivered, progress.blocked, progress.failed) == (3, 1, 1)
+        assert progress.processed == progress.total == 5
+        assert await redis.client.hget(Broadcaster.STATE_KEY, 'cursor') == '5'
+        assert not await redis.client.exists(Broadcaster.LOCK_KEY)
+        # последнее сообщение — отчёт администратору
+        assert _sent_to(bot) == [1, 2, 3, 4, 5, _ADMIN]
+
+    @pytest.mark.asyncio
+    async def test_lock_released_when_state_lost(self, bot, users, redis) -> None:
+        broadcaster = Broadcaster(bot, users, redis, TelegramOutbox())
+        assert await broadcaster.start(_ADMIN, 'привет')
+        await redis.client.delete(Broadcaster.STATE_KEY)
+        await broadcaster._task
+
+        assert not await redis.client.exists(Broadcaster.LOCK_KEY)
+        assert await broadcaster.start(_ADMIN, 'ещё раз')
+        await broadcaster._task
+
+    @pytest.mark.asyncio
+    async def test_resume_continues_from_checkpoint(self, bot, users, redis) -> None:
+        await redis.client.hset(
+            Broadcaster.STATE_KEY,
+            mapping={
+                'status': BroadcastStatus.RUNNING,
+                'admin_id': _ADMIN,
+                'text': 'привет',
+                'cursor': 3,
+                'total': 5,
+                'delivered': 3,
+            },
+        )
+        broadcaster = Broadcaster(bot, users, redis, TelegramOutbox(), chunk_size=2)
+
+        await broadcaster.resume()
+        await broadcaster._task
+
+        assert _sent_to(bot) == [4, 5, _ADMIN]
+        progress = await broadcaster.progress()
+        assert progress.status is BroadcastStatus.DONE
+        assert progress.delivered == 5
+
+    @pytest.mark.asyncio
+    async def test_second_broadcast_rejected_while_running(
+        self, bot, users, redis
+    ) -> None:
+        release = asyncio.Event()
+
+        async def send_message(*args, **kwargs):
+            await release.wait()
+
+        bot.send_message = AsyncMock(side_effect=send_message)
+        outbox = TelegramOutbox()
+        first = Broadcaster(bot, users, redis, outbox)
+        second = Broadcaster(bot, users, redis, outbox)
+
+        assert await first.start(_ADMIN, 'первая')
+        assert not await second.start(_ADMIN, 'вторая')
+
+        release.set()
+        await first.cancel()
+        assert (await first.progress()).status is BroadcastStatus.CANCELLED
+        assert not await redis.client.exists(Broadcaster.LOCK_KEY)
+        await outbox.drain()
+
+    @pytest.mark.asyncio
+    async def test_resume_takes_over_stale_lock(self, bot, users, redis) -> None:
+        await redis.client.hset(
+            Broadcaster.STATE_KEY,
+            mapping={
+                'status': BroadcastStatus.RUNNING,
+                'admin_id': _ADMIN,
+                'text': 'привет',
+                'cursor': 3,
+                'total': 5,
+            },
+        )
+        # блокировка упавшего процесса, который не успел её снять
+        await redis.client.set(Broadcaster.LOCK_KEY, 'dead', px=200)
+        broadcaster = Broadcaster(bot, users, redis, TelegramOutbox(), chunk_size=2)
+
+        await broadcaster.resume()
+        assert broadcaster.is_running
+        await asyncio.sleep(0.05)
+        bot.send_message.assert_not_awaited()
+
+        await asyncio.wait_for(broadcaster._task, 1)
+
+        assert _sent_to(bot) == [4, 5, _ADMIN]
+        assert (await broadcaster.progress()).status is BroadcastStatus.DONE
+
+    @pytest.mark.asyncio
+    async def test_lock_renewed_while_running(self, bot, users, redis) -> None:
+        release = asyncio.Event()
+
+        async def send_message(*args, **kwargs):
+            await release.wait()
+
+        bot.send_message = AsyncMock(side_effect=send_message)
+        outbox = TelegramOutbox()
+        broadcaster = Broadcaster(bot, users, redis, outbox, lock_ttl=1)
+
+        assert await broadcaster.start(_ADMIN, 'привет')
+        await asyncio.sleep(1.3)
+
+        # порция идёт дольше срока блокировки, но она не истекла
+        assert await redis.client.get(Broadcaster.LOCK_KEY) == broadcaster._token
+        release.set()
+        await broadcaster._task
+        await outbox.drain()
@@ -0,0 +1,81 @@
+"""Тесты фоновой отправки цепочек сообщений."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from aiogram.exceptions import TelegramForbiddenError
+
+from src.presentation.message_sender import DripMessage, DripSender
+from src.presentation.outbox import TelegramOutbox
+
+
+@pytest.fixture
+def bot() -> MagicMock:
+    bot = MagicMock()
+    bot.send_message = AsyncMock()
+    bot.send_chat_action = AsyncMock()
+    return bot
+
+
+@pytest.fixture
+def outbox() -> TelegramOutbox:
+    return TelegramOutbox(chat_rate=1000, chat_burst=1000)
+
+
+def _texts(bot: MagicMock, chat_id: int) -> list[str]:
+    return [
+        call.kwargs['text']
+        for call in bot.send_message.await_args_list
+        if call.kwargs['chat_id'] == chat_id
+    ]
+
+
+class TestDripSender:
+    @pytest.mark.asyncio
+    async def test_enqueue_returns_immediately(self, bot, outbox) -> None:
+        drip = DripSender(bot, outbox, delay=0.05)
+
+        drip.enqueue(1, ['раз', 'два', 'три'])
+
+        bot.send_message.assert_not_awaited()
+        assert drip.pending == 1
+        await drip.drain()
+        assert _texts(bot, 1) == ['раз', 'два', 'три']
+        # «печатает...» только между сообщениями
+        assert bot.send_chat_action.await_count == 2
+        assert drip.pending == 0
+
+    @pytest.mark.asyncio
+    async def test_chat_sequences_keep_order(self, bot, outbox) -> None:
+        drip = DripSender(bot, outbox, delay=0)
+
+        drip.enqueue(1, ['1.1', '1.2'])
+        drip.enqueue(1, ['2.1', DripMessage('2.2', reply_markup=MagicMock())])
+        await drip.drain()
+
+        assert _texts(bot, 1) == ['1.1', '1.2', '2.1', '2.2']
+
+    @pytest.mark.asyncio
+    async def test_slow_chat_does_not_block_others(self, bot, outbox) -> None:
+        drip = DripSender(bot, outbox, delay=0.2)
+
+        drip.enqueue(1, ['долго', 'ждать'])
+        drip.enqueue(2, ['сразу'])
+        await asyncio.sleep(0.05)
+
+        assert _texts(bot, 2) == ['сразу']
+        assert _texts(bot, 1) == ['долго']
+        await drip.drain()
+
+    @pytest.mark.asyncio
+    async def test_failed_message_drops_rest_of_sequence(self, bot, outbox) -> None:
+        blocked = TelegramForbiddenError(MagicMock(), 'bot was blocked by the user')
+        bot.send_message = AsyncMock(side_effect=[blocked, None])
+        drip = DripSender(bot, outbox, delay=0)
+
+        drip.enqueue(1, ['раз', 'два'])
+        drip.enqueue(1, ['следующая'])
+        await drip.drain()
+
+        assert _texts(bot, 1) == ['раз', 'следующая']
@@ -0,0 +1,106 @@
+"""Тесты рассылки уведомлений администраторам."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.application.domen.models import LessonActivity
+from src.application.domen.models.activity_type import lesson_act
+from src.application.domen.models.lesson_option import trial_l_option
+from src.application.models import UserDTO
+from src.infrastracture.database.redis.keys import AdminKey
+from src.presentation.notifier import Notifier
+from src.presentation.outbox import TelegramOutbox
+
+_ADMINS = [1, 2, 3]
+
+
+@pytest.fixture
+def manager(redis_repository) -> MagicMock:
+    manager = MagicMock()
+    manager.event.bot.send_message = AsyncMock(
+        side_effect=lambda admin_id, *args, **kwargs: MagicMock(message_id=admin_id * 10)
+    )
+    manager.middleware_data = {'redis_repository': redis_repository}
+    return manager
+
+
+@pytest.fixture
+def sign_up() -> tuple[UserDTO, LessonActivity]:
+    user = UserDTO(id=5, phone='79001234567', name='Иван', last_name='Иванов')
+    activity = LessonActivity(activity_type=lesson_act, lesson_option=trial_l_option)
+    return user, activity
+
+
+@pytest.fixture(autouse=True)
+def admins():
+    with patch('src.presentation.notifier.get_config') as get_config:
+        get_config.return_value.admins = _ADMINS
+        yield
+
+
+class TestNotifier:
+    @pytest.mark.asyncio
+    async def test_admins_notified_concurrently(self, manager) -> None:
+        in_flight = 0
+        max_in_flight = 0
+
+        async def send_message(admin_id, *args, **kwargs):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+
+        manager.event.bot.send_message = AsyncMock(side_effect=send_message)
+        notifier = Notifier(TelegramOutbox(concurrency=2))
+
+        await notifier.admin_notify(manager, 'привет')
+
+        assert manager.event.bot.send_message.await_count == 3
+        assert max_in_flight == 2
+        assert set(notifier.latencies) == set(_ADMINS)
+
+    @pytest.mark.asyncio
+    async def test_failed_admin_does_not_block_others(
+        self, manager, redis_repository, sign_up
+    ) -> None:
+        def send_message(admin_id, *args, **kwargs):
+            if admin_id == 2:
+                raise ConnectionError('blocked by user')
+            return MagicMock(message_id=admin_id * 10)
+
+        manager.event.bot.send_message = AsyncMock(side_effect=send_message)
+        notifier = Notifier()
+
+        with patch('src.presentation.notifier.uuid4', return_value='sign-up'):
+            await notifier.schedule_sign_up_notify(*sign_up, 1, manager)
+            await notifier.drain()
+
+        assert await redis_repository.client.exists('sign-up')
+        saved = await redis_repository.get(AdminKey(key='sign-up'), dict)
+        assert saved == {'sended': False, '1': 10, '3': 30}
+
+    @pytest.mark.asyncio
+    async def test_admin_map_saved_before_sending(
+        self, manager, redis_repository, sign_up
+    ) -> None:
+        seen = []
+
+        async def send_message(admin_id, *args, **kwargs):
+            # администратор может нажать кнопку, пока остальным ещё отправляется
+            seen.append(await redis_repository.get(AdminKey(key='sign-up'), dict))
+            if admin_id == 1:
+                await redis_repository.merge(AdminKey(key='sign-up'), {'sended': True})
+            return MagicMock(message_id=admin_id * 10)
+
+        manager.event.bot.send_message = AsyncMock(side_effect=send_message)
+        notifier = Notifier()
+
+        with patch('src.presentation.notifier.uuid4', return_value='sign-up'):
+            await notifier.sign_up_notify(*sign_up, 1, manager)
+
+        assert seen[0] == {'sended': False}
+        saved = await redis_repository.get(AdminKey(key='sign-up'), dict)
+        assert saved == {'sended': True, '1': 10, '2': 20, '3': 30}
@@ -0,0 +1,195 @@
+"""Тесты очереди запросов к Telegram."""
+
+import asyncio
+import time
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from aiogram.enums.parse_mode import ParseMode
+from aiogram.exceptions import (
+    TelegramBadRequest,
+    TelegramNetworkError,
+    TelegramRetryAfter,
+)
+
+from src.application.utils import mjson
+from src.presentation.outbox import Priority, TelegramOutbox
+
+
+def _retry_after(seconds: int = 0) -> TelegramRetryAfter:
+    return TelegramRetryAfter(MagicMock(), 'Too Many Requests', seconds)
+
+
+class TestTelegramOutbox:
+    @pytest.mark.asyncio
+    async def test_calls_run_concurrently(self) -> None:
+        in_flight = 0
+        max_in_flight = 0
+
+        async def edit() -> bool:
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return True
+
+        outbox = TelegramOutbox(concurrency=3)
+
+        result = await outbox.run_all({chat_id: edit for chat_id in range(5)})
+
+        assert sorted(result.sent) == [0, 1, 2, 3, 4]
+        assert max_in_flight == 3
+
+    @pytest.mark.asyncio
+    async def test_temporary_errors_retried_in_background(self) -> None:
+        flaky = AsyncMock(
+            side_effect=[TelegramNetworkError(MagicMock(), 'timeout'), True]
+        )
+        outbox = TelegramOutbox(retry_delay=0)
+
+        result = await outbox.run_all({1: flaky, 2: AsyncMock(return_value=True)})
+
+        assert result.retrying == [1]
+        assert list(result.sent) == [2]
+        await outbox.drain()
+        assert flaky.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_bad_request_is_not_retried(self) -> None:
+        error = TelegramBadRequest(MagicMock(), 'message is not modified')
+        call = AsyncMock(side_effect=error)
+        outbox = TelegramOutbox(retry_delay=0)
+
+        result = await outbox.run_all({1: call})
+
+        assert result.failed == {1: error}
+        await outbox.drain()
+        call.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_user_replies_go_before_bulk(self) -> None:
+        order = []
+        release = asyncio.Event()
+
+        async def blocker() -> None:
+            await release.wait()
+
+        def call(name: str):
+            async def send() -> None:
+                order.append(name)
+
+            return send
+
+        outbox = TelegramOutbox(concurrency=1)
+        blocked = asyncio.ensure_future(outbox.run(0, blocker))
+        await asyncio.sleep(0)
+        reminder = asyncio.ensure_future(outbox.run(1, call('bulk'), Priority.BULK))
+        reply = asyncio.ensure_future(outbox.run(2, call('user'), Priority.USER))
+        await asyncio.sleep(0)
+        release.set()
+        await asyncio.gather(blocked, reminder, reply)
+
+        assert order == ['user', 'bulk']
+        await outbox.drain()
+
+    @pytest.mark.asyncio
+    async def test_chat_rate_limited(self) -> None:
+        sent: dict[int, list[float]] = {1: [], 2: []}
+
+        def call(chat_id: int):
+            async def send() -> None:
+                sent[chat_id].append(time.monotonic())
+
+            return send
+
+        outbox = TelegramOutbox(chat_rate=20, chat_burst=1)
+        await asyncio.gather(
+            outbox.run(1, call(1)), outbox.run(1, call(1)), outbox.run(2, call(2))
+        )
+
+        assert sent[1][1] - sent[1][0] >= 0.04
+        assert sent[2][0] - sent[1][0] < 0.04
+        await outbox.drain()
+
+    @pytest.mark.asyncio
+    async def test_retry_after_pauses_and_requeues(self) -> None:
+        call = AsyncMock(side_effect=[_retry_after(), 'ok'])
+        outbox = TelegramOutbox()
+
+        assert await outbox.run(1, call) == 'ok'
+        assert call.await_count == 2
+        assert outbox._paused_until > 0
+        await outbox.drain()
+
+    @pytest.mark.asyncio
+    async def test_requeued_on_drain_is_failed(self) -> None:
+        started = asyncio.Event()
+
+        async def call() -> None:
+            started.set()
+            await asyncio.sleep(0.01)
+            raise _retry_after()
+
+        outbox = TelegramOutbox()
+        task = asyncio.create_task(outbox.run(1, call))
+        await started.wait()
+        await outbox.drain()
+
+        with pytest.raises(RuntimeError, match='Outbox stopped'):
+            await asyncio.wait_for(task, 1)
+        assert outbox.pending == 0
+
+    @pytest.mark.asyncio
+    async def test_bulk_overflow_persisted_in_redis(self) -> None:
+        redis = MagicMock()
+        redis.rpush = AsyncMock()
+        bot = MagicMock()
+        bot.send_message = AsyncMock()
+        outbox = TelegramOutbox(bot, redis, max_pending=1)
+
+        await outbox.send_message(1, 'первое')
+        await outbox.send_message(2, 'второе')
+        assert redis.rpush.await_count == 1
+        await outbox.drain()
+
+        assert redis.rpush.await_count == 2
+        persisted = [call.args[1:] for call in redis.rpush.await_args_list]
+        assert [len(payloads) for payloads in persisted] == [1, 1]
+        bot.send_message.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_overflow_sent_after_restart(self, redis_repository) -> None:
+        bot = MagicMock()
+        bot.send_message = AsyncMock()
+        outbox = TelegramOutbox(bot, redis_repository, max_pending=2)
+        for chat_id in (1, 2, 3):
+            await outbox.send_message(chat_id, 'привет', parse_mode=ParseMode.HTML)
+        await outbox.drain()
+        assert await redis_repository.client.llen(TelegramOutbox.OVERFLOW_KEY)
+
+        restarted = TelegramOutbox(bot, redis_repository, max_pending=2)
+        restarted.start()
+        for _ in range(100):
+            if bot.send_message.await_count == 3:
+                break
+            await asyncio.sleep(0.01)
+        await restarted.drain()
+
+        sent = [call.kwargs['chat_id'] for call in bot.send_message.await_args_list]
+        assert sorted(sent) == [1, 2, 3]
+        assert not await redis_repository.client.exists(TelegramOutbox.OVERFLOW_KEY)
+
+    @pytest.mark.asyncio
+    async def test_overflow_read_in_batches(self, redis_repository) -> None:
+        bot = MagicMock()
+        bot.send_message = AsyncMock()
+        payloads = [mjson.encode({'chat_id': i, 'text': 'привет'}) for i in range(3)]
+        await redis_repository.rpush(TelegramOutbox.OVERFLOW_KEY, *payloads)
+        outbox = TelegramOutbox(bot, redis_repository, max_pending=1)
+
+        assert await outbox._pull_overflow()
+
+        # половина от max_pending=1 — ноль, но хотя бы одно сообщение читается
+        assert outbox.pending == 1
+        assert await redis_repository.client.llen(TelegramOutbox.OVERFLOW_KEY) == 2
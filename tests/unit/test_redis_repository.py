@@ -0,0 +1,133 @@
+"""Тесты записи в Redis: блокировки, скрипты и транзакции."""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.application.models import UserDTO
+from src.application.utils import mjson
+from src.infrastracture.database.redis.keys import AdminKey
+from src.infrastracture.database.redis.repository import RedisRepository
+
+
+@pytest.fixture
+def client() -> MagicMock:
+    client = MagicMock()
+    client.set = AsyncMock()
+    client.lock = MagicMock()
+    client.lock.return_value.__aenter__ = AsyncMock()
+    client.lock.return_value.__aexit__ = AsyncMock(return_value=False)
+    script = AsyncMock(return_value=mjson.encode({'1': 10, 'sended': True}))
+    client.register_script = MagicMock(return_value=script)
+    return client
+
+
+class TestSet:
+    @pytest.mark.asyncio
+    async def test_set_is_single_command(self, client) -> None:
+        await RedisRepository(client).set('users:1', {'id': 1}, ex=60)
+
+        client.lock.assert_not_called()
+        client.set.assert_awaited_once_with(
+            name='users:1', value=mjson.encode({'id': 1}), ex=60
+        )
+
+    @pytest.mark.asyncio
+    async def test_set_with_lock(self, client) -> None:
+        await RedisRepository(client).set('users:1', {'id': 1}, lock=True)
+
+        client.lock.assert_called_once_with('lock:users:1')
+        client.set.assert_awaited_once()
+
+
+class TestMerge:
+    @pytest.mark.asyncio
+    async def test_merge_runs_script_once_per_call(self, client) -> None:
+        repo = RedisRepository(client)
+
+        merged = await repo.merge(AdminKey(key='m1'), {'sended': True}, ex=60)
+        await repo.merge(AdminKey(key='m1'), {'2': 11})
+
+        assert merged == {'1': 10, 'sended': True}
+        client.register_script.assert_called_once()
+        script = client.register_script.return_value
+        assert script.await_args_list[0].kwargs == {
+            'keys': [AdminKey(key='m1').pack()],
+            'args': [mjson.encode({'sended': True}), 60],
+        }
+        client.set.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_merge_missing_key(self, client) -> None:
+        client.register_script.return_value.return_value = None
+
+        assert await RedisRepository(client).merge('admin:none', {'sended': True}) is None
+
+
+class TestMergeScript:
+    @pytest.mark.asyncio
+    async def test_merge_updates_stored_dict(self, redis_repository) -> None:
+        await redis_repository.set('admin:m1', {'1': 10, 'sended': False}, ex=60)
+
+        merged = await redis_repository.merge(
+            'admin:m1', {'sended': True, '2': 11}, ex=None
+        )
+
+        assert merged == {'1': 10, 'sended': True, '2': 11}
+        assert await redis_repository.get('admin:m1', dict) == merged
+        # KEEPTTL: срок жизни ключа не сбрасывается
+        assert 0 < await redis_repository.client.ttl('admin:m1') <= 60
+
+    @pytest.mark.asyncio
+    async def test_merge_missing_key(self, redis_repository) -> None:
+        assert await redis_repository.merge('admin:none', {'sended': True}) is None
+        assert not await redis_repository.client.exists('admin:none')
+
+
+class TestHset:
+    @pytest.mark.asyncio
+    async def test_hset_with_expiry_is_one_transaction(self, client) -> None:
+        pipe = MagicMock()
+        pipe.execute = AsyncMock(return_value=[1, True])
+        client.pipeline.return_value.__aenter__ = AsyncMock(return_value=pipe)
+        client.pipeline.return_value.__aexit__ = AsyncMock(return_value=False)
+        client.hset = AsyncMock()
+        client.expire = AsyncMock()
+
+        await RedisRepository(client).hset('m1', mapping={'cost': '100'}, ex=60)
+
+        client.pipeline.assert_called_once_with(transaction=True)
+        pipe.hset.assert_called_once_with('m1', None, None, {'cost': '100'})
+        pipe.expire.assert_called_once_with('m1', 60)
+        pipe.execute.assert_awaited_once()
+        client.hset.assert_not_called()
+        client.expire.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_hset_without_expiry(self, client) -> None:
+        client.hset = AsyncMock()
+
+        await RedisRepository(client).hset('menu_image', 'file', 'photo', ex=None)
+
+        client.hset.assert_awaited_once_with('menu_image', 'file', 'photo', None)
+        client.pipeline.assert_not_called()
+
+
+class TestGet:
+    @pytest.mark.asyncio
+    async def test_get_user_decodes_into_dataclass(self, client) -> None:
+        user = UserDTO(id=1, phone='79001234567', name='Иван')
+        client.get = AsyncMock(return_value=mjson.encode(user.to_dict()))
+
+        assert await RedisRepository(client).get_user(1) == user
+
+    @pytest.mark.asyncio
+    async def test_get_list(self, client) -> None:
+        client.get = AsyncMock(return_value=mjson.encode([{'theme': 'Натюрморт'}]))
+
+        activities = await RedisRepository(client).get('activity:lesson', list)
+
+        assert activities == [{'theme': 'Натюрморт'}]
+
+    def test_decoder_is_cached_per_type(self) -> None:
+        assert mjson.typed_decoder(UserDTO) is mjson.typed_decoder(UserDTO)
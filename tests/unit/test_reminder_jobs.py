@@ -0,0 +1,177 @@
+"""Тесты расписания напоминаний в Redis."""
+
+import asyncio
+import zoneinfo
+from datetime import datetime, timedelta
+from functools import partial
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.infrastracture.database.redis.repository import RedisRepository
+from src.presentation.outbox import TelegramOutbox
+from src.presentation.reminders.dispatcher import ReminderDispatcher
+from src.presentation.reminders.job_store import ReminderJobStore, scan_hashes
+from src.presentation.reminders.payment_reminder import PaymentReminder
+
+
+@pytest.fixture
+def redis(redis_repository) -> RedisRepository:
+    return redis_repository
+
+
+@pytest.fixture
+def reminder(redis) -> PaymentReminder:
+    return PaymentReminder(MagicMock(), redis)
+
+
+async def _schedule(redis: RedisRepository, key: str = PaymentReminder.SCHEDULE_KEY):
+    return dict(await redis.client.zrange(key, 0, -1, withscores=True))
+
+
+class TestPaymentReminderJobs:
+    @pytest.mark.asyncio
+    async def test_restart_keeps_schedule_in_redis(self, reminder, redis) -> None:
+        now = datetime.now(reminder.zone_info)
+        await reminder.jobs.add(1, now + timedelta(hours=1))
+
+        with patch.object(redis.client, 'scan_iter') as scan_iter:
+            await reminder.setup_reminders()
+
+        assert set(await _schedule(redis)) == {'1'}
+        scan_iter.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_overdue_reminder_waits_for_work_hours(self, reminder, redis) -> None:
+        morning = datetime.now(reminder.zone_info) + timedelta(hours=5)
+        await redis.hset('payment:pending:7', mapping={'user_id': 7, 'reminder_count': 0})
+        reminder.adjust_to_work_hours = MagicMock(return_value=morning)
+
+        await reminder._process_reminder(7)
+
+        assert await _schedule(redis) == {'7': morning.timestamp()}
+        reminder.bot.send_message.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_schedule_follows_reminder(self, reminder, redis) -> None:
+        await reminder.add_reminder(7)
+
+        assert set(await _schedule(redis)) == {'7'}
+        assert await redis.hgetall('payment:pending:7')
+
+        await reminder.delete_payment(7)
+
+        assert await _schedule(redis) == {}
+        assert not await redis.client.exists('payment:pending:7')
+
+    @pytest.mark.asyncio
+    async def test_job_without_data_is_dropped(self, reminder, redis) -> None:
+        await reminder.jobs.add(7, datetime.now(reminder.zone_info))
+
+        await reminder._process_reminder(7)
+
+        assert await _schedule(redis) == {}
+
+    @pytest.mark.asyncio
+    async def test_legacy_reminders_restored_in_batches(self, reminder, redis) -> None:
+        last = datetime.now(reminder.zone_info).timestamp()
+        for user_id in range(5):
+            await redis.hset(
+                f'payment:pending:{user_id}',
+                mapping={
+                    'user_id': user_id,
+                    'reminder_count': 0 if user_id else 3,
+                    'last_reminded': last,
+                    'run_date': '',
+                },
+            )
+        pipeline = MagicMock(wraps=redis.client.pipeline)
+
+        with (
+            patch.object(redis.client, 'pipeline', pipeline),
+            patch(
+                'src.presentation.reminders.payment_reminder.scan_hashes',
+                partial(scan_hashes, chunk_size=2),
+            ),
+        ):
+            await reminder.setup_reminders()
+
+        # 5 ключей пачками по 2 — три запроса вместо пяти
+        reads = [c for c in pipeline.call_args_list if c.kwargs == {'transaction': False}]
+        assert len(reads) == 3
+        assert set(await _schedule(redis)) == {'1', '2', '3', '4'}
+        assert not await redis.client.exists('payment:pending:0')
+
+    @pytest.mark.asyncio
+    async def test_job_rescheduled_before_delivery(self, redis) -> None:
+        release = asyncio.Event()
+
+        async def send_message(**kwargs) -> None:
+            await release.wait()
+
+        bot = MagicMock()
+        bot.send_message = AsyncMock(side_effect=send_message)
+        outbox = TelegramOutbox(bot, redis)
+        reminder = PaymentReminder(bot, redis, outbox)
+        reminder.adjust_to_work_hours = lambda time: time
+        await redis.hset('payment:pending:7', mapping={'user_id': 7, 'reminder_count': 0})
+
+        # отправка ещё висит в очереди, а задача уже перенесена
+        await asyncio.wait_for(reminder._process_reminder(7), 1)
+
+        assert (await _schedule(redis))['7'] > datetime.now().timestamp()
+        data = await redis.hgetall('payment:pending:7')
+        assert data['reminder_count'] == '1'
+        release.set()
+        await outbox.drain()
+        bot.send_message.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_last_reminder_clears_payment(self, redis) -> None:
+        outbox = MagicMock()
+        outbox.send_message = AsyncMock()
+        reminder = PaymentReminder(MagicMock(), redis, outbox)
+        reminder.adjust_to_work_hours = lambda time: time
+        last = PaymentReminder.MAX_REMINDER_COUNT - 1
+        await redis.hset(
+            'payment:pending:7', mapping={'user_id': 7, 'reminder_count': last}
+        )
+        await reminder.jobs.add(7, datetime.now(reminder.zone_info))
+
+        await reminder._process_reminder(7)
+
+        outbox.send_message.assert_awaited_once()
+        assert await _schedule(redis) == {}
+        assert not await redis.client.exists('payment:pending:7')
+
+
+class TestReminderDispatcher:
+    @pytest.mark.asyncio
+    async def test_due_jobs_claimed_once_across_replicas(self, redis) -> None:
+        store = ReminderJobStore(redis, 'test:schedule', zoneinfo.ZoneInfo('UTC'))
+        now = datetime.now(store.zone_info)
+        for user_id in range(5):
+            await store.add(user_id, now - timedelta(seconds=1))
+        await store.add(99, now + timedelta(hours=1))
+        handled: list[int] = []
+
+        async def handler(user_id: int) -> None:
+            handled.append(user_id)
+
+        first = ReminderDispatcher(store, handler, batch_size=3, workers=2)
+        second = ReminderDispatcher(store, handler, batch_size=3, workers=2)
+        # Lua-скрипт забора выполняется в fakeredis
+        assert await first.poll() == 3
+        assert await second.poll() == 2
+        assert await second.poll() == 0
+        first.start()
+        second.start()
+        await asyncio.sleep(0.05)
+        await first.stop()
+        await second.stop()
+
+        assert sorted(handled) == [0, 1, 2, 3, 4]
+        # забранные задачи сдвинуты на время аренды, будущая не тронута
+        scores = await _schedule(redis, 'test:schedule')
+        assert all(scores[str(u)] > now.timestamp() + 60 for u in range(5))
+        assert scores['99'] == (now + timedelta(hours=1)).timestamp()
@@ -0,0 +1,207 @@
+"""Тесты очереди отложенной записи в Google Sheets."""
+
+import asyncio
+
+import pytest
+
+from src.application.utils import mjson
+from src.infrastracture.adapters.interfaces.repositories import BaseRepository
+from src.infrastracture.adapters.repositories.sheet_queue import SheetWriteQueue
+from src.infrastracture.database.redis.repository import RedisRepository
+
+
+class FakeWorksheet:
+    def __init__(
+        self,
+        headers: list[str],
+        fail_times: int = 0,
+        error: Exception | None = None,
+    ) -> None:
+        self.headers = headers
+        self.fail_times = fail_times
+        self.error = error or ConnectionError('quota exceeded')
+        self.batches: list[list[dict]] = []
+
+    def row_values(self, row: int) -> list[str]:
+        return self.headers
+
+    def batch_update(self, requests: list[dict]) -> None:
+        if self.fail_times:
+            self.fail_times -= 1
+            raise self.error
+        self.batches.append(requests)
+
+
+@pytest.fixture
+def redis(redis_repository) -> RedisRepository:
+    return redis_repository
+
+
+@pytest.fixture
+def lessons_sheet() -> FakeWorksheet:
+    return FakeWorksheet(['name', 'cost', 'status'])
+
+
+@pytest.fixture
+def child_sheet() -> FakeWorksheet:
+    return FakeWorksheet(['name', 'cost', 'status'])
+
+
+@pytest.fixture
+def queue(redis, lessons_sheet, child_sheet) -> SheetWriteQueue:
+    return SheetWriteQueue(
+        redis,
+        {
+            'lesson': BaseRepository(lessons_sheet),
+            'child_studio': BaseRepository(child_sheet),
+        },
+    )
+
+
+class TestSheetWriteQueue:
+    @pytest.mark.asyncio
+    async def test_writes_are_coalesced_per_worksheet(
+        self, queue, lessons_sheet, child_sheet
+    ) -> None:
+        await queue.enqueue('lesson', 5, {'cost': 1500, 'status': 'не оплачено'})
+        await queue.enqueue('lesson', 7, {'status': 'Отменено'})
+        await queue.enqueue('child_studio', 3, {'status': 'оплачено'})
+        await queue.enqueue('lesson', 5, {'status': 'оплачено'})
+
+        assert await queue.flush() == 4
+
+        assert lessons_sheet.batches == [
+            [
+                {'range': 'B5', 'values': [[1500]]},
+                {'range': 'C5', 'values': [['оплачено']]},
+                {'range': 'C7', 'values': [['Отменено']]},
+            ]
+        ]
+        assert child_sheet.batches == [[{'range': 'C3', 'values': [['оплачено']]}]]
+        assert (await queue.metrics()).depth == 0
+
+    @pytest.mark.asyncio
+    async def test_failed_flush_keeps_writes(self, queue, lessons_sheet) -> None:
+        lessons_sheet.fail_times = 1
+        await queue.enqueue('lesson', 5, {'status': 'оплачено'})
+
+        with pytest.raises(ConnectionError):
+            await queue.flush()
+        metrics = await queue.metrics()
+        assert metrics.depth == 1
+        assert metrics.lag >= 0
+
+        assert await queue.flush() == 1
+        assert lessons_sheet.batches == [[{'range': 'C5', 'values': [['оплачено']]}]]
+
+    @pytest.mark.asyncio
+    async def test_queue_survives_restart(self, redis, queue, lessons_sheet) -> None:
+        await queue.enqueue('lesson', 9, {'status': 'оплачено'})
+
+        restarted = SheetWriteQueue(redis, {'lesson': BaseRepository(lessons_sheet)})
+
+        assert await restarted.flush() == 1
+        assert lessons_sheet.batches == [[{'range': 'C9', 'values': [['оплачено']]}]]
+
+    @pytest.mark.asyncio
+    async def test_unknown_sheet_rejected(self, queue) -> None:
+        with pytest.raises(KeyError):
+            await queue.enqueue('unknown', 1, {'status': 'оплачено'})
+
+    @pytest.mark.asyncio
+    async def test_rejected_writes_moved_to_dead_letter(
+        self, redis, lessons_sheet, child_sheet
+    ) -> None:
+        lessons_sheet.fail_times = 10
+        lessons_sheet.error = ValueError('Invalid range')
+        queue = SheetWriteQueue(
+            redis,
+            {
+                'lesson': BaseRepository(lessons_sheet),
+                'child_studio': BaseRepository(child_sheet),
+            },
+            max_attempts=2,
+        )
+        await queue.enqueue('lesson', 5, {'status': 'оплачено'})
+        await queue.enqueue('child_studio', 3, {'status': 'оплачено'})
+        await redis.rpush(SheetWriteQueue.QUEUE_KEY, 'not json')
+
+        with pytest.raises(ValueError, match='Invalid range'):
+            await queue.flush()
+        assert (await queue.metrics()).depth == 3
+
+        assert await queue.flush() == 3
+        assert (await queue.metrics()).depth == 0
+        dead = await redis.client.lrange(SheetWriteQueue.DEAD_LETTER_KEY, 0, -1)
+        assert len(dead) == 2
+        assert 'not json' in dead
+        assert queue.dead_lettered == 2
+        assert child_sheet.batches
+
+    @pytest.mark.asyncio
+    async def test_network_errors_never_dead_lettered(self, redis, lessons_sheet) -> None:
+        lessons_sheet.fail_times = 3
+        queue = SheetWriteQueue(
+            redis, {'lesson': BaseRepository(lessons_sheet)}, max_attempts=2
+        )
+        await queue.enqueue('lesson', 5, {'status': 'оплачено'})
+
+        for _ in range(3):
+            with pytest.raises(ConnectionError):
+                await queue.flush()
+
+        assert await queue.flush() == 1
+        assert not await redis.client.exists(SheetWriteQueue.DEAD_LETTER_KEY)
+        assert lessons_sheet.batches == [[{'range': 'C5', 'values': [['оплачено']]}]]
+
+    @pytest.mark.asyncio
+    async def test_replicas_do_not_flush_same_batch(
+        self, redis, queue, lessons_sheet
+    ) -> None:
+        other = SheetWriteQueue(redis, {'lesson': BaseRepository(lessons_sheet)})
+        for row in range(2, 6):
+            await queue.enqueue('lesson', row, {'status': 'оплачено'})
+
+        flushed = await asyncio.gather(queue.flush(), other.flush())
+
+        assert sorted(flushed) == [0, 4]
+        assert len(lessons_sheet.batches) == 1
+        assert (await queue.metrics()).depth == 0
+        assert not await redis.client.exists(SheetWriteQueue.LOCK_KEY)
+
+    @pytest.mark.asyncio
+    async def test_batch_kept_when_lock_lost(self, redis, lessons_sheet) -> None:
+        repo = BaseRepository(lessons_sheet)
+        queue = SheetWriteQueue(redis, {'lesson': repo})
+        await queue.enqueue('lesson', 5, {'status': 'оплачено'})
+
+        async def update_rows(rows) -> None:
+            # блокировка истекла, пачку забрала другая реплика
+            await redis.client.set(SheetWriteQueue.LOCK_KEY, 'other')
+
+        repo.update_rows = update_rows
+
+        assert await queue.flush() == 0
+        assert (await queue.metrics()).depth == 1
+        assert await redis.client.get(SheetWriteQueue.LOCK_KEY) == 'other'
+
+    @pytest.mark.asyncio
+    async def test_unknown_sheet_writes_dead_lettered(self, redis, queue) -> None:
+        entry = {'sheet': 'удалённый', 'row': 3, 'values': {}, 'ts': 0}
+        await redis.rpush(SheetWriteQueue.QUEUE_KEY, mjson.encode(entry))
+
+        assert await queue.flush() == 1
+
+        dead = await redis.client.lrange(SheetWriteQueue.DEAD_LETTER_KEY, 0, -1)
+        assert [mjson.decode(raw)['sheet'] for raw in dead] == ['удалённый']
+
+    @pytest.mark.asyncio
+    async def test_unbound_sheet_times_out(self, redis) -> None:
+        queue = SheetWriteQueue(redis, {'lesson': BaseRepository()}, ready_timeout=0.01)
+        await queue.enqueue('lesson', 5, {'status': 'оплачено'})
+
+        with pytest.raises(TimeoutError):
+            await queue.flush()
+
+        assert (await queue.metrics()).depth == 1
+        assert not await redis.client.exists(SheetWriteQueue.LOCK_KEY)
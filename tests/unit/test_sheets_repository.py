@@ -0,0 +1,136 @@
+"""Тесты репозитория листов Google Sheets."""
+
+import asyncio
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.infrastracture.adapters.interfaces.repositories import BaseRepository
+from src.infrastracture.adapters.repositories.bootstrap import SheetsBootstrap
+
+
+@pytest.fixture
+def worksheet() -> MagicMock:
+    worksheet = MagicMock()
+    worksheet.row_values = MagicMock(return_value=['name', 'last_name', 'status'])
+    worksheet.append_row = MagicMock(
+        return_value={'updates': {'updatedRange': "'уроки'!A2:H2"}}
+    )
+    return worksheet
+
+
+@pytest.fixture
+def row() -> list[str]:
+    return ['79001234567', 'Иван', 'Иванов', 'lessons', 'trial']
+
+
+class TestSignUp:
+    @pytest.mark.asyncio
+    async def test_append_row_does_not_read_sheet(self, worksheet, row) -> None:
+        worksheet.append_row.return_value = {
+            'updates': {'updatedRange': "'уроки'!A1024:H1024"}
+        }
+        repo = BaseRepository(worksheet)
+
+        num_row = await repo.append_row(row)
+
+        assert num_row == 1024
+        worksheet.get_all_values.assert_not_called()
+        worksheet.insert_row.assert_not_called()
+        assert worksheet.append_row.call_count == 1
+
+
+class TestHeaderIndex:
+    @pytest.mark.asyncio
+    async def test_status_update_is_single_batch_update(self, worksheet) -> None:
+        repo = BaseRepository(worksheet)
+        await repo.load_headers()
+
+        await repo.change_value_in_row(5, 'status', 'оплачено')
+        await repo.change_values_in_row(6, {'status': 'не оплачено', 'name': 'Иван'})
+
+        worksheet.row_values.assert_called_once_with(1)
+        worksheet.find.assert_not_called()
+        assert worksheet.batch_update.call_args_list[0].args[0] == [
+            {'range': 'C5', 'values': [['оплачено']]}
+        ]
+        assert worksheet.batch_update.call_args_list[1].args[0] == [
+            {'range': 'C6', 'values': [['не оплачено']]},
+            {'range': 'A6', 'values': [['Иван']]},
+        ]
+
+    @pytest.mark.asyncio
+    async def test_headers_reloaded_on_miss(self, worksheet) -> None:
+        repo = BaseRepository(worksheet)
+        await repo.load_headers()
+        worksheet.row_values.return_value = ['name', 'last_name', 'status', 'cost']
+
+        await repo.update_cells_by_headers(3, {'cost': 500})
+
+        assert worksheet.row_values.call_count == 2
+        worksheet.batch_update.assert_called_once_with(
+            [{'range': 'D3', 'values': [[500]]}]
+        )
+
+    @pytest.mark.asyncio
+    async def test_invalidate_headers(self, worksheet) -> None:
+        repo = BaseRepository(worksheet)
+        await repo.load_headers()
+        repo.invalidate_headers()
+
+        await repo.change_value_in_row(2, 'name', 'Пётр')
+
+        assert worksheet.row_values.call_count == 2
+
+
+class TestBootstrap:
+    @pytest.mark.asyncio
+    async def test_calls_wait_until_worksheet_is_bound(self, worksheet) -> None:
+        repo = BaseRepository()
+        load = asyncio.create_task(repo.load_headers())
+        await asyncio.sleep(0)
+
+        assert not load.done()
+        repo.bind(worksheet)
+        await load
+
+        worksheet.row_values.assert_called_once_with(1)
+
+    @pytest.mark.asyncio
+    async def test_pages_resolved_with_one_metadata_fetch(self, worksheet) -> None:
+        worksheet.title = 'уроки'
+        child_sheet = MagicMock(title='детская студия')
+        spreadsheet = MagicMock()
+        spreadsheet.worksheets = MagicMock(
+            side_effect=[ConnectionError('timeout'), [worksheet, child_sheet]]
+        )
+        lessons, child = BaseRepository(), BaseRepository()
+        bootstrap = SheetsBootstrap(
+            lambda: spreadsheet, {'уроки': lessons, 'детская студия': child}, None, 0
+        )
+
+        await bootstrap.run()
+
+        assert lessons.is_ready
+        assert child.is_ready
+        assert spreadsheet.worksheets.call_count == 2
+        spreadsheet.worksheet.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_missing_page_waits_for_worksheet(self, worksheet) -> None:
+        worksheet.title = 'уроки'
+        child_sheet = MagicMock(title='детская студия')
+        spreadsheet = MagicMock()
+        spreadsheet.worksheets = MagicMock(
+            side_effect=[[worksheet], [worksheet, child_sheet]]
+        )
+        lessons, child = BaseRepository(), BaseRepository()
+        bootstrap = SheetsBootstrap(
+            lambda: spreadsheet, {'уроки': lessons, 'детская студия': child}, None, 0
+        )
+
+        await bootstrap.run()
+
+        assert child._wsheet is child_sheet
+        # найденный с первого раза лист повторно не привязывается
+        worksheet.row_values.assert_called_once_with(1)
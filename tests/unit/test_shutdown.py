@@ -0,0 +1,57 @@
+"""Тесты остановки веб-приложения бота."""
+
+import asyncio
+import os
+import signal
+from unittest.mock import MagicMock
+
+import pytest
+from aiogram import Dispatcher
+from aiogram.webhook.aiohttp_server import setup_application
+from aiohttp import web
+
+from src.application.factory.telegram import run_until_stopped
+
+
+async def _runner(dp: Dispatcher) -> web.AppRunner:
+    app = web.Application()
+    setup_application(app, dp, bot=MagicMock())
+    runner = web.AppRunner(app)
+    await runner.setup()
+    return runner
+
+
+class TestRunUntilStopped:
+    @pytest.mark.asyncio
+    async def test_shutdown_hooks_run_in_order(self) -> None:
+        dp = Dispatcher()
+        called: list[str] = []
+        for name in ('reminder', 'outbox', 'sheet_queue'):
+
+            async def hook(name: str = name) -> None:
+                called.append(name)
+
+            dp.shutdown.register(hook)
+        stop = asyncio.Event()
+        stop.set()
+
+        await run_until_stopped(await _runner(dp), stop)
+
+        assert called == ['reminder', 'outbox', 'sheet_queue']
+
+    @pytest.mark.asyncio
+    async def test_sigterm_stops_app(self) -> None:
+        dp = Dispatcher()
+        stopped = asyncio.Event()
+
+        async def hook() -> None:
+            stopped.set()
+
+        dp.shutdown.register(hook)
+        task = asyncio.create_task(run_until_stopped(await _runner(dp)))
+        await asyncio.sleep(0)
+
+        os.kill(os.getpid(), signal.SIGTERM)
+        await asyncio.wait_for(task, 1)
+
+        assert stopped.is_set()
@@ -0,0 +1,139 @@
+"""Тесты хранения заявок в SQLite и их переноса в Google Sheets."""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.application.domen.models import LessonActivity
+from src.application.domen.models.activity_type import (
+    ActivityEnum,
+    ActivityTypeFactory,
+)
+from src.application.domen.models.lesson_option import (
+    CLASSIC_LESS,
+    LessonOptionFactory,
+)
+from src.application.models import UserDTO
+from src.infrastracture.adapters.repositories.signups import (
+    SignUpProjector,
+    SignUpsRepository,
+)
+
+_SHEET = ActivityEnum.LESSON.value
+
+
+@pytest.fixture
+def signups(mock_database: MagicMock) -> SignUpsRepository:
+    return SignUpsRepository(mock_database.async_session_maker)
+
+
+@pytest.fixture
+def sheet() -> MagicMock:
+    repo = MagicMock()
+    repo.append_row = AsyncMock(side_effect=[7, 8, 9])
+    return repo
+
+
+@pytest.fixture
+def write_queue() -> MagicMock:
+    queue = MagicMock()
+    queue.enqueue = AsyncMock()
+    return queue
+
+
+@pytest.fixture
+def projector(
+    signups: SignUpsRepository, sheet: MagicMock, write_queue: MagicMock
+) -> SignUpProjector:
+    return SignUpProjector(signups, {_SHEET: sheet}, write_queue)
+
+
+async def _add_signup(signups: SignUpsRepository) -> int:
+    user = UserDTO(id=1, phone='79990000000', name='Иван', last_name='Иванов')
+    activity = LessonActivity(
+        activity_type=ActivityTypeFactory.generate(ActivityEnum.LESSON),
+        lesson_option=LessonOptionFactory.generate(CLASSIC_LESS),
+        topic='Натюрморт',
+    )
+    return await signups.add_signup(user, activity, _SHEET)
+
+
+@pytest.mark.asyncio
+async def test_new_signup_appended_once(
+    signups: SignUpsRepository, projector: SignUpProjector, sheet: MagicMock
+) -> None:
+    await _add_signup(signups)
+
+    assert await projector.sync() == 1
+    assert await projector.sync() == 0
+
+    sheet.append_row.assert_awaited_once()
+    row = sheet.append_row.await_args.args[0]
+    assert row[:4] == ['79990000000', 'Иван', 'Иванов', 'Натюрморт']
+
+
+@pytest.mark.asyncio
+async def test_update_goes_to_known_row(
+    signups: SignUpsRepository,
+    projector: SignUpProjector,
+    sheet: MagicMock,
+    write_queue: MagicMock,
+) -> None:
+    signup_id = await _add_signup(signups)
+    await projector.sync()
+
+    assert await signups.update_signup(signup_id, {'status': 'оплачено', 'cost': 1500})
+    assert await projector.sync() == 1
+
+    sheet.append_row.assert_awaited_once()
+    write_queue.enqueue.assert_awaited_once_with(
+        _SHEET, 7, {'status': 'оплачено', 'cost': '1500'}
+    )
+
+
+@pytest.mark.asyncio
+async def test_change_during_sync_is_not_lost(
+    signups: SignUpsRepository, projector: SignUpProjector, sheet: MagicMock
+) -> None:
+    signup_id = await _add_signup(signups)
+
+    async def append_and_update(values: list) -> int:
+        await signups.update_signup(signup_id, {'status': 'Отменено'})
+        return 7
+
+    sheet.append_row.side_effect = append_and_update
+    await projector.sync()
+
+    unsynced = await signups.get_unsynced(10)
+    assert [s.sheet_row for s in unsynced] == [7]
+
+
+@pytest.mark.asyncio
+async def test_replicas_do_not_append_same_signup(
+    signups: SignUpsRepository, sheet: MagicMock, write_queue: MagicMock
+) -> None:
+    await _add_signup(signups)
+    first = SignUpProjector(signups, {_SHEET: sheet}, write_queue)
+    second = SignUpProjector(signups, {_SHEET: sheet}, write_queue)
+
+    claimed = await signups.claim_unsynced(10, lease=60)
+    assert [await first.sync(), await second.sync()] == [0, 0]
+
+    await signups.release([s.id for s in claimed])
+    assert await first.sync() == 1
+    assert await second.sync() == 0
+    sheet.append_row.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_failed_sync_releases_claim(
+    signups: SignUpsRepository, projector: SignUpProjector, sheet: MagicMock
+) -> None:
+    await _add_signup(signups)
+    sheet.append_row.side_effect = [ConnectionError('timeout'), 7]
+
+    with pytest.raises(ConnectionError):
+        await projector.sync()
+
+    assert await projector.sync() == 1
+    assert [s.sheet_row for s in await signups.get_unsynced(10)] == []
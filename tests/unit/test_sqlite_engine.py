@@ -0,0 +1,27 @@
+"""Тесты профиля движка SQLite."""
+
+import pytest
+from sqlalchemy import text
+
+from src.config import SQLiteSettings
+from src.infrastracture.database.sqlite.db import create_engine
+
+
+class TestSQLiteEngine:
+    @pytest.mark.asyncio
+    async def test_pragmas_applied_to_every_connection(self, tmp_path) -> None:
+        settings = SQLiteSettings(busy_timeout=1234, pool_size=2, max_overflow=0)
+        engine = create_engine(f'sqlite+aiosqlite:///{tmp_path}/test.db', settings)
+
+        try:
+            async with engine.connect() as first, engine.connect() as second:
+                for conn in (first, second):
+                    pragma = (await conn.execute(text('PRAGMA journal_mode'))).scalar()
+                    assert pragma == 'wal'
+                    pragma = (await conn.execute(text('PRAGMA synchronous'))).scalar()
+                    assert pragma == 1  # NORMAL
+                    pragma = (await conn.execute(text('PRAGMA busy_timeout'))).scalar()
+                    assert pragma == 1234
+            assert engine.pool.size() == 2
+        finally:
+            await engine.dispose()
@@ -0,0 +1,132 @@
+"""Тесты антифлуда."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from aiogram.types import CallbackQuery, Message
+
+from src.presentation.middlewares.throttling import (
+    MemoryTokenBucketLimiter,
+    SlidingWindowLimiter,
+    ThrottleRule,
+    ThrottlingMiddleware,
+    create_limiter,
+)
+
+_DEFAULT = ThrottleRule(limit=1, window=1.0)
+_REPORT = ThrottleRule(limit=1, window=10.0)
+
+
+def _message(text: str) -> MagicMock:
+    message = MagicMock(spec=Message)
+    message.text = text
+    message.from_user = MagicMock(id=7)
+    message.answer = AsyncMock()
+    return message
+
+
+@pytest.fixture
+def limiter() -> MagicMock:
+    limiter = MagicMock()
+    limiter.hit = AsyncMock(return_value=0)
+    return limiter
+
+
+@pytest.fixture
+def middleware(limiter) -> ThrottlingMiddleware:
+    return ThrottlingMiddleware(limiter, _DEFAULT, commands={'report': _REPORT})
+
+
+class TestThrottlingMiddleware:
+    @pytest.mark.asyncio
+    async def test_allowed_event_reaches_handler(self, middleware, limiter) -> None:
+        handler = AsyncMock(return_value='ok')
+
+        assert await middleware(handler, _message('привет'), {}) == 'ok'
+        limiter.hit.assert_awaited_once_with('message:7', _DEFAULT)
+
+    @pytest.mark.asyncio
+    async def test_command_has_own_limit(self, middleware, limiter) -> None:
+        await middleware(AsyncMock(), _message('/report@kameya_bot now'), {})
+
+        limiter.hit.assert_awaited_once_with('cmd:report:7', _REPORT)
+
+    @pytest.mark.asyncio
+    async def test_warns_only_on_first_rejection(self, middleware, limiter) -> None:
+        handler = AsyncMock()
+        message = _message('привет')
+
+        limiter.hit.return_value = 1
+        await middleware(handler, message, {})
+        limiter.hit.return_value = 2
+        await middleware(handler, message, {})
+
+        handler.assert_not_awaited()
+        message.answer.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_callback_queries_are_throttled(self, middleware, limiter) -> None:
+        callback = MagicMock(spec=CallbackQuery)
+        callback.from_user = MagicMock(id=7)
+        callback.answer = AsyncMock()
+        limiter.hit.return_value = 1
+
+        await middleware(AsyncMock(), callback, {})
+
+        limiter.hit.assert_awaited_once_with('callback:7', _DEFAULT)
+        callback.answer.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_repeated_callback_answered_silently(self, middleware, limiter) -> None:
+        callback = MagicMock(spec=CallbackQuery)
+        callback.from_user = MagicMock(id=7)
+        callback.answer = AsyncMock()
+        limiter.hit.return_value = 2
+
+        await middleware(AsyncMock(), callback, {})
+
+        callback.answer.assert_awaited_once_with(None)
+
+
+class TestMemoryTokenBucketLimiter:
+    @pytest.mark.asyncio
+    async def test_bucket_limits_burst(self) -> None:
+        limiter = MemoryTokenBucketLimiter()
+        rule = ThrottleRule(limit=2, window=60.0)
+
+        results = [await limiter.hit('message:7', rule) for _ in range(4)]
+
+        assert results == [0, 0, 1, 2]
+        assert await limiter.hit('message:8', rule) == 0
+
+    @pytest.mark.asyncio
+    async def test_idle_buckets_are_evicted(self) -> None:
+        limiter = MemoryTokenBucketLimiter(evict_interval=0)
+        rule = ThrottleRule(limit=1, window=0.0001)
+
+        await limiter.hit('message:7', rule)
+        await asyncio.sleep(0.001)
+        await limiter.hit('message:8', rule)
+
+        assert len(limiter) == 1
+
+    def test_memory_backend_needs_single_replica(self) -> None:
+        redis = MagicMock()
+
+        assert isinstance(create_limiter('memory', 1, redis), MemoryTokenBucketLimiter)
+        assert isinstance(create_limiter('memory', 2, redis), SlidingWindowLimiter)
+        assert isinstance(create_limiter('redis', 1, redis), SlidingWindowLimiter)
+
+
+class TestSlidingWindowLimiter:
+    @pytest.mark.asyncio
+    async def test_window_counts_rejections(self, fake_redis) -> None:
+        limiter = SlidingWindowLimiter(fake_redis)
+        rule = ThrottleRule(limit=2, window=60)
+
+        hits = [await limiter.hit('7', rule) for _ in range(4)]
+
+        assert hits == [0, 0, 1, 2]
+        assert await limiter.hit('8', rule) == 0
+        assert await fake_redis.zcard('throttle:7') == 2
@@ -0,0 +1,93 @@
+"""Тесты локального кэша пользователей."""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.application.models import UserDTO
+from src.application.utils.cache import LRUCache
+from src.infrastracture.repository.users import UsersService
+
+
+@pytest.fixture
+def user() -> UserDTO:
+    return UserDTO(id=1, phone='79001234567', name='Иван', last_name='Иванов')
+
+
+@pytest.fixture
+def redis(user) -> MagicMock:
+    redis = MagicMock()
+    redis.get_user = AsyncMock(return_value=user)
+    redis.save_user = AsyncMock()
+    redis.delete_user = AsyncMock()
+    redis.client.publish = AsyncMock()
+    return redis
+
+
+@pytest.fixture
+def repository() -> MagicMock:
+    repository = MagicMock()
+    repository.update_user = AsyncMock(return_value=True)
+    repository.delete_user = AsyncMock(return_value=True)
+    return repository
+
+
+@pytest.fixture
+def service(redis, repository) -> UsersService:
+    return UsersService(60, repository, redis, LRUCache(maxsize=2, ttl=60))
+
+
+class TestLRUCache:
+    def test_evicts_least_recently_used(self) -> None:
+        cache = LRUCache(maxsize=2)
+        cache.set(1, 'a')
+        cache.set(2, 'b')
+        cache.get(1)
+        cache.set(3, 'c')
+
+        assert cache.get(2) is None
+        assert cache.get(1) == 'a'
+        assert cache.get(3) == 'c'
+        assert cache.stats().hits == 3
+        assert cache.stats().misses == 1
+
+    def test_expired_entry_is_a_miss(self) -> None:
+        cache = LRUCache(ttl=-1)
+        cache.set(1, 'a')
+
+        assert cache.get(1) is None
+        assert len(cache) == 0
+
+
+class TestUsersService:
+    @pytest.mark.asyncio
+    async def test_second_lookup_skips_redis(self, service, redis, user) -> None:
+        assert await service.get_user(1) == user
+        assert await service.get_user(1) == user
+
+        redis.get_user.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_cached_user_is_copied(self, service, user) -> None:
+        cached = await service.get_user(1)
+        cached.name = 'Пётр'
+
+        assert (await service.get_user(1)).name == 'Иван'
+
+    @pytest.mark.asyncio
+    async def test_update_invalidates_and_publishes(self, service, redis, user) -> None:
+        await service.get_user(1)
+
+        await service.update_user(user)
+        await service.get_user(1)
+
+        assert redis.get_user.await_count == 2
+        redis.client.publish.assert_awaited_once_with(service.INVALIDATE_CHANNEL, 1)
+
+    @pytest.mark.asyncio
+    async def test_remove_invalidates(self, service, redis) -> None:
+        await service.get_user(1)
+
+        await service.remove_user(1, only_cache=True)
+
+        assert len(service.local_cache) == 0